@@ -0,0 +1,127 @@
+"""Headless API throughput: in-process responses and HTTP through uvicorn.
+
+Replays a mix of requests (market table pages with different filters and
+sorts, the signals lists, per-ticker detail) against SignalsAPI:
+
+    in-process   SignalsAPI.respond() directly: routing, cache and encoding
+    http         uvicorn on a local port, `--clients` threads each with a
+                 keep-alive HTTPPool connection, gzip accepted; with
+                 --revalidate every other request sends If-None-Match
+
+The first pass over the mix fills the response cache; the timed passes are
+what steady-state clients see.
+
+    python -m benchmarks.bench_api --requests 20000 --clients 8
+"""
+
+import argparse
+import os
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from politics_edge.api import SignalsAPI
+from politics_edge.dashboard import SORT_OPTIONS
+from politics_edge.http_pool import HTTPPool
+
+
+def request_mix(api, n, seed=0):
+    rng = random.Random(seed)
+    tickers = api.shared.snapshot().markets['ticker'].tolist()
+    categories = api.shared.snapshot().index.values('category')
+    mix = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.5:
+            params = {'sort': rng.choice(list(SORT_OPTIONS)), 'page': rng.randint(1, 3)}
+            if rng.random() < 0.5:
+                params['category'] = rng.choice(categories)
+            mix.append(('/markets', urlencode(params)))
+        elif roll < 0.7:
+            mix.append(('/signals', rng.choice(['', 'lag=0', 'status=active,resolved'])))
+        else:
+            mix.append((f"/markets/{rng.choice(tickers[:200])}", ''))
+    return mix
+
+
+def bench_in_process(api, mix):
+    for path, query in mix:
+        api.respond(path, query, {'accept-encoding': 'gzip'})
+    start = time.perf_counter()
+    for path, query in mix:
+        api.respond(path, query, {'accept-encoding': 'gzip'})
+    return len(mix) / (time.perf_counter() - start)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve(api):
+    import uvicorn
+    config = uvicorn.Config(api, host='127.0.0.1', port=_free_port(), log_level='warning', access_log=False)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{config.port}"
+
+
+def bench_http(base_url, mix, clients, revalidate):
+    etags = {}
+    local = threading.local()
+    statuses = {}
+    lock = threading.Lock()
+
+    def one(item):
+        pool = getattr(local, 'pool', None)
+        if pool is None:
+            pool = local.pool = HTTPPool(base_url, maxsize=1)
+        path, query = item
+        headers = {'Accept-Encoding': 'gzip'}
+        url = f"{path}?{query}" if query else path
+        if revalidate and url in etags and random.random() < 0.5:
+            headers['If-None-Match'] = etags[url]
+        status, resp_headers, _ = pool.request('GET', url, headers=headers)
+        etags[url] = resp_headers.get('etag')
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(one, mix))
+        statuses.clear()
+        start = time.perf_counter()
+        list(pool.map(one, mix))
+        elapsed = time.perf_counter() - start
+    return len(mix) / elapsed, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--revalidate', action='store_true', help='send If-None-Match on half the requests')
+    args = parser.parse_args()
+
+    api = SignalsAPI()
+    mix = request_mix(api, args.requests)
+    print(f"{len(api.shared.snapshot().markets):,} markets, {args.requests:,} requests, {os.cpu_count()} cpus")
+    print(f"in-process  {bench_in_process(api, mix):>10,.0f} req/s")
+    try:
+        server, base_url = serve(api)
+    except ImportError:
+        print("http        skipped (uvicorn not installed)")
+        return
+    rps, statuses = bench_http(base_url, mix, args.clients, args.revalidate)
+    print(f"http        {rps:>10,.0f} req/s  ({args.clients} keep-alive clients, statuses {statuses})")
+    print(f"cache       {api.stats}")
+    server.should_exit = True
+
+
+if __name__ == '__main__':
+    main()
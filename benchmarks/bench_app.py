@@ -0,0 +1,259 @@
+"""Headless end-to-end benchmark of streamlit_app.py via AppTest.
+
+For each catalog size (MOCK_MARKET_COUNT synthetic markets) a fresh
+AppTest session loads the app and replays scripted interactions: tier
+switches, filter and category changes, sorting, paging, the table view,
+selecting a market and going back. Each interaction is repeated `--rounds`
+times for wall time (median / p90) and elements emitted (from the rerun
+profiler, fragment-only runs included), then once more under tracemalloc
+for peak Python memory.
+
+Results are written as JSON; pass a previous file with --compare to print
+per-interaction deltas and exit non-zero when a median regresses by more
+than --threshold.
+
+    python -m benchmarks.bench_app --sizes 10 1000 10000 --out bench_app.json
+    python -m benchmarks.bench_app --compare bench_app.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from politics_edge.profiling import RERUN_LOG
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit_app.py')
+
+
+# ============================================================================
+# INTERACTIONS
+# ============================================================================
+# Each takes the AppTest (with a complete element tree) and performs one
+# user action that ends in a run. Actions alternate so they can repeat.
+
+def _toggle(widget, a, b):
+    widget.set_value(b if widget.value == a else a).run()
+
+
+def _buttons(at, prefix):
+    return [b for b in at.button if b.key and b.key.startswith(prefix)]
+
+
+def rerun(at):
+    at.run()
+
+
+def tier_switch(at):
+    tier = at.sidebar.selectbox[0]
+    order = ['free', 'pro', 'pro_plus']
+    tier.set_value(order[(order.index(tier.value) + 1) % len(order)]).run()
+
+
+def filter_change(at):
+    _toggle(at.sidebar.multiselect(key='filter_status'), ['active'], ['active', 'resolved'])
+
+
+def category_change(at):
+    category = at.sidebar.multiselect(key='filter_category')
+    _toggle(category, category.options[:1], list(category.options))
+
+
+def structural_toggle(at):
+    box = at.sidebar.checkbox(key='filter_high_certainty')
+    box.set_value(not box.value).run()
+
+
+def sort_change(at):
+    sort = at.selectbox(key='dashboard_sort')
+    sort.set_value(sort.options[(sort.options.index(sort.value) + 1) % len(sort.options)]).run()
+
+
+def page_change(at):
+    pages = [n for n in at.number_input if n.key == 'dashboard_page']
+    if not pages:
+        return at.run()
+    page = pages[0]
+    page.set_value(2 if page.value == 1 else 1).run()
+
+
+def table_view(at):
+    _toggle(at.radio(key='dashboard_view'), 'Cards', 'Table')
+
+
+def select_market(at):
+    _buttons(at, 'btn_')[0].click().run()
+
+
+def back(at):
+    buttons = [b for b in at.button if 'Back' in b.label]
+    if buttons:
+        buttons[0].click().run()
+    else:
+        at.run()
+
+
+def _deselect(at):
+    if at.session_state.selected_market:
+        back(at)
+        at.run()
+
+
+def _select(at):
+    if not at.session_state.selected_market:
+        select_market(at)
+        at.run()
+
+
+def _cards(at):
+    view = at.radio(key='dashboard_view')
+    if view.value != 'Cards':
+        view.set_value('Cards').run()
+
+
+# (name, action, setup run before every repetition)
+INTERACTIONS = [
+    ('rerun', rerun, None),
+    ('filter change', filter_change, _deselect),
+    ('category change', category_change, _deselect),
+    ('structural toggle', structural_toggle, _deselect),
+    ('sort change', sort_change, _deselect),
+    ('page change', page_change, _cards),
+    ('table view', table_view, _deselect),
+    ('select market', select_market, lambda at: (_deselect(at), _cards(at))),
+    ('back', back, _select),
+    # Last: it leaves the session on a different tier
+    ('tier switch', tier_switch, None),
+]
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def new_session(n_markets, timeout):
+    os.environ['MOCK_MARKET_COUNT'] = str(n_markets)
+    # The provider and shared snapshots are process-wide; rebuild them per size
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception)
+    at.sidebar.selectbox[0].set_value('pro_plus').run()
+    return at, cold_ms
+
+
+def measure(at, action, setup, rounds):
+    times, elements = [], []
+    for _ in range(rounds + 1):
+        if setup is not None:
+            setup(at)
+        mark = len(RERUN_LOG.records())
+        start = time.perf_counter()
+        action(at)
+        times.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception)
+        elements.append(sum(r['elements'] or 0 for r in RERUN_LOG.records()[mark:]))
+        # A fragment-only run leaves AppTest with a partial tree; redraw it (untimed)
+        at.run()
+    # Drop the warm-up repetition
+    times, elements = times[1:], elements[1:]
+
+    if setup is not None:
+        setup(at)
+    tracemalloc.start()
+    action(at)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    at.run()
+    return {
+        'median_ms': round(statistics.median(times), 2),
+        'p90_ms': round(sorted(times)[int(0.9 * (len(times) - 1))], 2),
+        'peak_mb': round(peak / 1e6, 2),
+        'elements': int(statistics.median(elements)),
+    }
+
+
+def run(sizes, rounds, timeout):
+    results = []
+    for n in sizes:
+        at, cold_ms = new_session(n, timeout)
+        results.append({'markets': n, 'interaction': 'cold load', 'median_ms': round(cold_ms, 2),
+                        'p90_ms': round(cold_ms, 2), 'peak_mb': None, 'elements': None})
+        for name, action, setup in INTERACTIONS:
+            row = {'markets': n, 'interaction': name, **measure(at, action, setup, rounds)}
+            results.append(row)
+            print(f"{n:>6}  {name:<18} {row['median_ms']:>9.1f} {row['p90_ms']:>9.1f} "
+                  f"{row['peak_mb']:>8.2f} {row['elements']:>8}", flush=True)
+    return results
+
+
+def metadata():
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(APP)).stdout.strip()
+    except OSError:
+        rev = None
+    return {
+        'git_rev': rev,
+        'python': platform.python_version(),
+        'streamlit': st.__version__,
+        'machine': platform.machine(),
+        'ts': time.time(),
+    }
+
+
+def compare(baseline, results, threshold):
+    old = {(r['markets'], r['interaction']): r for r in baseline['results']}
+    regressions = 0
+    print(f"\n{'markets':>7}  {'interaction':<18} {'base ms':>9} {'now ms':>9} {'change':>8}")
+    for row in results:
+        base = old.get((row['markets'], row['interaction']))
+        if base is None or not base['median_ms']:
+            continue
+        change = row['median_ms'] / base['median_ms'] - 1
+        flag = ' REGRESSION' if change > threshold and row['interaction'] != 'cold load' else ''
+        regressions += bool(flag)
+        print(f"{row['markets']:>7}  {row['interaction']:<18} {base['median_ms']:>9.1f} "
+              f"{row['median_ms']:>9.1f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--out', default='bench_app.json')
+    parser.add_argument('--compare', help='previous results file to diff against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed median slowdown')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+
+    print(f"{'markets':>6}  {'interaction':<18} {'median ms':>9} {'p90 ms':>9} {'peak MB':>8} {'elements':>8}")
+    results = run(args.sizes, args.rounds, args.timeout)
+    with open(args.out, 'w') as fh:
+        json.dump({'meta': metadata(), 'results': results}, fh, indent=1)
+    print(f"\nwrote {args.out}")
+
+    if baseline is not None and compare(baseline, results, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
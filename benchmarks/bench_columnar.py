@@ -0,0 +1,87 @@
+"""Memory of the loader representation vs the compact columnar one.
+
+For each catalog size a SyntheticCatalog is materialized both ways:
+
+    loader     markets frame built from a list of row dicts (as
+               get_mock_markets does) plus per-ticker lists of dicts for
+               constraints, paths and events, keyed by ticker
+    columnar   columnar.compact_markets of the same frame plus the
+               catalog's CatalogTables (flat typed child columns with
+               offset indexes)
+
+Frames are measured with memory_usage(deep=True); the loader's child dicts
+with tracemalloc (what they still hold once built); ChildTables with their
+nbytes. A per-ticker read of every table is timed both ways as well.
+
+    python -m benchmarks.bench_columnar --sizes 10000 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+
+from politics_edge.columnar import compact_markets
+from politics_edge.synthetic import SyntheticCatalog
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def loader_children(catalog, tickers):
+    tracemalloc.start()
+    children = {
+        'constraints': {t: catalog.constraints(t) for t in tickers},
+        'paths': {t: catalog.paths(t) for t in tickers},
+        'events': {t: catalog.events(t) for t in tickers},
+    }
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return children, current / 1e6
+
+
+def read_all(getters, tickers):
+    start = time.perf_counter()
+    for getter in getters:
+        for ticker in tickers:
+            getter(ticker)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(n, seed, sample):
+    catalog = SyntheticCatalog(n, seed)
+    markets = pd.DataFrame(catalog.markets().to_dict('records'))
+    tickers = markets['ticker'].tolist()
+    children, children_mb = loader_children(catalog, tickers)
+
+    compact = compact_markets(markets)
+    tables = catalog.tables
+
+    probe = tickers[::max(1, n // sample)]
+    loader_ms = read_all([children[name].__getitem__ for name in children], probe)
+    tables_ms = read_all([tables.constraints, tables.paths, tables.events], probe)
+
+    loader = frame_mb(markets) + children_mb
+    columnar = frame_mb(compact) + tables.nbytes() / 1e6
+    print(f"{n:>8}  {'markets frame':<16} {frame_mb(markets):>10.1f} {frame_mb(compact):>10.1f}")
+    print(f"{n:>8}  {'child records':<16} {children_mb:>10.1f} {tables.nbytes() / 1e6:>10.1f}")
+    print(f"{n:>8}  {'total':<16} {loader:>10.1f} {columnar:>10.1f}   {loader / columnar:.1f}x smaller")
+    print(f"{n:>8}  {'read ms/ticker':<16} {loader_ms / len(probe):>10.4f} {tables_ms / len(probe):>10.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sample', type=int, default=2000, help='tickers read per table for the read timing')
+    args = parser.parse_args()
+
+    print(f"{'markets':>8}  {'':<16} {'loader MB':>10} {'columnar MB':>10}")
+    for n in args.sizes:
+        run(n, args.seed, args.sample)
+
+
+if __name__ == '__main__':
+    main()
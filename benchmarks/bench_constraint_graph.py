@@ -0,0 +1,78 @@
+"""Constraint graph: per-change propagation cost with shared constraints.
+
+Builds `--markets` markets, each with its own constraint chain and YES/NO
+paths, plus a pool of shared constraints (court rulings) that each feed
+several markets. Then flips random constraints and times set_status.
+
+    python -m benchmarks.bench_constraint_graph --markets 5000 --shared 200
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from politics_edge.constraint_graph import ConstraintGraph
+
+
+def build(n_markets, n_shared, per_market, seed=0):
+    rng = random.Random(seed)
+    graph = ConstraintGraph()
+    shared = [f"SCOTUS-{i}" for i in range(n_shared)]
+    for cid in shared:
+        graph.add_constraint(cid, 'open')
+    for m in range(n_markets):
+        ticker = f"SYN-{m:06d}"
+        previous = None
+        own = []
+        for k in range(per_market):
+            cid = f"{ticker}:c{k}"
+            graph.add_constraint(cid, 'open', ticker, [previous] if previous else ())
+            own.append(cid)
+            previous = cid
+        ruling = rng.choice(shared)
+        graph.add_constraint(ruling, market=ticker)
+        for p in range(3):
+            graph.add_path(f"{ticker}:yes:{p}", ticker, 'yes', requires=[rng.choice(own), ruling])
+            graph.add_path(f"{ticker}:no:{p}", ticker, 'no', blocked_by=[rng.choice(own)])
+    return graph, shared
+
+
+def time_flips(graph, cids, rounds, rng):
+    samples = []
+    touched = []
+    for _ in range(rounds):
+        cid = rng.choice(cids)
+        status = rng.choice(['open', 'passed', 'blocked', 'resolved'])
+        start = time.perf_counter()
+        changes = graph.set_status(cid, status)
+        samples.append((time.perf_counter() - start) * 1e6)
+        touched.append(len(changes.markets))
+    return samples, touched
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--markets', type=int, default=5000)
+    parser.add_argument('--shared', type=int, default=200)
+    parser.add_argument('--per-market', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=5000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph, shared = build(args.markets, args.shared, args.per_market)
+    print(f"built {len(graph.constraints):,} constraints / {len(graph.paths):,} paths / "
+          f"{len(graph.markets):,} markets in {time.perf_counter() - start:.2f} s")
+
+    rng = random.Random(1)
+    own = [cid for cid in graph.constraints if ':' in cid]
+    for label, pool in [('market constraint', own), ('shared ruling', shared)]:
+        samples, touched = time_flips(graph, pool, args.rounds, rng)
+        samples.sort()
+        print(f"{label:<18} median {statistics.median(samples):7.1f} us  "
+              f"p99 {samples[int(len(samples) * 0.99)]:7.1f} us  "
+              f"markets touched/change {statistics.mean(touched):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Detail-panel loading: sequential vs concurrent against the local stub API.
+
+The sequential baseline mirrors the old panel: constraints, paths, events
+(timeline), events again (chart markers) and price history one after another.
+The concurrent path issues the four distinct fetches at once over one pool.
+
+    python -m benchmarks.bench_detail_loading --latency 0.05 --rounds 20
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from politics_edge.detail_loader import RemoteSource, load_market_detail
+from politics_edge.stub_server import StubServer
+
+TICKERS = ['SENATE-2024-CONTROL', 'GOV-2024-NC', 'TX-BORDER-2024', 'PRES-2024-DEM']
+
+
+def sequential_render(source, ticker):
+    source.constraints(ticker)
+    source.paths(ticker)
+    source.events(ticker)
+    source.events(ticker)
+    source.price_history(ticker)
+
+
+def concurrent_render(source, ticker, executor):
+    load_market_detail(ticker, source.fetchers(), executor)
+
+
+def time_rounds(fn, rounds):
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        fn(TICKERS[i % len(TICKERS)])
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    server = StubServer(latency=args.latency).start()
+    source = RemoteSource(server.base_url)
+    executor = ThreadPoolExecutor(max_workers=8)
+    try:
+        results = {}
+        for name, fn in [
+            ('sequential', lambda t: sequential_render(source, t)),
+            ('concurrent', lambda t: concurrent_render(source, t, executor)),
+        ]:
+            before = server.request_count
+            samples = time_rounds(fn, args.rounds)
+            results[name] = samples
+            print(f"{name:<11} median {statistics.median(samples):7.1f} ms  "
+                  f"max {max(samples):7.1f} ms  requests/render {(server.request_count - before) / args.rounds:.0f}")
+        speedup = statistics.median(results['sequential']) / statistics.median(results['concurrent'])
+        print(f"speedup {speedup:.2f}x at {args.latency * 1000:.0f} ms upstream latency; "
+              f"{source.pool.connections_opened} pooled connections opened")
+    finally:
+        executor.shutdown()
+        source.close()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Kalshi client under load: naive pooled fetches vs the shared KalshiClient.
+
+A StubServer with `--latency` per request enforces `--server-rate`
+requests per second (429 with Retry-After beyond it). `--sessions`
+threads each open `--opens` markets, drawn Zipf-like so a few hot markets
+get most of the traffic the way a shared dashboard does, and fetch each
+market's constraints, paths and events:
+
+    naive      HTTPPool.get_json per call; a 429 is a failed panel
+    client     one KalshiClient for every thread, its bucket set just under
+               the server's rate: coalesced, rate-limited, cached (with
+               --max-age, repeat opens inside it never leave the process)
+    restart    a new KalshiClient on the same cache directory (a restarted
+               replica) fetching the same markets: stale entries are
+               revalidated, so unchanged ones come back as bodiless 304s,
+               and entries still inside --max-age are served from disk
+
+    python -m benchmarks.bench_kalshi_client --markets 2000 --sessions 32
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PARTS = ('constraints', 'paths', 'events')
+
+
+def workload(tickers, sessions, opens, seed):
+    """Per-session ticker lists with Zipf-like popularity"""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(tickers) + 1)
+    picks = rng.choice(len(tickers), size=(sessions, opens), p=weights / weights.sum())
+    return [[tickers[i] for i in row] for row in picks]
+
+
+def drive(fetch, plan):
+    """Run every session's opens on its own thread; returns (latencies, errors, seconds)"""
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def session(tickers):
+        for ticker in tickers:
+            for part in PARTS:
+                start = time.perf_counter()
+                try:
+                    fetch(ticker, part)
+                except Exception as exc:
+                    with lock:
+                        errors.append(exc)
+                    continue
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(len(plan)) as pool:
+        list(pool.map(session, plan))
+    return latencies, errors, time.perf_counter() - start
+
+
+def report(name, server, before, latencies, errors, seconds, stats=None):
+    p50, p99 = np.percentile(np.array(latencies or [0.0]) * 1000, [50, 99])
+    calls = len(latencies) + len(errors)
+    line = (f"{name:<8} {calls:>6} calls  {server.request_count - before:>6} upstream  "
+            f"{len(errors):>5} failed  p50 {p50:>7.1f} ms  p99 {p99:>8.1f} ms  {seconds:>6.1f} s")
+    if stats:
+        line += (f"  (fresh {stats['fresh_hits']}, coalesced {stats['coalesced']}, 304s {stats['not_modified']}, "
+                 f"429s {stats['throttled']}, stale {stats['stale_served']})")
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--markets', type=int, default=2000, help='MOCK_MARKET_COUNT for the synthetic catalog')
+    parser.add_argument('--sessions', type=int, default=32, help='concurrent sessions (threads)')
+    parser.add_argument('--opens', type=int, default=10, help='markets opened per session')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub seconds per request')
+    parser.add_argument('--server-rate', type=float, default=50, help='stub requests per second before 429s')
+    parser.add_argument('--max-age', type=float, default=0.0,
+                        help='client seconds to serve a cached entry without revalidating')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ['MOCK_MARKET_COUNT'] = str(args.markets)
+    from politics_edge.http_pool import HTTPPool
+    from politics_edge.kalshi_client import KalshiClient
+    from politics_edge.mock_data import get_mock_markets
+    from politics_edge.stub_server import StubServer
+
+    server = StubServer(latency=args.latency, rate_limit=args.server_rate, burst=args.server_rate / 5).start()
+    plan = workload(list(get_mock_markets()['ticker']), args.sessions, args.opens, args.seed)
+    print(f"{args.markets} markets, {args.sessions} sessions x {args.opens} opens x {len(PARTS)} parts, "
+          f"stub {args.latency * 1000:.0f} ms, {args.server_rate:g} req/s")
+
+    pool = HTTPPool(server.base_url, maxsize=args.sessions)
+    before = server.request_count
+    report('naive', server, before,
+           *drive(lambda t, part: pool.get_json(f"/markets/{t}/{part}"), plan))
+    pool.close()
+    time.sleep(1.0)  # let the stub's bucket refill
+
+    cache_dir = tempfile.mkdtemp(prefix='bench_kalshi_')
+    try:
+        for name in ('client', 'restart'):
+            client = KalshiClient(server.base_url, rate=args.server_rate * 0.9, burst=args.server_rate / 5,
+                                  pool_size=args.sessions, cache_dir=cache_dir, max_age=args.max_age)
+            before = server.request_count
+            report(name, server, before,
+                   *drive(lambda t, part: getattr(client, part)(t), plan), stats=client.stats)
+            client.close()
+            time.sleep(1.0)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Lag engine throughput: price ticks per second across a large catalog.
+
+    python -m benchmarks.bench_lag_engine --tickers 100000 --ticks 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from politics_edge.lag_engine import LagDetector
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=100_000)
+    parser.add_argument('--ticks', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    tickers = [f"SYN-{i:06d}" for i in range(args.tickers)]
+    detector = LagDetector()
+    certainties = rng.choice(['high', 'medium', 'low'], args.tickers)
+    paths = rng.integers(0, 12, (args.tickers, 2))
+    start = time.perf_counter()
+    for ticker, cert, (py, pn) in zip(tickers, certainties, paths.tolist()):
+        detector.on_structure(ticker, 0.0, cert, py, pn)
+    seed_s = time.perf_counter() - start
+
+    which = rng.integers(0, args.tickers, args.ticks).tolist()
+    prices = rng.uniform(0.01, 0.99, args.ticks).tolist()
+    flips = 0
+    start = time.perf_counter()
+    for i, (k, price) in enumerate(zip(which, prices)):
+        if detector.on_price(tickers[k], float(i), price) is not None:
+            flips += 1
+    tick_s = time.perf_counter() - start
+
+    print(f"seeded {args.tickers:,} tickers in {seed_s * 1000:.0f} ms")
+    print(f"{args.ticks:,} ticks in {tick_s:.2f} s -> {args.ticks / tick_s:,.0f} ticks/s, "
+          f"{tick_s / args.ticks * 1e6:.2f} us/tick, {flips:,} status flips")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Price chart build: per-event argmin + one trace per event vs as-of join + one trace.
+
+Also compares sending every point against the downsampled chart (LTTB and
+min/max bucketing to chart.MAX_POINTS). Reports figure build time and
+serialized (JSON) figure size.
+
+    python -m benchmarks.bench_price_chart --points 100000 --events 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from politics_edge.chart import build_price_figure
+from politics_edge.price_history import get_price_history
+
+
+def legacy_figure(price_df, events):
+    """The original chart loop: O(N) argmin and a new trace per event"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=price_df['date'], y=price_df['price'], mode='lines', name='YES Price',
+                             line=dict(color='#6366f1', width=2)))
+    for e in events:
+        event_date = pd.to_datetime(e['date'])
+        if event_date >= price_df['date'].min():
+            closest_idx = (price_df['date'] - event_date).abs().argmin()
+            price_at_event = price_df.iloc[closest_idx]['price']
+            color = {'positive': 'green', 'negative': 'red', 'neutral': 'gray'}
+            fig.add_trace(go.Scatter(x=[event_date], y=[price_at_event], mode='markers',
+                                     marker=dict(size=12, color=color.get(e['impact'], 'gray'), symbol='diamond'),
+                                     name=e['event'][:30], hovertext=e['event']))
+    fig.update_layout(height=350, showlegend=False, hovermode='x unified')
+    return fig
+
+
+def synthetic_events(price_df, n, seed=0):
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(price_df), n)
+    impacts = rng.choice(['positive', 'negative', 'neutral'], n)
+    return [
+        {'date': price_df['date'].iloc[i].isoformat(), 'event': f"Synthetic event {k}", 'impact': impact}
+        for k, (i, impact) in enumerate(zip(picks, impacts))
+    ]
+
+
+def measure(label, build):
+    start = time.perf_counter()
+    fig = build()
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    payload = fig.to_json()
+    json_ms = (time.perf_counter() - start) * 1000
+    print(f"{label:<8} points {len(fig.data[0].x):9,d}  traces {len(fig.data):5d}  build {build_ms:8.1f} ms  "
+          f"to_json {json_ms:8.1f} ms  size {len(payload) / 1024:9.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--points', type=int, default=100_000)
+    parser.add_argument('--events', type=int, default=500)
+    args = parser.parse_args()
+    price_df = get_price_history('BENCH', periods=args.points, freq='min')
+    events = synthetic_events(price_df, args.events)
+    print(f"{args.points:,} price points, {args.events:,} events")
+    measure('legacy', lambda: legacy_figure(price_df, events))
+    measure('as-of', lambda: build_price_figure(price_df, events, max_points=len(price_df)))
+    measure('lttb', lambda: build_price_figure(price_df, events, method='lttb'))
+    measure('minmax', lambda: build_price_figure(price_df, events, method='minmax'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Price-history generation: per-point Python loop vs vectorized batch.
+
+    python -m benchmarks.bench_price_history --tickers 5000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from politics_edge.price_history import iter_price_matrix, price_matrix
+
+
+def loop_history(periods):
+    """The original per-point random.gauss walk with min/max clamping"""
+    current = random.uniform(0.3, 0.7)
+    prices = []
+    for _ in range(periods):
+        current = max(0.01, min(0.99, current + random.gauss(0, 0.02)))
+        prices.append(current)
+    return prices
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<46} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=5000)
+    parser.add_argument('--periods', type=int, default=90)
+    parser.add_argument('--years', type=int, default=5, help='minute-bar history length')
+    args = parser.parse_args()
+    tickers = [f"SYN-{i:06d}" for i in range(args.tickers)]
+
+    loop = timed(f"loop      {args.tickers} x {args.periods}",
+                 lambda: [loop_history(args.periods) for _ in tickers])
+    vec = timed(f"batched   {args.tickers} x {args.periods}",
+                lambda: price_matrix(tickers, args.periods))
+    print(f"speedup {loop / vec:.1f}x")
+
+    minutes = args.years * 365 * 24 * 60
+    timed(f"1 ticker  x {minutes:,} minute bars (float32)",
+          lambda: price_matrix(tickers[:1], minutes, dtype=np.float32))
+    timed(f"64 tickers x {minutes:,} minute bars, streamed",
+          lambda: sum(m.size for _, _, m in iter_price_matrix(tickers[:64], minutes, chunk_size=8, dtype=np.float32)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Price store: open + range-query latency and resident memory for long histories.
+
+Writes `--years` of minute bars for one ticker (skipped if already present),
+then times cold range queries and reports how much of the file became
+resident.
+
+    python -m benchmarks.bench_price_store --root /tmp/price_store --years 5
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from politics_edge.price_history import price_matrix
+from politics_edge.price_store import PriceStore
+
+TICKER = 'BENCH-5Y-MINUTE'
+
+
+def rss_mb():
+    with open('/proc/self/status') as fh:
+        for line in fh:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def populate(store, years):
+    end = pd.Timestamp('2024-11-06')
+    periods = years * 365 * 24 * 60
+    dates = pd.date_range(end=end, periods=periods, freq='min')
+    dates_ns = dates.as_unit('ns').asi8
+    prices = price_matrix([TICKER], periods, dtype=np.float32)[0]
+    volume = np.random.default_rng(0).integers(0, 500, periods, dtype=np.int32)
+    chunk = 1_000_000
+    for lo in range(0, periods, chunk):
+        store.append(TICKER, dates_ns[lo:lo + chunk], prices[lo:lo + chunk], volume[lo:lo + chunk])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--root', default='/tmp/politics_edge_price_store')
+    parser.add_argument('--years', type=int, default=5)
+    args = parser.parse_args()
+
+    store = PriceStore(args.root)
+    if TICKER not in store:
+        start = time.perf_counter()
+        populate(store, args.years)
+        print(f"wrote {args.years} years of minute bars in {time.perf_counter() - start:.1f} s")
+
+    size = sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(os.path.join(args.root, TICKER)) for f in files)
+    first, last = store.span(TICKER)
+    print(f"on disk: {size / 2**20:.0f} MiB, {first} .. {last}")
+
+    before = rss_mb()
+    for label, lo, hi in [
+        ('last 90 days', last - pd.Timedelta(days=90), last),
+        ('last 1 day', last - pd.Timedelta(days=1), last),
+    ]:
+        start = time.perf_counter()
+        result = store.query(TICKER, lo, hi)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{label:<13} {len(result):>10,} rows  query {elapsed:7.2f} ms  "
+              f"zero-copy {isinstance(result.price, np.memmap)}  RSS +{rss_mb() - before:.1f} MiB")
+
+    start = time.perf_counter()
+    segments = list(store.iter_query(TICKER))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{'full, by seg':<13} {sum(map(len, segments)):>10,} rows  query {elapsed:7.2f} ms  "
+          f"zero-copy {all(isinstance(s.price, np.memmap) for s in segments)}  RSS +{rss_mb() - before:.1f} MiB")
+
+    start = time.perf_counter()
+    result = store.query(TICKER)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{'full, copied':<13} {len(result):>10,} rows  query {elapsed:7.2f} ms  "
+          f"zero-copy {isinstance(result.price, np.memmap)}  RSS +{rss_mb() - before:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Market search: inverted index vs a scan, plus incremental maintenance.
+
+For each catalog size a SyntheticCatalog is indexed and a query mix
+(single words, multi-word AND queries, type-ahead prefixes) is timed:
+
+    scan       every market's text joined into one lowercase string
+               (built untimed), each query token checked with `in`
+    index      SearchIndex.match + top-20 ranking
+
+and the maintenance paths:
+
+    build      SearchIndex.build over the markets frame and CatalogTables
+    update     re-indexing single markets into the delta
+    compact    folding a full delta back into the base
+    sync       CatalogSearch after a reload that changed `--changed` markets
+
+    python -m benchmarks.bench_search --sizes 10000 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from politics_edge.columnar import compact_markets
+from politics_edge.search import COMPACT_MIN, CatalogSearch, SearchIndex, market_document
+from politics_edge.synthetic import SyntheticCatalog
+
+QUERIES = [
+    'nc', 'scotus', 'scotus ruling', 'court review', 'awaiting ruling', 'senate 2026',
+    'ballot challenge pending', 'coalition', 'recount', 'tx governor', 'sco', 'cert', 'legal 2025 00001',
+]
+
+
+class _CatalogProvider:
+    """Just enough of DataProvider for CatalogSearch over a fixed catalog"""
+
+    def __init__(self, markets, tables):
+        self.markets, self.data, self.version = markets, tables, 0
+
+    def changes_since(self, version):
+        return set(), self.version
+
+    def market_index(self):
+        return self
+
+    @property
+    def df(self):
+        return self.markets
+
+    def tables(self):
+        return self.data
+
+    def peek(self, name, *args):
+        return None
+
+
+def documents(markets, tables):
+    return [
+        ' '.join(text for text, _ in market_document(row, tables.constraints(t), tables.paths(t), tables.events(t))).lower()
+        for t, row in zip(markets['ticker'], markets.to_dict('records'))
+    ]
+
+
+def percentiles(samples):
+    return np.percentile(np.array(samples) * 1000, [50, 99])
+
+
+def time_queries(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            fn(query)
+            samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def run(n, seed, changed, repeat):
+    catalog = SyntheticCatalog(n, seed)
+    markets = compact_markets(catalog.markets())
+    tables = catalog.tables
+
+    start = time.perf_counter()
+    index = SearchIndex.build(markets, tables)
+    build_s = time.perf_counter() - start
+
+    docs = documents(markets, tables)
+
+    def scan(query):
+        tokens = query.split()
+        return [i for i, doc in enumerate(docs) if all(t in doc for t in tokens)]
+
+    scan_ms = time_queries(scan, 1)
+    index_ms = time_queries(lambda q: index.top(*index.match(q), 20), repeat)
+
+    rows = markets.to_dict('records')
+    sample = range(0, n, max(1, n // COMPACT_MIN))[:COMPACT_MIN]
+    start = time.perf_counter()
+    for i in sample:
+        t = rows[i]['ticker']
+        index.update(t, market_document(rows[i], tables.constraints(t), tables.paths(t), tables.events(t)))
+    update_ms = (time.perf_counter() - start) * 1000 / len(sample)
+    start = time.perf_counter()
+    index.compact()
+    compact_ms = (time.perf_counter() - start) * 1000
+
+    provider = _CatalogProvider(markets, tables)
+    search = CatalogSearch(provider)
+    search.refresh()
+    reloaded = markets.copy()
+    titles = reloaded['title'].to_numpy(dtype=object, copy=True)
+    picks = np.random.default_rng(seed).choice(n, min(changed, n), replace=False)
+    titles[picks] = titles[picks] + ' amended'
+    reloaded['title'] = titles
+    provider.markets = reloaded
+    start = time.perf_counter()
+    search.refresh()
+    sync_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{n:>8}  build {build_s:.2f} s, {index.nbytes() / 1e6:.1f} MB, {len(index.terms):,} terms")
+    print(f"{n:>8}  {'scan':<8} p50 {scan_ms[0]:>8.2f} ms  p99 {scan_ms[1]:>8.2f} ms")
+    print(f"{n:>8}  {'index':<8} p50 {index_ms[0]:>8.2f} ms  p99 {index_ms[1]:>8.2f} ms")
+    print(f"{n:>8}  update {update_ms:.3f} ms/market, compact {compact_ms:.0f} ms, "
+          f"sync of {len(picks)} changed {sync_ms:.0f} ms ({search.stats['updates']} re-indexed)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--changed', type=int, default=100, help='markets whose title changes in the reload')
+    parser.add_argument('--repeat', type=int, default=20, help='passes over the query mix for the index timing')
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        run(n, args.seed, args.changed, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Shared market state: upstream loads and retained memory as sessions grow.
+
+Simulates `--sessions` concurrent sessions, each doing a few reruns that
+read the market snapshot, filter it and open a market's detail panel.
+
+    per-session  every session owns its provider and fetches its own detail
+    shared       one SharedMarketState; sessions read snapshots by reference
+
+Upstream loads are the provider cache misses plus price-history calls;
+memory is what tracemalloc still holds once all sessions are done.
+
+    python -m benchmarks.bench_shared_state --sessions 1 10 100
+"""
+
+import argparse
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from politics_edge.data_provider import build_default_provider
+from politics_edge.detail_loader import load_market_detail, local_fetchers
+from politics_edge.mock_data import get_mock_price_history
+from politics_edge.shared_state import SharedMarketState
+
+PARTS = ['constraints', 'paths', 'events', 'price_history']
+
+
+class CountingLoader:
+    def __init__(self, loader):
+        self.loader = loader
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker):
+        with self._lock:
+            self.calls += 1
+        return self.loader(ticker)
+
+
+def provider_loads(provider):
+    return sum(s['misses'] + s['refreshes'] for s in provider.stats().values())
+
+
+def run_per_session(n_sessions, reruns, seed):
+    history = CountingLoader(get_mock_price_history)
+    retained = []
+
+    def session(i):
+        rng = random.Random(seed + i)
+        provider = build_default_provider(background=False)
+        state = {'provider': provider, 'details': []}
+        for _ in range(reruns):
+            index = provider.market_index()
+            index.select_positions(include={'status': ['active']})
+            ticker = rng.choice(index.df['ticker'].tolist())
+            state['details'].append(load_market_detail(ticker, local_fetchers(provider, history), None, PARTS))
+        return state
+
+    with ThreadPoolExecutor(max_workers=min(n_sessions, 32)) as pool:
+        retained = list(pool.map(session, range(n_sessions)))
+    loads = sum(provider_loads(s['provider']) for s in retained) + history.calls
+    return loads, retained
+
+
+def run_shared(n_sessions, reruns, seed):
+    history = CountingLoader(get_mock_price_history)
+    provider = build_default_provider(background=False)
+    shared = SharedMarketState(provider)
+    fetchers = local_fetchers(provider, history)
+
+    def session(i):
+        rng = random.Random(seed + i)
+        state = {'details': []}
+        for _ in range(reruns):
+            snapshot = shared.snapshot(f"session-{i}")
+            snapshot.index.select_positions(include={'status': ['active']})
+            ticker = rng.choice(snapshot.markets['ticker'].tolist())
+            state['details'].append(shared.detail(snapshot, ticker, PARTS, fetchers))
+        return state
+
+    with ThreadPoolExecutor(max_workers=min(n_sessions, 32)) as pool:
+        retained = list(pool.map(session, range(n_sessions)))
+    return provider_loads(provider) + history.calls, (shared, retained)
+
+
+def measure(fn, n_sessions, reruns, seed):
+    tracemalloc.start()
+    start = time.perf_counter()
+    loads, retained = fn(n_sessions, reruns, seed)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return loads, current / 1e6, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 10, 50, 200])
+    parser.add_argument('--reruns', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8}  {'mode':<12} {'upstream loads':>14} {'retained MB':>12} {'wall s':>8}")
+    for n in args.sessions:
+        for name, fn in (('per-session', run_per_session), ('shared', run_shared)):
+            loads, mb, elapsed = measure(fn, n, args.reruns, args.seed)
+            print(f"{n:>8}  {name:<12} {loads:>14} {mb:>12.2f} {elapsed:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
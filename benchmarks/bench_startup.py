@@ -0,0 +1,179 @@
+"""Cold start: time to first render of streamlit_app.py on a freshly started server.
+
+Every measurement starts a real Streamlit server in its own process, the
+way a new app replica starts, then talks to it over the app's websocket
+the way a browser does:
+
+    server ready    process start until /_stcore/health answers (for
+                    `preloaded` this includes the preload)
+    first render    the first session's first full run: the script's
+                    imports, building the process-wide data layer and
+                    rendering the dashboard
+    second session  another new session on the same, now warm, server
+    first detail    the first session opening a market, until the detail
+                    panel's price chart has been sent
+
+Modes, each launched through its real entry point:
+
+    cold        python -m streamlit run streamlit_app.py
+    preloaded   python -m politics_edge.startup
+    baseline    python -m streamlit run, on the app script of
+                --baseline-rev (default HEAD)
+
+Medians over --runs servers per mode. Times are server-side work plus a
+local websocket round trip; the browser's own rendering is not included.
+
+    python -m benchmarks.bench_startup --runs 5 --markets 10000
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'streamlit_app.py')
+STEPS = ['server ready', 'first render', 'second session', 'first detail']
+
+_RERUN = ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(mode, app, port):
+    if mode == 'preloaded':
+        command = [sys.executable, '-m', 'politics_edge.startup']
+    else:
+        command = [sys.executable, '-m', 'streamlit', 'run', app]
+    return command + ['--server.headless', 'true', '--server.port', str(port),
+                      '--browser.gatherUsageStats', 'false']
+
+
+def wait_ready(process, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'server exited with {process.returncode}')
+        try:
+            with urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1) as response:
+                if response.read() == b'ok':
+                    return
+        except OSError:
+            time.sleep(0.02)
+    raise TimeoutError('server did not become healthy')
+
+
+async def run_script(ws, widgets=(), until=None):
+    """Request a rerun and read until it has finished; returns the elements sent.
+
+    `until(element)` keeps reading past finished runs (a callback's st.rerun
+    ends one run and starts fragment runs) until a matching element arrived.
+    """
+    msg = BackMsg()
+    msg.rerun_script.query_string = ''
+    msg.rerun_script.widget_states.widgets.extend(widgets)
+    await ws.send(msg.SerializeToString())
+    elements, seen = [], until is None
+    while True:
+        forward = ForwardMsg()
+        forward.ParseFromString(await ws.recv())
+        kind = forward.WhichOneof('type')
+        if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+            element = forward.delta.new_element
+            elements.append(element)
+            seen = seen or until(element)
+        elif kind == 'script_finished' and forward.script_finished != _RERUN and seen:
+            return elements
+
+
+async def sessions(port, result):
+    url = f'ws://localhost:{port}/_stcore/stream'
+
+    async def timed(step, coro):
+        start = time.perf_counter()
+        value = await coro
+        result[step] = (time.perf_counter() - start) * 1000
+        return value
+
+    async with websockets.connect(url, subprotocols=['streamlit'], max_size=None) as first:
+        elements = await timed('first render', run_script(first))
+        async with websockets.connect(url, subprotocols=['streamlit'], max_size=None) as second:
+            await timed('second session', run_script(second))
+        button = next(e.button for e in elements if e.WhichOneof('type') == 'button' and '-btn_' in e.button.id)
+        click = WidgetState(id=button.id, trigger_value=True)
+        await timed('first detail', run_script(
+            first, [click], until=lambda e: e.WhichOneof('type') == 'plotly_chart'))
+
+
+def measure_once(mode, app, timeout):
+    """One fresh server; returns step timings in ms"""
+    port = free_port()
+    env = {**os.environ, 'PYTHONPATH': ROOT, 'PYTHONWARNINGS': 'ignore'}
+    start = time.perf_counter()
+    process = subprocess.Popen(server_command(mode, app, port), cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(process, port, timeout)
+        result = {'server ready': (time.perf_counter() - start) * 1000}
+        asyncio.run(asyncio.wait_for(sessions(port, result), timeout))
+        return result
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def baseline_app(rev):
+    """The app script at git revision `rev`, written next to the current one"""
+    source = subprocess.run(['git', 'show', f'{rev}:streamlit_app.py'], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    fd, path = tempfile.mkstemp(prefix='.bench_startup_', suffix='.py', dir=ROOT)
+    with os.fdopen(fd, 'w') as fh:
+        fh.write(source)
+    return path
+
+
+def measure(mode, app, runs, timeout):
+    rows = [measure_once(mode, app, timeout) for _ in range(runs)]
+    return {step: statistics.median(r[step] for r in rows) for step in STEPS}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5, help='fresh servers per mode')
+    parser.add_argument('--markets', type=int, default=None, help='MOCK_MARKET_COUNT for the synthetic catalog')
+    parser.add_argument('--modes', nargs='+', default=['baseline', 'cold', 'preloaded'])
+    parser.add_argument('--baseline-rev', default='HEAD')
+    parser.add_argument('--timeout', type=float, default=300)
+    args = parser.parse_args()
+
+    if args.markets:
+        os.environ['MOCK_MARKET_COUNT'] = str(args.markets)
+    print(f"{args.markets or 'mock'} markets, median of {args.runs} fresh servers (ms)")
+    print(f"{'mode':<10} " + ' '.join(f"{step:>15}" for step in STEPS))
+    for mode in args.modes:
+        app = baseline_app(args.baseline_rev) if mode == 'baseline' else APP
+        try:
+            result = measure(mode, app, args.runs, args.timeout)
+        finally:
+            if app != APP:
+                os.remove(app)
+        print(f"{mode:<10} " + ' '.join(f"{result[step]:>15.0f}" for step in STEPS))
+
+
+if __name__ == '__main__':
+    main()
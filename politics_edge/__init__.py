@@ -0,0 +1 @@
+"""Kalshi Politics Edge - data and analysis modules behind streamlit_app.py"""
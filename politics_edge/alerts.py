@@ -0,0 +1,285 @@
+"""Background alert evaluation and per-session fan-out.
+
+One AlertWorker per process runs on its own daemon thread, outside every
+session's script thread. Each cycle it diffs the current market, constraint
+and path snapshots against the previous cycle and turns the differences
+into alerts:
+
+    constraint  a constraint changed status
+    path        a YES/NO path disappeared or a side's path count dropped
+    lag         a market's lag_status flipped to detected
+    deadline    an open constraint's date was crossed
+
+Diffing is proportional to what changed: the markets table and the
+catalog-wide constraint and path tables are each compared as one vectorized
+hash pass, skipped entirely when the provider handed back the same object.
+Only the markets whose hashes moved have their constraint and path lists
+decoded and diffed. Deadlines sit in a heap, so a cycle only pops the ones
+that were crossed. The worker reads the same cached datasets as the
+sessions and never loads a market's detail datasets itself.
+
+Constraint status changes are also handed to `on_constraint_status(cid,
+status)`; the app passes SharedMarketState.set_constraint_status, so the
+constraint graph propagates them into the shared snapshot right away.
+
+Matched alerts go to the AlertHub, which indexes subscribed sessions by
+alert type, so publishing costs alerts x interested sessions, never
+users x markets. Sessions mirror `st.session_state.alerts_enabled` into
+the hub on each rerun and drain their queue with poll().
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+from politics_edge.constraint_graph import constraint_id
+
+ALERT_TYPES = ('constraint', 'path', 'lag', 'deadline')
+
+MARKET_DIFF_COLUMNS = ['lag_status', 'paths_yes', 'paths_no']
+# ChildTable fields whose changes can raise a constraint, path or deadline alert
+CONSTRAINT_DIFF_FIELDS = ('name', 'status', 'date')
+PATH_DIFF_FIELDS = ('section', 'description')
+
+
+def make_alert(kind, ticker, message, ts):
+    return {'type': kind, 'ticker': ticker, 'message': message, 'ts': ts}
+
+
+class AlertHub:
+    """Session subscriptions by alert type, with a bounded queue per session"""
+
+    def __init__(self, max_queue=50, session_ttl=3600.0, clock=time.time):
+        self.max_queue = max_queue
+        self.session_ttl = session_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._prefs = {}
+        self._queues = {}
+        self._last_seen = {}
+        self._by_type = {kind: set() for kind in ALERT_TYPES}
+
+    def subscribe(self, session_id, prefs):
+        """Create or update a session's subscription from its alerts_enabled dict"""
+        enabled = {kind for kind in ALERT_TYPES if prefs.get(kind)}
+        with self._lock:
+            old = self._prefs.get(session_id, set())
+            for kind in old - enabled:
+                self._by_type[kind].discard(session_id)
+            for kind in enabled - old:
+                self._by_type[kind].add(session_id)
+            self._prefs[session_id] = enabled
+            self._queues.setdefault(session_id, deque(maxlen=self.max_queue))
+            self._last_seen[session_id] = self._clock()
+
+    def unsubscribe(self, session_id):
+        with self._lock:
+            for kind in self._prefs.pop(session_id, ()):
+                self._by_type[kind].discard(session_id)
+            self._queues.pop(session_id, None)
+            self._last_seen.pop(session_id, None)
+
+    def publish(self, alerts):
+        """Fan alerts out to the sessions subscribed to their type"""
+        delivered = 0
+        with self._lock:
+            for alert in alerts:
+                for session_id in self._by_type[alert['type']]:
+                    self._queues[session_id].append(alert)
+                    delivered += 1
+        return delivered
+
+    def poll(self, session_id):
+        """Drain and return a session's pending alerts"""
+        with self._lock:
+            self._last_seen[session_id] = self._clock()
+            queue = self._queues.get(session_id)
+            if not queue:
+                return []
+            alerts = list(queue)
+            queue.clear()
+            return alerts
+
+    def expire(self):
+        """Drop sessions that have not polled within session_ttl"""
+        cutoff = self._clock() - self.session_ttl
+        with self._lock:
+            stale = [sid for sid, seen in self._last_seen.items() if seen < cutoff]
+        for session_id in stale:
+            self.unsubscribe(session_id)
+        return len(stale)
+
+    @property
+    def session_count(self):
+        return len(self._prefs)
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+class AlertWorker:
+    """Diffs successive snapshots on a background thread and publishes alerts"""
+
+    def __init__(self, provider, hub, interval=15.0, clock=time.time, on_constraint_status=None):
+        self.provider = provider
+        self.hub = hub
+        self.on_constraint_status = on_constraint_status
+        self.interval = interval
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread = None
+        self._market_index = None
+        self._row_hashes = None
+        self._rows = {}
+        self._tables = None
+        self._table_hashes = None
+        self._constraints = {}
+        self._paths = {}
+        self._deadlines = []
+        self.cycles = 0
+        self.last_cycle_ms = 0.0
+        self.last_changed = 0
+
+    # ---------------------------------------------------------------- thread
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='alert-worker', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_cycle()
+            except Exception:
+                # A bad snapshot must not kill alerting for every session
+                pass
+            self._stop.wait(self.interval)
+
+    # ----------------------------------------------------------------- cycle
+
+    def run_cycle(self):
+        """Evaluate one cycle and publish its alerts; returns the alerts"""
+        start = time.perf_counter()
+        now = self._clock()
+        alerts = []
+        changed = 0
+
+        index = self.provider.market_index()
+        if index is not self._market_index:
+            changed += self._diff_markets(index.df, now, alerts)
+            self._market_index = index
+
+        tables = self.provider.tables()
+        if tables is not self._tables:
+            changed += self._diff_tables(tables, now, alerts)
+            self._tables = tables
+
+        self._pop_deadlines(now, alerts)
+
+        self.hub.publish(alerts)
+        self.hub.expire()
+        self.cycles += 1
+        self.last_changed = changed
+        self.last_cycle_ms = (time.perf_counter() - start) * 1000
+        return alerts
+
+    def _diff_markets(self, df, now, alerts):
+        hashes = pd.Series(
+            pd.util.hash_pandas_object(df[MARKET_DIFF_COLUMNS].astype(str), index=False).to_numpy(),
+            index=df['ticker'].to_numpy(),
+        )
+        previous = self._row_hashes
+        self._row_hashes = hashes
+        if previous is None:
+            self._rows = {t: r for t, *r in df[['ticker'] + MARKET_DIFF_COLUMNS].itertuples(index=False)}
+            return 0
+
+        changed = hashes.index[hashes.ne(previous.reindex(hashes.index)).to_numpy()]
+        if not len(changed):
+            return 0
+        rows = df.set_index('ticker').loc[changed, MARKET_DIFF_COLUMNS]
+        for ticker, (lag, paths_yes, paths_no) in zip(rows.index, rows.itertuples(index=False)):
+            old = self._rows.get(ticker)
+            self._rows[ticker] = [lag, paths_yes, paths_no]
+            if old is None:
+                continue
+            if lag == 'detected' and old[0] != 'detected':
+                alerts.append(make_alert('lag', ticker, 'Market lag detected', now))
+            if paths_yes < old[1]:
+                alerts.append(make_alert('path', ticker, f"YES paths {old[1]} → {paths_yes}", now))
+            if paths_no < old[2]:
+                alerts.append(make_alert('path', ticker, f"NO paths {old[2]} → {paths_no}", now))
+        return len(changed)
+
+    def _diff_tables(self, tables, now, alerts):
+        """Diff the constraints and paths of the markets whose rows changed between two loads"""
+        hashes = {
+            'constraints': pd.Series(tables.constraint_rows.fingerprints(CONSTRAINT_DIFF_FIELDS),
+                                     index=tables.constraint_rows.tickers),
+            'paths': pd.Series(tables.path_rows.fingerprints(PATH_DIFF_FIELDS), index=tables.path_rows.tickers),
+        }
+        previous = self._table_hashes
+        self._table_hashes = hashes
+        changed = 0
+        for name, diff in (('constraints', self._diff_constraints), ('paths', self._diff_paths)):
+            current = hashes[name]
+            if previous is not None:
+                current = current[current.ne(previous[name].reindex(current.index)).to_numpy()]
+            for ticker in current.index:
+                diff(ticker, getattr(tables, name)(ticker), now, alerts)
+            changed += len(current)
+        return changed
+
+    def _diff_constraints(self, ticker, constraints, now, alerts):
+        current = {c['name']: (c['status'], c.get('date')) for c in constraints}
+        ids = {c['name']: constraint_id(ticker, c) for c in constraints}
+        old = self._constraints.get(ticker)
+        self._constraints[ticker] = current
+        for name, (status, date) in current.items():
+            ts = _parse_date(date)
+            if status == 'open' and ts is not None and ts > now:
+                if old is None or old.get(name, (None, None))[1] != date:
+                    heapq.heappush(self._deadlines, (ts, ticker, name))
+            if old is None:
+                continue
+            previous = old.get(name)
+            if previous is not None and previous[0] != status:
+                alerts.append(make_alert('constraint', ticker, f"{name}: {previous[0]} → {status}", now))
+                if self.on_constraint_status is not None:
+                    self.on_constraint_status(ids[name], status)
+
+    def _diff_paths(self, ticker, paths, now, alerts):
+        current = {
+            (side, p['description'])
+            for side in ('yes_paths', 'no_paths')
+            for p in paths.get(side, [])
+        }
+        old = self._paths.get(ticker)
+        self._paths[ticker] = current
+        if old is not None:
+            for side, description in sorted(old - current):
+                label = 'YES' if side == 'yes_paths' else 'NO'
+                alerts.append(make_alert('path', ticker, f"{label} path collapsed: {description}", now))
+
+    def _pop_deadlines(self, now, alerts):
+        while self._deadlines and self._deadlines[0][0] <= now:
+            ts, ticker, name = heapq.heappop(self._deadlines)
+            status, date = self._constraints.get(ticker, {}).get(name, (None, None))
+            # Skip heap entries superseded by a status or date change
+            if status == 'open' and _parse_date(date) == ts:
+                alerts.append(make_alert('deadline', ticker, f"Deadline crossed: {name} ({date})", now))
@@ -0,0 +1,293 @@
+"""Headless JSON API over the shared market state (ASGI, no framework).
+
+Serves what the dashboard shows, straight from the data layer the app
+uses (DataProvider behind a SharedMarketState), with no Streamlit in the
+path:
+
+    GET /health
+    GET /markets                     filtered, sorted, paged market table
+    GET /signals                     the Pro+ priority signals: lag detected
+                                     and high structural certainty
+    GET /markets/<ticker>            market row plus constraints, paths, events
+    GET /markets/<ticker>/<part>     one of constraints / paths / events
+
+/markets and /signals take the dashboard filters as query parameters
+(repeat a parameter or comma-separate values): category, status (default
+active), lag=0 to hide lag-detected markets, high_certainty=0 to hide
+high-certainty ones. /markets also takes sort (a dashboard sort label),
+desc, page and page_size.
+
+Every response body is built once per (snapshot version, path, query) and
+kept in a bounded LRU together with its gzip encoding and ETag, so repeat
+requests are a dictionary lookup: If-None-Match answers 304 and clients
+sending Accept-Encoding: gzip get the precompressed bytes. A data reload
+bumps the snapshot version, which retires every cached body at once.
+A snapshot that has to wait for a markets (re)load and cache misses are
+taken and built on worker threads, so the event loop keeps answering
+hits.
+
+    python -m politics_edge.api --port 8080        (needs uvicorn)
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import parse_qs, unquote
+
+import numpy as np
+
+from politics_edge.dashboard import SORT_OPTIONS, page_window, sort_markets
+from politics_edge.data_provider import build_default_provider
+from politics_edge.detail_loader import local_fetchers
+from politics_edge.market_index import filter_spec
+from politics_edge.shared_state import SharedMarketState
+
+DETAIL = ('constraints', 'paths', 'events')
+MAX_PAGE_SIZE = 500
+# Bodies smaller than this are not worth a gzip member header
+COMPRESS_MIN_BYTES = 1024
+
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class _Response:
+    __slots__ = ('status', 'body', 'gzipped', 'etag')
+
+    def __init__(self, status, payload, version):
+        self.status = status
+        self.body = json.dumps(payload, separators=(',', ':'), default=_json_default).encode()
+        self.gzipped = gzip.compress(self.body, 5) if len(self.body) >= COMPRESS_MIN_BYTES else None
+        self.etag = f'"{version}-{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+def _records(df):
+    # float32 prices would otherwise serialize as 0.6200000047683716
+    return json.loads(df.to_json(orient='records', double_precision=6))
+
+
+def _values(query, name, default=None):
+    values = [v for raw in query.get(name, []) for v in raw.split(',') if v]
+    return values or default
+
+
+def _flag(query, name, default=True):
+    values = query.get(name)
+    return default if not values else values[-1].lower() not in ('0', 'false', 'no', 'off')
+
+
+def _int(query, name, default):
+    try:
+        return int(query[name][-1]) if name in query else default
+    except ValueError:
+        raise APIError(400, f"{name} must be an integer")
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [t.strip().removeprefix('W/') for t in header.split(',')]
+    return '*' in tags or etag in tags
+
+
+@lru_cache(maxsize=256)
+def _accepts_gzip(header):
+    """Whether an Accept-Encoding header admits gzip: q=0 refuses it, `*` covers it when unlisted"""
+    qualities = {}
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.strip().lower()] = q
+    return qualities.get('gzip', qualities.get('x-gzip', qualities.get('*', 0.0))) > 0
+
+
+class SignalsAPI:
+    """ASGI application serving markets, signals and per-ticker detail as JSON"""
+
+    def __init__(self, shared=None, cache_size=4096, executor=None):
+        self.shared = shared or SharedMarketState(build_default_provider())
+        self.fetchers = local_fetchers(self.shared.provider)
+        self.executor = executor
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'not_modified': 0}
+
+    # --------------------------------------------------------------- routing
+
+    def _filtered(self, snap, query):
+        index = snap.index
+        include, exclude = filter_spec(
+            _values(query, 'category', index.values('category')),
+            _values(query, 'status', ['active']),
+            _flag(query, 'lag'),
+            _flag(query, 'high_certainty'),
+        )
+        return index.df.iloc[index.select_positions(include, exclude)]
+
+    def _markets(self, snap, query):
+        df = self._filtered(snap, query)
+        sort = query.get('sort', ['Volume'])[-1]
+        if sort not in SORT_OPTIONS:
+            raise APIError(400, f"sort must be one of {list(SORT_OPTIONS)}")
+        desc = _flag(query, 'desc', None) if 'desc' in query else None
+        page_size = min(max(1, _int(query, 'page_size', 50)), MAX_PAGE_SIZE)
+        page_df, page, n_pages = page_window(sort_markets(df, sort, descending=desc), _int(query, 'page', 1), page_size)
+        return {'total': len(df), 'page': page, 'pages': n_pages, 'page_size': page_size, 'markets': _records(page_df)}
+
+    def _signals(self, snap, query):
+        df = self._filtered(snap, query)
+        return {
+            'lag_detected': _records(df[df['lag_status'] == 'detected']),
+            'high_certainty': _records(df[df['structural_certainty'] == 'high']),
+        }
+
+    def _detail(self, snap, ticker, parts):
+        markets = snap.markets
+        row = markets[markets['ticker'] == ticker]
+        if not len(row):
+            raise APIError(404, f"unknown market {ticker}")
+        detail = self.shared.detail(snap, ticker, parts, self.fetchers, self.executor)
+        if len(parts) == 1:
+            return detail
+        return {'market': _records(row)[0], **detail}
+
+    def _route(self, snap, path, query):
+        parts = [unquote(p) for p in path.split('/') if p]
+        if parts == ['health']:
+            return {'status': 'ok', 'markets': len(snap.markets)}
+        if parts == ['markets']:
+            return self._markets(snap, query)
+        if parts == ['signals']:
+            return self._signals(snap, query)
+        if len(parts) == 2 and parts[0] == 'markets':
+            return self._detail(snap, parts[1], list(DETAIL))
+        if len(parts) == 3 and parts[0] == 'markets' and parts[2] in DETAIL:
+            return self._detail(snap, parts[1], [parts[2]])
+        raise APIError(404, 'not found')
+
+    # ----------------------------------------------------------------- cache
+
+    def _lookup(self, snap, path, query_string):
+        """(parsed query, cache key, cached response or None) at snapshot `snap`"""
+        if isinstance(query_string, bytes):
+            query_string = query_string.decode('latin-1')
+        query = parse_qs(query_string)
+        key = (snap.version, path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        with self._lock:
+            self.stats['requests'] += 1
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+                self.stats['hits'] += 1
+        return query, key, response
+
+    def _build(self, key, snap, path, query):
+        with self._lock:
+            self.stats['misses'] += 1
+        try:
+            response = _Response(200, {'version': snap.version, **self._route(snap, path, query)}, snap.version)
+        except APIError as exc:
+            # Errors are cheap to rebuild and must not crowd out real bodies
+            return _Response(exc.status, {'error': exc.message}, snap.version)
+        with self._lock:
+            self._cache[key] = response
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return response
+
+    # ------------------------------------------------------------------ http
+
+    def respond(self, path, query_string=b'', headers=None):
+        """(status, header list, body) for a GET; the synchronous core of the app"""
+        snap = self.shared.snapshot()
+        query, key, response = self._lookup(snap, path, query_string)
+        if response is None:
+            response = self._build(key, snap, path, query)
+        return self._encode(response, headers or {})
+
+    def _encode(self, response, headers):
+        out = [
+            (b'content-type', b'application/json'),
+            (b'etag', response.etag.encode()),
+            (b'cache-control', b'no-cache'),
+            (b'vary', b'accept-encoding'),
+        ]
+        if response.status == 200 and _etag_matches(headers.get('if-none-match'), response.etag):
+            with self._lock:
+                self.stats['not_modified'] += 1
+            return 304, out[1:], b''
+        body = response.body
+        if response.gzipped is not None and _accepts_gzip(headers.get('accept-encoding', '')):
+            body = response.gzipped
+            out.append((b'content-encoding', b'gzip'))
+        out.append((b'content-length', str(len(body)).encode()))
+        return response.status, out, body
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+        if scope['method'] not in ('GET', 'HEAD'):
+            status, headers, body = 405, [(b'allow', b'GET, HEAD'), (b'content-length', b'0')], b''
+        else:
+            path = scope['path']
+            # A snapshot that has to wait for a markets (re)load is taken off the loop
+            snap = self.shared.snapshot_nowait() or await asyncio.to_thread(self.shared.snapshot)
+            query, key, response = self._lookup(snap, path, scope['query_string'])
+            if response is None:
+                # Building may fetch detail upstream; keep the loop free for cached hits
+                response = await asyncio.to_thread(self._build, key, snap, path, query)
+            headers = {k.decode('latin-1'): v.decode('latin-1') for k, v in scope['headers']}
+            status, headers, body = self._encode(response, headers)
+            if scope['method'] == 'HEAD':
+                body = b''
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Serving the API needs an ASGI server: pip install uvicorn")
+    uvicorn.run(SignalsAPI(), host=args.host, port=args.port, log_level='warning', access_log=False)
+
+
+if __name__ == '__main__':
+    main()
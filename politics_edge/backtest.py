@@ -0,0 +1,338 @@
+"""Backtest of the structural signals against what price did next.
+
+For every market the price history is replayed bar by bar through the
+same logic the app runs live: constraint transitions and path collapses
+rebuild the structural state (certainty_from over viable paths and open
+constraints), a LagDetector is fed each structural change and each price
+bar, and dated events are placed on the bar they happened. Three kinds of
+signal come out:
+
+    lag              the detector flipped to 'detected'; the signal points
+                     from the EWMA price towards the structurally implied
+                     probability
+    high_certainty   structural certainty moved into 'high'; points towards
+                     the implied probability
+    event            a dated event; points with its impact (neutral events
+                     are recorded but not scored)
+
+Each signal is scored by the price move `h` bars later for every horizon,
+signed by the signal's direction: positive means price went where the
+signal said it would.
+
+Structure is reconstructed from the loaders' final state. A dated
+constraint is open until its date and then takes its final status; an
+undated one holds its final status throughout. A recently collapsed path
+was viable until its collapsed_date on its `side` if the record has one,
+otherwise on the side that ended up with fewer viable paths (the outcome
+it did not lead to). The final viable counts are the markets table's
+paths_yes / paths_no, and the implied probability is the seat DP's
+P(YES) or the band-weighted share of the listed paths, as in the live
+table (see detect_lag_status).
+
+Markets are independent, so they are split into chunks and replayed on a
+process pool. Workers load their own data through the get_mock_* loaders
+(MOCK_MARKET_COUNT / MOCK_SEED carry over in the environment), so only
+tickers and their path counts go out and compact signal frames come back.
+
+    python -m politics_edge.backtest --years 3 --processes 8
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from politics_edge.constraint_graph import OPEN, certainty_from
+from politics_edge.lag_engine import DETECTED, LagDetector, implied_probability
+from politics_edge.mock_data import (
+    get_mock_constraints,
+    get_mock_events,
+    get_mock_markets,
+    get_mock_paths,
+    get_mock_races,
+)
+from politics_edge.path_engine import BAND_WEIGHTS, market_from_spec
+from politics_edge.price_history import get_price_history
+from politics_edge.price_store import PriceStore
+
+BACKTEST_END = '2026-12-31'
+HORIZONS = (1, 5, 20)
+
+# Live detection is tuned for ticks; daily bars need a slower EWMA and a
+# day's grace for the market to react to a structural change
+DETECTOR_SETTINGS = {'halflife': 3 * 86400.0, 'enter_threshold': 0.12, 'exit_threshold': 0.08, 'grace': 86400.0}
+
+IMPACT_DIRECTION = {'positive': 1, 'negative': -1, 'neutral': 0}
+SIGNAL_KINDS = ['lag', 'high_certainty', 'event']
+
+
+def _ns(date):
+    return pd.Timestamp(date).value
+
+
+def _viable_counts(paths, counts=None):
+    if 'yes_count' in paths:
+        return paths['yes_count'], paths['no_count']
+    if counts is not None:
+        return counts
+    return len(paths.get('yes_paths', [])), len(paths.get('no_paths', []))
+
+
+def _band_weight(paths):
+    return sum(BAND_WEIGHTS.get(p.get('probability_band'), 1.0) for p in paths)
+
+
+def structural_timeline(constraints, paths, seat_p_yes=None, counts=None):
+    """Initial (certainty, yes, no, p_yes) state and the dated changes after it.
+
+    Returns (initial, times, states): `times` are sorted nanosecond
+    timestamps and states[k] holds from times[k] on. Markets without
+    viable or collapsed paths have no structure (initial is None).
+
+    `counts` are the final (paths_yes, paths_no) of the markets table; the
+    listed paths are counted when it is None. p_yes is `seat_p_yes` (the seat DP's P(YES)) when given, otherwise the
+    band-weighted YES share of the listed paths, as band_yes_share computes
+    it live; a collapsed path counts with the default weight while viable.
+    """
+    yes, no = _viable_counts(paths, counts)
+    yes_weight, no_weight = _band_weight(paths.get('yes_paths', [])), _band_weight(paths.get('no_paths', []))
+    n_constraints = len(constraints)
+    open_now = sum(1 for c in constraints if c['status'] == OPEN)
+    changes = []
+    for c in constraints:
+        if c.get('date') and c['status'] != OPEN:
+            # Open until its date
+            open_now += 1
+            changes.append((_ns(c['date']), 'open', 0.0))
+    losing = 'no' if yes >= no else 'yes'
+    for p in paths.get('recently_collapsed', []):
+        if p.get('collapsed_date'):
+            side = p.get('side', losing)
+            weight = _band_weight([p])
+            if side == 'yes':
+                yes, yes_weight = yes + 1, yes_weight + weight
+            else:
+                no, no_weight = no + 1, no_weight + weight
+            changes.append((_ns(p['collapsed_date']), side, weight))
+    if not yes + no:
+        return None, np.empty(0, dtype=np.int64), []
+
+    def state():
+        if seat_p_yes is not None:
+            p_yes = seat_p_yes
+        else:
+            total = yes_weight + no_weight
+            p_yes = yes_weight / total if total > 0 else math.nan
+        return certainty_from(yes, no, open_now, n_constraints), yes, no, p_yes
+
+    initial = state()
+    changes.sort(key=lambda change: change[0])
+    times, states = [], []
+    for ts, what, weight in changes:
+        if what == 'open':
+            open_now -= 1
+        elif what == 'yes':
+            yes, yes_weight = yes - 1, yes_weight - weight
+        else:
+            no, no_weight = no - 1, no_weight - weight
+        if times and times[-1] == ts:
+            states[-1] = state()
+        else:
+            times.append(ts)
+            states.append(state())
+    return initial, np.array(times, dtype=np.int64), states
+
+
+def _direction(target, price):
+    return int(np.sign(round(target - price, 9)))
+
+
+def replay_market(ticker, prices, constraints, paths, events, horizons=HORIZONS, detector_settings=None,
+                  races=None, counts=None):
+    """Signals for one market as column arrays: ticker, ts, kind, direction, price, move_<h>.
+
+    `races` is the per-race spec of a seat-control market, whose seat DP
+    gives the implied probability; `counts` are the market's final
+    (paths_yes, paths_no) from the markets table.
+    """
+    ts = pd.DatetimeIndex(prices['date']).as_unit('ns').asi8
+    price = prices['price'].to_numpy(dtype=np.float64)
+    n = len(ts)
+    bars, kinds, directions = [], [], []
+
+    def emit(bar, kind, direction):
+        bars.append(bar)
+        kinds.append(SIGNAL_KINDS.index(kind))
+        directions.append(direction)
+
+    if not n:
+        return _signal_columns(ticker, ts, price, bars, kinds, directions, horizons)
+
+    seat_p_yes = market_from_spec(races).probability_yes() if races else None
+    initial, times, states = structural_timeline(constraints, paths, seat_p_yes, counts)
+    if initial is not None:
+        detector = LagDetector(**{**DETECTOR_SETTINGS, **(detector_settings or {})})
+        seconds = ts / 1e9
+        # A change lands on the first bar at or after it; earlier ones set the start state
+        change_bar = np.searchsorted(ts, times, 'left')
+        k = int(np.searchsorted(change_bar, 0, 'right'))
+        certainty, yes, no, p_yes = states[k - 1] if k else initial
+        detector.on_structure(ticker, seconds[0], certainty, yes, no, p_yes)
+
+        def lag(i):
+            state = detector.states[ticker]
+            emit(i, 'lag', _direction(state.implied, state.ewma_price))
+
+        for i in range(n):
+            while k < len(times) and change_bar[k] <= i:
+                new_certainty, yes, no, p_yes = states[k]
+                k += 1
+                flipped = detector.on_structure(ticker, seconds[i], new_certainty, yes, no, p_yes)
+                if new_certainty == 'high' and certainty != 'high':
+                    emit(i, 'high_certainty', _direction(implied_probability(new_certainty, yes, no, p_yes), price[i]))
+                certainty = new_certainty
+                if flipped == DETECTED:
+                    lag(i)
+            if detector.on_price(ticker, seconds[i], price[i]) == DETECTED:
+                lag(i)
+
+    for e in events:
+        event_ts = _ns(e['date'])
+        if ts[0] <= event_ts <= ts[-1]:
+            emit(int(np.searchsorted(ts, event_ts, 'left')), 'event', IMPACT_DIRECTION.get(e.get('impact'), 0))
+    return _signal_columns(ticker, ts, price, bars, kinds, directions, horizons)
+
+
+def _signal_columns(ticker, ts, price, bars, kinds, directions, horizons):
+    bars = np.asarray(bars, dtype=np.int64)
+    directions = np.asarray(directions, dtype=np.int8)
+    columns = {
+        'ticker': np.full(len(bars), ticker, dtype=object),
+        'ts': ts[bars],
+        'kind': np.asarray(kinds, dtype=np.int8),
+        'direction': directions,
+        'price': price[bars],
+    }
+    # Signed forward move h bars later; NaN when the history ends first
+    for h in horizons:
+        later = bars + h
+        move = np.full(len(bars), np.nan)
+        inside = later < len(price)
+        move[inside] = (price[later[inside]] - price[bars[inside]]) * directions[inside]
+        columns[f"move_{h}"] = move
+    return columns
+
+
+def _frame(parts, horizons):
+    columns = ['ticker', 'ts', 'kind', 'direction', 'price'] + [f"move_{h}" for h in horizons]
+    if not parts:
+        return pd.DataFrame({c: [] for c in columns})
+    df = pd.DataFrame({c: np.concatenate([p[c] for p in parts]) for c in columns})
+    df['ts'] = pd.to_datetime(df['ts'], unit='ns')
+    df['kind'] = pd.Categorical.from_codes(df['kind'], SIGNAL_KINDS)
+    return df
+
+
+def history_loader(years=3, freq='D', end=BACKTEST_END, store=None):
+    """Price history fetcher: the stored range for tickers in `store`, else a generated walk"""
+    end = pd.Timestamp(end)
+    start = end - pd.DateOffset(years=years)
+    periods = len(pd.date_range(start, end, freq=freq))
+
+    def load(ticker):
+        if store is not None and ticker in store:
+            return store.query(ticker, start, end).to_frame()
+        return get_price_history(ticker, periods=periods, freq=freq, end=end)
+    return load
+
+
+def _run_chunk(jobs, options):
+    """Worker: replay a chunk of (ticker, counts) markets with data loaded in this process"""
+    store = PriceStore() if options['use_store'] else None
+    load_history = history_loader(options['years'], options['freq'], options['end'], store)
+    parts = [
+        replay_market(ticker, load_history(ticker), get_mock_constraints(ticker), get_mock_paths(ticker),
+                      get_mock_events(ticker), options['horizons'], options['detector_settings'],
+                      get_mock_races(ticker), counts)
+        for ticker, counts in jobs
+    ]
+    return _frame(parts, options['horizons'])
+
+
+def run_backtest(tickers=None, processes=None, chunk_size=200, years=3, freq='D', end=BACKTEST_END,
+                 horizons=HORIZONS, detector_settings=None, use_store=True):
+    """Signals for every market (all of them by default), replayed on a process pool.
+
+    `processes=1` runs in this process; None uses every core.
+    """
+    markets = get_mock_markets().set_index('ticker')
+    if tickers is None:
+        tickers = markets.index.tolist()
+    counts = markets.reindex(tickers)[['paths_yes', 'paths_no']]
+    jobs = [
+        (ticker, None if pd.isna(yes) else (int(yes), int(no)))
+        for ticker, yes, no in zip(tickers, counts['paths_yes'], counts['paths_no'])
+    ]
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    options = {
+        'years': years, 'freq': freq, 'end': end, 'horizons': tuple(horizons),
+        'detector_settings': detector_settings, 'use_store': use_store,
+    }
+    if processes == 1 or len(chunks) <= 1:
+        frames = [_run_chunk(chunk, options) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            frames = list(pool.map(_run_chunk, chunks, repeat(options)))
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return _frame([], horizons)
+    signals = pd.concat(frames, ignore_index=True)
+    signals['kind'] = pd.Categorical(signals['kind'], SIGNAL_KINDS)
+    return signals
+
+
+def summarize(signals, horizons=HORIZONS):
+    """Per signal kind: count, and per horizon the mean signed move and hit rate"""
+    scored = signals[signals['direction'] != 0]
+    rows = []
+    for kind in SIGNAL_KINDS:
+        group = scored[scored['kind'] == kind]
+        row = {'kind': kind, 'signals': int((signals['kind'] == kind).sum()), 'scored': len(group)}
+        for h in horizons:
+            moves = group[f"move_{h}"].dropna()
+            row[f"mean_move_{h}"] = moves.mean() if len(moves) else np.nan
+            row[f"hit_rate_{h}"] = (moves > 0).mean() if len(moves) else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('kind')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--freq', default='D', help='bar size of generated histories')
+    parser.add_argument('--end', default=BACKTEST_END)
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--horizons', type=int, nargs='+', default=list(HORIZONS))
+    parser.add_argument('--out', help='write every signal to this CSV file')
+    args = parser.parse_args()
+
+    tickers = get_mock_markets()['ticker'].tolist()
+    start = time.perf_counter()
+    signals = run_backtest(tickers, args.processes, args.chunk_size, args.years, args.freq, args.end, args.horizons)
+    elapsed = time.perf_counter() - start
+    print(f"{len(tickers):,} markets, {len(signals):,} signals in {elapsed:.1f} s "
+          f"on {args.processes or os.cpu_count()} processes")
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.float_format', '{:.4f}'.format):
+        print(summarize(signals, args.horizons))
+    if args.out:
+        signals.to_csv(args.out, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Price-history chart with event markers.
+
+Events are aligned to the price series with one sorted as-of join
+(nearest timestamp) instead of an O(N) argmin per event, and every marker
+goes into a single Scatter trace with per-point colors and hovertext, so
+figure size grows with the number of points, not the number of traces.
+
+The price line is cut to the visible window and downsampled to about the
+chart's pixel width (downsample.lttb by default), so a years-long minute
+history sends a couple of thousand points, not millions. Above
+WEBGL_THRESHOLD drawn points the line is a WebGL Scattergl trace. The app
+re-queries a zoomed window at full resolution and passes it back in with
+`window`, so detail appears as the user zooms in.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from politics_edge.downsample import downsample
+
+IMPACT_COLORS = {'positive': 'green', 'negative': 'red', 'neutral': 'gray'}
+
+# About two points per pixel of a wide chart
+MAX_POINTS = 2000
+WEBGL_THRESHOLD = 1000
+
+
+def align_events(price_df, events):
+    """Attach the nearest price to each event on or after the first price date.
+
+    Returns a DataFrame with `date`, `price`, `event` and `impact` columns,
+    sorted by date.
+    """
+    columns = ['date', 'price', 'event', 'impact']
+    if not len(events) or not len(price_df):
+        return pd.DataFrame(columns=columns)
+
+    ev = pd.DataFrame(events)
+    ev['date'] = pd.to_datetime(ev['date'])
+    ev = ev[ev['date'] >= price_df['date'].min()].sort_values('date', kind='stable')
+    if ev.empty:
+        return pd.DataFrame(columns=columns)
+
+    prices = price_df[['date', 'price']]
+    if not prices['date'].is_monotonic_increasing:
+        prices = prices.sort_values('date', kind='stable')
+    # merge_asof needs matching datetime resolutions on both sides
+    ev['date'] = ev['date'].astype(prices['date'].dtype)
+    aligned = pd.merge_asof(ev[['date', 'event', 'impact']], prices, on='date', direction='nearest')
+    return aligned[columns]
+
+
+def event_marker_trace(aligned):
+    """All event markers as one trace with per-point colors and hovertext"""
+    return go.Scatter(
+        x=aligned['date'],
+        y=aligned['price'],
+        mode='markers',
+        marker=dict(
+            size=12,
+            color=aligned['impact'].map(IMPACT_COLORS).fillna('gray').tolist(),
+            symbol='diamond',
+        ),
+        name='Events',
+        hovertext=aligned['event'].tolist(),
+    )
+
+
+def visible_window(price_df, window=None):
+    """Rows of a date-sorted `price_df` with start <= date < end"""
+    if window is None:
+        return price_df
+    dates = price_df['date'].to_numpy()
+    start, end = (np.datetime64(pd.Timestamp(bound), 'ns') for bound in window)
+    lo, hi = np.searchsorted(dates, start, 'left'), np.searchsorted(dates, end, 'left')
+    return price_df.iloc[lo:hi]
+
+
+def chart_points(price_df, window=None, max_points=MAX_POINTS, method='lttb'):
+    """(points to draw, rows in the window): the window downsampled to `max_points`"""
+    if not price_df['date'].is_monotonic_increasing:
+        price_df = price_df.sort_values('date', kind='stable')
+    visible = visible_window(price_df, window)
+    if len(visible) <= max_points:
+        return visible, len(visible)
+    keep = downsample(visible['date'].to_numpy(), visible['price'].to_numpy(), max_points, method)
+    return visible.iloc[keep], len(visible)
+
+
+def build_price_figure(price_df, events=None, window=None, max_points=MAX_POINTS, method='lttb'):
+    """YES price line (downsampled to the visible window) plus optional event markers.
+
+    `window` is a (start, end) pair of anything pd.Timestamp accepts. The
+    figure's layout.meta records how many of the window's points were drawn.
+    """
+    fig = go.Figure()
+
+    # Price line
+    points, total = chart_points(price_df, window, max_points, method)
+    trace = go.Scattergl if len(points) > WEBGL_THRESHOLD else go.Scatter
+    fig.add_trace(trace(
+        x=points['date'],
+        y=points['price'],
+        mode='lines',
+        name='YES Price',
+        line=dict(color='#6366f1', width=2)
+    ))
+
+    if events:
+        aligned = visible_window(align_events(price_df, events), window)
+        if len(aligned):
+            fig.add_trace(event_marker_trace(aligned))
+
+    fig.update_layout(
+        height=350,
+        margin=dict(l=0, r=0, t=30, b=0),
+        xaxis_title="",
+        yaxis_title="Price ($)",
+        yaxis=dict(range=[0, 1]),
+        showlegend=False,
+        hovermode='x unified',
+        # Dragging selects a time range, which the app re-queries at full resolution
+        dragmode='select',
+        selectdirection='h',
+        meta={'points': len(points), 'window_points': total},
+    )
+    if window is not None:
+        fig.update_xaxes(range=[pd.Timestamp(window[0]), pd.Timestamp(window[1])])
+    return fig
@@ -0,0 +1,240 @@
+"""Compact typed columnar storage for markets and their child records.
+
+The loaders speak in Python objects: a markets frame built from a list of
+dicts, and per-ticker lists of dicts for constraints, paths and events.
+That is convenient for one market and very expensive for a catalog, where
+every repeated 'open' or 'viable' is its own string pointer in its own
+dict.
+
+Here the same data is held as typed columns:
+
+    markets      categoricals for the repeated labels, float32 prices,
+                 int32 volumes and path counts (when they fit)
+    ChildTable   every child row of every market in one set of flat
+                 columns, rows grouped by ticker code, with an offsets
+                 array so market i owns rows offsets[i]:offsets[i + 1]
+
+String fields become pandas Categoricals (int8 / int16 codes plus one copy
+of each distinct value), integers and booleans become NumPy arrays.
+`records(ticker)` turns one market's rows back into the loader's list of
+dicts, so per-market consumers do not change.
+"""
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMNS = ('category', 'subcategory', 'status', 'lag_status', 'structural_certainty')
+FLOAT32_COLUMNS = ('yes_price',)
+INT32_COLUMNS = ('volume', 'paths_yes', 'paths_no')
+
+PATH_SECTIONS = ('yes_paths', 'no_paths', 'recently_collapsed')
+
+_INT32 = np.iinfo(np.int32)
+
+
+def compact_markets(df):
+    """Markets frame with the compact dtypes; returns a new frame.
+
+    Integer columns stay int64 when a value would not fit in int32 (path
+    counts of a large seat-control market can), so compaction never changes
+    a value.
+    """
+    columns = {}
+    for column in CATEGORY_COLUMNS:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            columns[column] = df[column].astype('category')
+    for column in FLOAT32_COLUMNS:
+        if column in df:
+            columns[column] = df[column].astype(np.float32)
+    for column in INT32_COLUMNS:
+        if column in df and len(df):
+            values = df[column]
+            if values.min() >= _INT32.min and values.max() <= _INT32.max:
+                columns[column] = values.astype(np.int32)
+    return df.assign(**columns) if columns else df
+
+
+def _column(values):
+    """Typed array for one field: bool, int, float or a Categorical of labels"""
+    present = [v for v in values if v is not None]
+    if present and len(present) == len(values):
+        if all(isinstance(v, (bool, np.bool_)) for v in present):
+            return np.array(values, dtype=bool)
+        if all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in present):
+            array = np.array(values, dtype=np.int64)
+            if array.min() >= _INT32.min and array.max() <= _INT32.max:
+                array = array.astype(np.int32)
+            return array
+    try:
+        return pd.Categorical(values)
+    except TypeError:
+        # Unhashable values (lists of constraint ids) stay Python objects
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+
+
+def _decoder(column):
+    """Function mapping a row slice of `column` to a list of Python values"""
+    if isinstance(column, pd.Categorical):
+        # Code -1 (missing) indexes the trailing None
+        labels = np.append(column.categories.to_numpy(dtype=object), None)
+        codes = column.codes
+        return lambda lo, hi: labels[codes[lo:hi]].tolist()
+    return lambda lo, hi: column[lo:hi].tolist()
+
+
+class ChildTable:
+    """Child rows of many markets as flat typed columns grouped by ticker code"""
+
+    def __init__(self, tickers, offsets, columns, optional=()):
+        """`columns` maps field name to a Categorical or ndarray of equal length.
+
+        Fields in `optional` are left out of a record when they are missing
+        (None), the way the loaders only set `depends_on` or `requires` on
+        some records.
+        """
+        self.tickers = pd.Index(tickers)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.columns = columns
+        self.optional = frozenset(optional)
+        self._decoders = {name: _decoder(column) for name, column in columns.items()}
+
+    @classmethod
+    def from_records(cls, tickers, records):
+        """Build from an iterable of per-ticker record lists (aligned with `tickers`)"""
+        counts, rows = [], []
+        for ticker_rows in records:
+            counts.append(len(ticker_rows))
+            rows.extend(ticker_rows)
+        fields = list(dict.fromkeys(key for row in rows for key in row))
+        optional = [f for f in fields if any(f not in row for row in rows)]
+        columns = {f: _column([row.get(f) for row in rows]) for f in fields}
+        offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        return cls(tickers, offsets, columns, optional)
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def __contains__(self, ticker):
+        return ticker in self.tickers
+
+    def code(self, ticker):
+        """Ticker code (row of the offsets index), or -1 when absent"""
+        try:
+            return self.tickers.get_loc(ticker)
+        except KeyError:
+            return -1
+
+    def bounds(self, ticker):
+        code = self.code(ticker)
+        if code < 0:
+            return 0, 0
+        return int(self.offsets[code]), int(self.offsets[code + 1])
+
+    def records(self, ticker):
+        """One market's rows as a list of dicts, in their original order"""
+        lo, hi = self.bounds(ticker)
+        if lo == hi:
+            return []
+        values = {name: decode(lo, hi) for name, decode in self._decoders.items()}
+        optional = self.optional
+        return [
+            {name: value for name, value in zip(values, row) if value is not None or name not in optional}
+            for row in zip(*values.values())
+        ]
+
+    def labels(self, field):
+        """Every row's value of `field` as an object array, None where a row has none"""
+        column = self.columns.get(field)
+        if column is None:
+            return np.full(len(self), None, dtype=object)
+        if isinstance(column, pd.Categorical):
+            return np.append(column.categories.to_numpy(dtype=object), None)[column.codes]
+        return column.astype(object, copy=False)
+
+    def owners(self):
+        """Ticker code of every row"""
+        return np.repeat(np.arange(len(self.tickers)), np.diff(self.offsets))
+
+    def fingerprints(self, fields):
+        """Per-ticker uint64 hash of `fields` over each market's rows, aligned with `tickers`.
+
+        Each row is hashed whole and the row hashes are summed per market,
+        so the result follows the set of rows, not their order. Fields the
+        table does not have are ignored.
+        """
+        present = [f for f in fields if f in self.columns]
+        if not present:
+            return np.zeros(len(self.tickers), dtype=np.uint64)
+        rows = pd.util.hash_pandas_object(
+            pd.DataFrame({f: self.columns[f] for f in present}), index=False).to_numpy()
+        running = np.concatenate(([np.uint64(0)], np.cumsum(rows, dtype=np.uint64)))
+        return running[self.offsets[1:]] - running[self.offsets[:-1]]
+
+    def nbytes(self):
+        total = self.offsets.nbytes
+        for column in self.columns.values():
+            if isinstance(column, pd.Categorical):
+                total += column.codes.nbytes + column.categories.memory_usage(deep=True)
+            else:
+                total += column.nbytes
+        return total
+
+
+class CatalogTables:
+    """Constraints, paths and events for a whole catalog, one ChildTable each.
+
+    Paths of all three sections share a table with a `section` column.
+    Per-market path scalars (the seat-control `yes_count` / `no_count`) are
+    few and stay in a plain dict.
+    """
+
+    def __init__(self, constraints, paths, events, path_extras=None):
+        self.constraint_rows = constraints
+        self.path_rows = paths
+        self.event_rows = events
+        self.path_extras = path_extras or {}
+
+    @classmethod
+    def from_loaders(cls, tickers, constraints_loader, paths_loader, events_loader):
+        """Tables from get_mock_constraints / get_mock_paths / get_mock_events style loaders"""
+        tickers = list(tickers)
+        path_rows, extras = [], {}
+        for ticker in tickers:
+            paths = paths_loader(ticker)
+            path_rows.append([
+                {'section': section, **p} for section in PATH_SECTIONS for p in paths.get(section, [])
+            ])
+            extra = {k: v for k, v in paths.items() if k not in PATH_SECTIONS}
+            if extra:
+                extras[ticker] = extra
+        return cls(
+            ChildTable.from_records(tickers, (constraints_loader(t) for t in tickers)),
+            ChildTable.from_records(tickers, path_rows),
+            ChildTable.from_records(tickers, (events_loader(t) for t in tickers)),
+            extras,
+        )
+
+    @property
+    def tickers(self):
+        return self.constraint_rows.tickers
+
+    def __contains__(self, ticker):
+        return ticker in self.constraint_rows
+
+    def constraints(self, ticker):
+        return self.constraint_rows.records(ticker)
+
+    def paths(self, ticker):
+        result = {section: [] for section in PATH_SECTIONS}
+        for record in self.path_rows.records(ticker):
+            result[record.pop('section')].append(record)
+        result.update(self.path_extras.get(ticker, {}))
+        return result
+
+    def events(self, ticker):
+        return self.event_rows.records(ticker)
+
+    def nbytes(self):
+        return self.constraint_rows.nbytes() + self.path_rows.nbytes() + self.event_rows.nbytes()
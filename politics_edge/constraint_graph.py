@@ -0,0 +1,317 @@
+"""Constraint dependency graph with incremental propagation to paths and certainty.
+
+Constraints (filing deadlines, ballot challenges, court reviews, ...) form a
+DAG: a constraint may depend on upstream constraints, and a blocked
+upstream constraint blocks everything below it. Paths hang off the
+constraints they need:
+
+    requires    the path dies if the constraint ends up blocked
+    blocked_by  the path dies if the constraint passes / resolves
+
+A constraint can be shared by many markets (one SCOTUS ruling affecting
+several contracts). When a constraint changes status only its downstream
+cone is dirty-marked and recomputed, in topological order: effective
+constraint statuses, then the viability of the paths hanging off changed
+constraints, then path counts and structural certainty of the markets that
+own them. Nothing else in the graph is touched.
+"""
+
+import heapq
+
+OPEN = 'open'
+PASSED = 'passed'
+BLOCKED = 'blocked'
+RESOLVED = 'resolved'
+CLEARED = (PASSED, RESOLVED)
+
+
+class _Constraint:
+    __slots__ = ('cid', 'status', 'effective', 'rank', 'parents', 'children', 'paths', 'markets')
+
+    def __init__(self, cid, status):
+        self.cid = cid
+        self.status = status
+        self.effective = status
+        self.rank = 0
+        self.parents = []
+        self.children = []
+        self.paths = []
+        self.markets = set()
+
+
+class _Path:
+    __slots__ = ('pid', 'market', 'side', 'requires', 'blocked_by', 'viable')
+
+    def __init__(self, pid, market, side, requires, blocked_by):
+        self.pid = pid
+        self.market = market
+        self.side = side
+        self.requires = requires
+        self.blocked_by = blocked_by
+        self.viable = True
+
+
+class _Market:
+    __slots__ = ('ticker', 'yes_viable', 'no_viable', 'n_paths', 'open_constraints', 'n_constraints', 'certainty')
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.yes_viable = 0
+        self.no_viable = 0
+        self.n_paths = 0
+        self.open_constraints = 0
+        self.n_constraints = 0
+        self.certainty = None
+
+
+def certainty_from(yes_viable, no_viable, open_constraints, n_constraints):
+    """Structural certainty label from viable path counts and open constraints"""
+    if yes_viable == 0 or no_viable == 0:
+        return RESOLVED if open_constraints == 0 else 'high'
+    share = max(yes_viable, no_viable) / (yes_viable + no_viable)
+    if share >= 0.75 or open_constraints <= n_constraints / 2:
+        return 'medium'
+    return 'low'
+
+
+class ChangeSet:
+    """What one status change touched, for alerting and UI refresh"""
+
+    __slots__ = ('constraints', 'paths', 'markets')
+
+    def __init__(self):
+        self.constraints = {}  # cid -> (old effective, new effective)
+        self.paths = {}        # pid -> new viable flag
+        self.markets = {}      # ticker -> (yes_viable, no_viable, certainty)
+
+    def __bool__(self):
+        return bool(self.constraints or self.paths or self.markets)
+
+
+class ConstraintGraph:
+    """DAG of constraints -> paths -> markets with incremental recomputation"""
+
+    def __init__(self):
+        self.constraints = {}
+        self.paths = {}
+        self.markets = {}
+
+    def _market(self, ticker):
+        market = self.markets.get(ticker)
+        if market is None:
+            market = self.markets[ticker] = _Market(ticker)
+        return market
+
+    # ------------------------------------------------------------------ build
+
+    def add_constraint(self, cid, status=OPEN, market=None, depends_on=()):
+        """Add a constraint (or attach an existing shared one to another market).
+
+        Upstream constraints must already exist, which keeps the graph acyclic.
+        """
+        node = self.constraints.get(cid)
+        if node is None:
+            node = self.constraints[cid] = _Constraint(cid, status)
+            for parent_id in depends_on:
+                parent = self.constraints[parent_id]
+                node.parents.append(parent)
+                parent.children.append(node)
+                node.rank = max(node.rank, parent.rank + 1)
+            node.effective = self._effective(node)
+        if market is not None and market not in node.markets:
+            node.markets.add(market)
+            m = self._market(market)
+            m.n_constraints += 1
+            m.open_constraints += node.effective == OPEN
+            m.certainty = self._certainty(m)
+        return node
+
+    def add_path(self, pid, market, side, requires=(), blocked_by=()):
+        path = _Path(pid, market, side, tuple(requires), tuple(blocked_by))
+        self.paths[pid] = path
+        for cid in path.requires + path.blocked_by:
+            self.constraints[cid].paths.append(path)
+        path.viable = self._viable(path)
+        m = self._market(market)
+        m.n_paths += 1
+        if path.viable:
+            self._bump(m, side, 1)
+        m.certainty = self._certainty(m)
+        return path
+
+    # --------------------------------------------------------------- evaluate
+
+    @staticmethod
+    def _effective(node):
+        if any(parent.effective == BLOCKED for parent in node.parents):
+            return BLOCKED
+        return node.status
+
+    def _viable(self, path):
+        constraints = self.constraints
+        if any(constraints[cid].effective == BLOCKED for cid in path.requires):
+            return False
+        return not any(constraints[cid].effective in CLEARED for cid in path.blocked_by)
+
+    @staticmethod
+    def _bump(market, side, delta):
+        if side == 'yes':
+            market.yes_viable += delta
+        else:
+            market.no_viable += delta
+
+    @staticmethod
+    def _certainty(market):
+        if not market.n_paths:
+            return None
+        return certainty_from(market.yes_viable, market.no_viable, market.open_constraints, market.n_constraints)
+
+    # ----------------------------------------------------------------- update
+
+    def set_status(self, cid, status):
+        """Move one constraint to a new status and propagate downstream only"""
+        changes = ChangeSet()
+        root = self.constraints[cid]
+        if root.status == status:
+            return changes
+        root.status = status
+
+        # Dirty constraints, processed in topological (rank) order
+        heap = [(root.rank, id(root), root)]
+        queued = {root.cid}
+        dirty_paths = {}
+        dirty_markets = set()
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            new = self._effective(node)
+            if new == node.effective:
+                continue
+            old = node.effective
+            node.effective = new
+            changes.constraints[node.cid] = (old, new)
+            if (old == OPEN) != (new == OPEN):
+                for ticker in node.markets:
+                    self.markets[ticker].open_constraints += 1 if new == OPEN else -1
+                    dirty_markets.add(ticker)
+            for path in node.paths:
+                dirty_paths[path.pid] = path
+            for child in node.children:
+                if child.cid not in queued:
+                    queued.add(child.cid)
+                    heapq.heappush(heap, (child.rank, id(child), child))
+
+        for path in dirty_paths.values():
+            viable = self._viable(path)
+            if viable != path.viable:
+                path.viable = viable
+                changes.paths[path.pid] = viable
+                self._bump(self.markets[path.market], path.side, 1 if viable else -1)
+                dirty_markets.add(path.market)
+
+        for ticker in dirty_markets:
+            market = self.markets[ticker]
+            market.certainty = self._certainty(market)
+            changes.markets[ticker] = (market.yes_viable, market.no_viable, market.certainty)
+        return changes
+
+    # ------------------------------------------------------------------ query
+
+    def market_summary(self, ticker):
+        """(yes_viable, no_viable, certainty) for a market with linked paths, else None"""
+        market = self.markets.get(ticker)
+        if market is None or not market.n_paths:
+            return None
+        return market.yes_viable, market.no_viable, market.certainty
+
+    def downstream_markets(self, cid):
+        """Markets whose summary depends on `cid`: owners and path owners of its downstream cone"""
+        root = self.constraints[cid]
+        seen, stack, markets = {cid}, [root], set()
+        while stack:
+            node = stack.pop()
+            markets.update(node.markets)
+            markets.update(path.market for path in node.paths)
+            for child in node.children:
+                if child.cid not in seen:
+                    seen.add(child.cid)
+                    stack.append(child)
+        return markets
+
+    def effective_status(self, cid):
+        return self.constraints[cid].effective
+
+
+def constraint_id(ticker, constraint):
+    """Shared constraints carry an explicit id; the rest are scoped to their market"""
+    return constraint.get('id') or f"{ticker}:{constraint['name']}"
+
+
+def build_constraint_graph(tickers, constraints_loader, paths_loader, lookup=None):
+    """Graph over the given markets from get_mock_constraints / get_mock_paths style loaders.
+
+    Path records link to constraints through optional `requires` and
+    `blocked_by` lists of constraint ids; unlinked paths are left out.
+    `lookup(cid)` returns (ticker, record) for a constraint of a market not
+    in `tickers`, or None; it pulls in the upstream constraints that a
+    depends_on or a path of the given markets names.
+    """
+    graph = ConstraintGraph()
+    pending, listed = [], set()
+    for ticker in tickers:
+        for c in constraints_loader(ticker):
+            cid = constraint_id(ticker, c)
+            listed.add(cid)
+            pending.append((ticker, cid, c))
+    linked = []
+    for ticker in tickers:
+        paths = paths_loader(ticker)
+        for side, key in (('yes', 'yes_paths'), ('no', 'no_paths')):
+            for i, p in enumerate(paths.get(key, [])):
+                if 'requires' in p or 'blocked_by' in p:
+                    linked.append((f"{ticker}:{side}:{i}", ticker, side, p.get('requires', ()), p.get('blocked_by', ())))
+
+    def pull(cids):
+        for cid in cids:
+            found = lookup(cid) if cid not in listed else None
+            if found is not None:
+                listed.add(cid)
+                pending.append((found[0], cid, found[1]))
+                pull(found[1].get('depends_on', ()))
+
+    if lookup is not None:
+        for _, _, c in list(pending):
+            pull(c.get('depends_on', ()))
+        for _, _, _, requires, blocked_by in linked:
+            pull(requires)
+            pull(blocked_by)
+
+    # Add upstream constraints first so depends_on always resolves
+    added = set()
+    while pending:
+        remaining = []
+        for ticker, cid, c in pending:
+            depends_on = c.get('depends_on', ())
+            if all(d in added for d in depends_on):
+                graph.add_constraint(cid, c['status'], ticker, depends_on)
+                added.add(cid)
+            else:
+                remaining.append((ticker, cid, c))
+        if len(remaining) == len(pending):
+            raise ValueError(f"Unresolvable constraint dependencies: {[cid for _, cid, _ in remaining]}")
+        pending = remaining
+
+    for path in linked:
+        graph.add_path(*path)
+    return graph
+
+
+
+def apply_constraint_graph(markets_df, graph):
+    """Overwrite path counts and certainty for markets whose paths are linked in `graph`"""
+    cols = [markets_df.columns.get_loc(c) for c in ('paths_yes', 'paths_no', 'structural_certainty')]
+    tickers = markets_df['ticker']
+    # Only markets with linked paths have a summary; find their rows in one pass
+    for i in tickers.isin([t for t, market in graph.markets.items() if market.n_paths]).to_numpy().nonzero()[0]:
+        for col, value in zip(cols, graph.market_summary(tickers.iat[i])):
+            markets_df.iloc[i, col] = value
+    return markets_df
@@ -0,0 +1,58 @@
+"""Server-side sorting and windowing for the market dashboard.
+
+The dashboard renders roughly ten frontend elements per market row, so only
+one page of rows is ever emitted. Sorting happens here on the full filtered
+frame, before slicing, so page N is page N of the sorted catalog.
+"""
+
+import math
+
+# Display label -> (column, default ascending)
+SORT_OPTIONS = {
+    'Volume': ('volume', False),
+    'YES Price': ('yes_price', False),
+    'Certainty': ('structural_certainty', True),
+    'Paths (YES)': ('paths_yes', False),
+    'Expiration': ('expiration', True),
+    'Title': ('title', True),
+}
+
+CERTAINTY_ORDER = ['high', 'medium', 'low', 'resolved']
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+# Columns shown by the single-element table view
+TABLE_COLUMNS = [
+    'title', 'yes_price', 'paths_yes', 'paths_no', 'structural_certainty',
+    'lag_status', 'volume', 'subcategory', 'constraint_summary',
+]
+
+
+def _certainty_rank(series):
+    # Rank by structural meaning, not alphabetically
+    rank = {v: i for i, v in enumerate(CERTAINTY_ORDER)}
+    return series.map(rank).astype(float).fillna(len(rank))
+
+
+def sort_markets(df, sort_label, descending=None):
+    """Return `df` sorted by a SORT_OPTIONS label (stable, NaNs last)"""
+    column, ascending = SORT_OPTIONS[sort_label]
+    if descending is not None:
+        ascending = not descending
+    key = _certainty_rank if column == 'structural_certainty' else None
+    return df.sort_values(column, ascending=ascending, kind='stable', na_position='last', key=key)
+
+
+def page_count(n_rows, page_size):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def page_window(df, page, page_size):
+    """Rows for 1-based `page`, with the page clamped to the valid range.
+
+    Returns (page_df, page, n_pages).
+    """
+    n_pages = page_count(len(df), page_size)
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size], page, n_pages
@@ -0,0 +1,310 @@
+"""Cached, TTL-bounded data provider sitting in front of the market data sources.
+
+Each dataset (markets, constraints, paths, events) is registered with a loader
+and a TTL. Reads inside the TTL are served from memory. Reads after the TTL
+but inside the stale window return the cached value immediately and refresh it
+on a background thread (stale-while-revalidate). Anything older is reloaded
+synchronously. A rerun that only changes a filter therefore touches no source.
+Concurrent misses on the same key share one load: the first caller runs the
+loader and the others wait for its result.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from itertools import takewhile
+
+import numpy as np
+import pandas as pd
+
+from politics_edge.constraint_graph import apply_constraint_graph, build_constraint_graph
+from politics_edge.lag_engine import detect_lag_status
+from politics_edge.market_index import MarketIndex
+from politics_edge.path_engine import apply_path_counts, band_yes_share
+from politics_edge.mock_data import (
+    get_mock_markets,
+    get_mock_race_specs,
+    get_mock_constraints,
+    get_mock_paths,
+    get_mock_events,
+    get_mock_tables,
+)
+
+# Default per-dataset TTLs in seconds: (fresh ttl, extra stale window)
+DEFAULT_TTLS = {
+    'markets': (30, 120),
+    'races': (300, 900),
+    'constraints': (300, 900),
+    'paths': (300, 900),
+    'events': (120, 600),
+}
+
+
+class _Entry:
+    __slots__ = ('value', 'loaded_at', 'refreshing', 'version')
+
+    def __init__(self, value, loaded_at, version):
+        self.value = value
+        self.loaded_at = loaded_at
+        self.refreshing = False
+        self.version = version
+
+
+class DataProvider:
+    """Per-dataset TTL cache with stale-while-revalidate and hit/miss counters"""
+
+    def __init__(self, clock=time.monotonic, background=True, change_log_size=100_000):
+        self._clock = clock
+        self._background = background
+        self._lock = threading.RLock()
+        self._datasets = {}
+        self._entries = {}
+        self._inflight = {}
+        self._stats = {}
+        # (version, key) for every store, so consumers can diff only what reloaded
+        self._version = 0
+        self._change_log = deque(maxlen=change_log_size)
+
+    def register(self, name, loader, ttl, stale_ttl=0):
+        """Register a dataset loader; extra args to get() are passed through"""
+        with self._lock:
+            self._datasets[name] = (loader, ttl, stale_ttl)
+            self._stats[name] = {
+                'hits': 0, 'stale_hits': 0, 'misses': 0, 'waits': 0, 'refreshes': 0, 'errors': 0,
+            }
+
+    def get(self, name, *args):
+        """Return the dataset value for `args`, loading or refreshing as needed"""
+        loader = self._datasets[name][0]
+        key = (name, args)
+        with self._lock:
+            entry = self._cached(key)
+            if entry is not None:
+                return entry.value
+            stats = self._stats[name]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                stats['misses'] += 1
+            else:
+                stats['waits'] += 1
+
+        if owner:
+            try:
+                value = loader(*args)
+            except Exception as exc:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                future.set_exception(exc)
+                raise
+            with self._lock:
+                self._store(key, value)
+                self._inflight.pop(key, None)
+            future.set_result(value)
+        return future.result()
+
+    def get_nowait(self, name, *args):
+        """What get() would return without loading (fresh, or stale and refreshing); else None"""
+        with self._lock:
+            entry = self._cached((name, args))
+            return entry.value if entry is not None else None
+
+    def _cached(self, key):
+        """The entry get() may serve for `key`, counted and refreshed if stale; caller holds _lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        name, args = key
+        loader, ttl, stale_ttl = self._datasets[name]
+        age = self._clock() - entry.loaded_at
+        if age < ttl:
+            self._stats[name]['hits'] += 1
+            return entry
+        if age < ttl + stale_ttl:
+            self._stats[name]['stale_hits'] += 1
+            if not entry.refreshing:
+                entry.refreshing = True
+                self._schedule_refresh(key, loader, args)
+            return entry
+        return None
+
+    def _store(self, key, value):
+        self._version += 1
+        self._entries[key] = _Entry(value, self._clock(), self._version)
+        self._change_log.append((self._version, key))
+
+    def _schedule_refresh(self, key, loader, args):
+        if self._background:
+            threading.Thread(target=self._refresh, args=(key, loader, args), daemon=True).start()
+        else:
+            self._refresh(key, loader, args)
+
+    def _refresh(self, key, loader, args):
+        name = key[0]
+        try:
+            value = loader(*args)
+        except Exception:
+            # Keep serving the stale value; the next read past the window reloads
+            with self._lock:
+                self._stats[name]['errors'] += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+        with self._lock:
+            self._store(key, value)
+            self._stats[name]['refreshes'] += 1
+
+    def invalidate(self, name=None, *args):
+        """Drop cached entries: everything, one dataset, or one dataset key"""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            elif args:
+                self._entries.pop((name, args), None)
+            else:
+                for key in [k for k in self._entries if k[0] == name]:
+                    del self._entries[key]
+
+    @property
+    def version(self):
+        return self._version
+
+    def changes_since(self, version):
+        """Keys (name, args) stored after `version`, and the current version.
+
+        Returns None for the keys when the change log no longer reaches back
+        to `version`; the caller should then resynchronise from scratch.
+        """
+        with self._lock:
+            if self._change_log and self._change_log[0][0] > version + 1 and version < self._version:
+                return None, self._version
+            recent = takewhile(lambda item: item[0] > version, reversed(self._change_log))
+            return {key for _, key in recent}, self._version
+
+    def peek(self, name, *args):
+        """Cached value without loading or touching the counters (None if absent)"""
+        with self._lock:
+            entry = self._entries.get((name, args))
+            return entry.value if entry is not None else None
+
+    def stats(self):
+        """Snapshot of hit/miss counters per dataset"""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._stats.items()}
+
+    # Convenience accessors mirroring the get_mock_* signatures
+    def markets(self):
+        return self.get('markets').df
+
+    def market_index(self):
+        return self.get('markets')
+
+    def races(self):
+        return self.get('races')
+
+    def constraint_graph(self):
+        return self.get('constraint_graph')
+
+    def tables(self):
+        return self.get('tables')
+
+    def constraints(self, ticker):
+        return self.get('constraints', ticker)
+
+    def paths(self, ticker):
+        return self.get('paths', ticker)
+
+    def events(self, ticker):
+        return self.get('events', ticker)
+
+
+def load_market_index(loader=get_mock_markets, races_loader=get_mock_race_specs, constraint_graph=None, tables=None):
+    """Load markets, derive path counts, certainty and lag_status, and index the result.
+
+    `races_loader` returns the per-race specs of every seat-control market
+    in one call, keyed by ticker.
+    """
+    df = loader()
+    apply_path_counts(df, races_loader())
+    if tables is not None:
+        apply_band_probability(df, tables)
+    if constraint_graph is not None:
+        apply_constraint_graph(df, constraint_graph)
+    df['lag_status'] = detect_lag_status(df)
+    return MarketIndex(df)
+
+
+def apply_band_probability(markets_df, tables):
+    """Fill structural_p_yes from band-weighted listed paths where the seat DP gave none"""
+    shares = pd.Series(band_yes_share(tables.path_rows), index=tables.path_rows.tickers)
+    shares = shares.reindex(markets_df['ticker']).to_numpy()
+    current = markets_df['structural_p_yes'].to_numpy(dtype=float)
+    markets_df['structural_p_yes'] = np.where(np.isnan(current), shares, current)
+    return markets_df
+
+
+def graph_from_tables(tables):
+    """Constraint graph over the markets of a CatalogTables whose listed paths link to constraints.
+
+    Only those markets get a summary from the graph (apply_constraint_graph),
+    so they are found with column scans and only their records, plus the
+    upstream constraints they name, are decoded. Constraints no linked
+    path can reach are left out of the graph.
+    """
+    paths = tables.path_rows
+    sections = paths.labels('section')
+    linked = pd.notna(paths.labels('requires')) | pd.notna(paths.labels('blocked_by'))
+    linked &= (sections == 'yes_paths') | (sections == 'no_paths')
+    tickers = paths.tickers[np.unique(paths.owners()[linked])]
+    return build_constraint_graph(tickers, tables.constraints, tables.paths, _constraint_lookup(tables.constraint_rows))
+
+
+def _constraint_lookup(rows):
+    """cid -> (ticker, record) over every row of a constraints ChildTable; indexed on first use"""
+    index = {}
+
+    def lookup(cid):
+        if not index:
+            codes = rows.owners()
+            ids = rows.labels('id')
+            scoped = rows.tickers.to_numpy(dtype=object)[codes] + ':' + rows.labels('name').astype(str)
+            cids = np.where(pd.notna(ids), ids, scoped)
+            index.update(zip(cids.tolist(), zip(codes.tolist(), rows.offsets[codes].tolist(), range(len(cids)))))
+        found = index.get(cid)
+        if found is None:
+            return None
+        code, start, row = found
+        ticker = rows.tickers[code]
+        return ticker, rows.records(ticker)[row - start]
+    return lookup
+
+
+def build_default_provider(ttls=None, source=None, **kwargs):
+    """Provider wired to the mock data, or to `source` (a KalshiClient) when given"""
+    ttls = {**DEFAULT_TTLS, **(ttls or {})}
+    if source is None:
+        markets, races = get_mock_markets, get_mock_race_specs
+        constraints, paths, events, tables = get_mock_constraints, get_mock_paths, get_mock_events, get_mock_tables
+    else:
+        markets, races = source.markets, source.race_specs
+        constraints, paths, events, tables = source.constraints, source.paths, source.events, source.tables
+    provider = DataProvider(**kwargs)
+    provider.register('constraints', constraints, *ttls['constraints'])
+    provider.register('paths', paths, *ttls['paths'])
+    provider.register('events', events, *ttls['events'])
+    # Seat-control race specs come in one bulk call, refreshed on their own TTL
+    provider.register('races', races, *ttls['races'])
+    # Catalog-wide readers (the constraint graph) go through the columnar
+    # tables rather than filling the per-ticker caches for every market
+    provider.register('tables', tables, *ttls['constraints'])
+    provider.register('constraint_graph', lambda: graph_from_tables(provider.tables()), *ttls['constraints'])
+    # Filter indexes are built once per load, not once per rerun
+    provider.register(
+        'markets',
+        lambda: load_market_index(markets, provider.races, provider.constraint_graph(), provider.tables()),
+        *ttls['markets'],
+    )
+    return provider
@@ -0,0 +1,68 @@
+"""Concurrent loading of the structural detail panel for one market.
+
+The panel needs constraints, paths, events and price history. Those fetches
+are independent, so they are issued together on a shared thread pool and the
+panel waits once for the slowest instead of the sum of all four. Each part is
+fetched exactly once per render (events feed both the timeline and the chart).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from politics_edge.http_pool import HTTPPool
+from politics_edge.mock_data import get_mock_price_history
+from politics_edge.profiling import propagate
+
+DETAIL_PARTS = ('constraints', 'paths', 'events', 'price_history')
+
+
+def local_fetchers(provider, price_history=get_mock_price_history):
+    """Fetchers backed by the in-process DataProvider"""
+    return {
+        'constraints': provider.constraints,
+        'paths': provider.paths,
+        'events': provider.events,
+        'price_history': price_history,
+    }
+
+
+class RemoteSource:
+    """Fetchers backed by the HTTP API, all sharing one pooled client"""
+
+    def __init__(self, base_url, pool_size=8):
+        self.pool = HTTPPool(base_url, maxsize=pool_size)
+
+    def constraints(self, ticker):
+        return self.pool.get_json(f"/markets/{ticker}/constraints")
+
+    def paths(self, ticker):
+        return self.pool.get_json(f"/markets/{ticker}/paths")
+
+    def events(self, ticker):
+        return self.pool.get_json(f"/markets/{ticker}/events")
+
+    def price_history(self, ticker):
+        df = pd.DataFrame(self.pool.get_json(f"/markets/{ticker}/history"), columns=['date', 'price'])
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def fetchers(self):
+        return {name: getattr(self, name) for name in DETAIL_PARTS}
+
+    def close(self):
+        self.pool.close()
+
+
+def load_market_detail(ticker, fetchers, executor=None, parts=DETAIL_PARTS):
+    """Fetch the requested detail parts for `ticker` concurrently.
+
+    Returns a dict keyed by part name. Parts not requested (e.g. paths and
+    events on the free tier) are simply absent.
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(parts) or 1) as pool:
+            return load_market_detail(ticker, fetchers, pool, parts)
+    # Fetches run on pool threads; propagate() keeps their spans in this run's profile
+    futures = {name: executor.submit(propagate(fetchers[name]), ticker) for name in parts}
+    return {name: future.result() for name, future in futures.items()}
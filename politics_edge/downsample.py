@@ -0,0 +1,80 @@
+"""Shape-preserving downsampling of long price series for charting.
+
+A chart is at most a couple of thousand pixels wide, so drawing more points
+than that only costs payload, serialization and browser time. Both methods
+return the sorted row indices to keep, always including the first and last
+point, so the caller can slice whatever columns it has.
+
+    lttb     Largest-Triangle-Three-Buckets: one point per bucket, the one
+             forming the largest triangle with the previous pick and the
+             next bucket's mean. Keeps the visual shape of a line.
+    minmax   the lowest and highest point of every bucket, in time order.
+             Fully vectorized and never hides a spike, at two points per
+             bucket.
+"""
+
+import numpy as np
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype('datetime64[ns]').astype(np.int64)
+    return values.astype(np.float64, copy=False)
+
+
+def lttb(x, y, n_out):
+    """Indices of the `n_out` points LTTB keeps from (x, y)"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # The last bucket's "next bucket" is the final point
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - mean_x[b]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y[b] - ay))
+        a = lo + int(area.argmax())
+        out[b + 1] = a
+    return out
+
+
+def minmax(y, n_out):
+    """Indices of each bucket's min and max (about `n_out` points in total)"""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = _as_float(y)
+    size = -(-n // (n_out // 2))
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(buckets, size)
+    base = np.arange(buckets) * size
+    keep = np.concatenate((
+        base + np.nanargmin(rows, axis=1),
+        base + np.nanargmax(rows, axis=1),
+        [0, n - 1],
+    ))
+    return np.unique(keep)
+
+
+def downsample(x, y, n_out, method='lttb'):
+    """Sorted indices of at most about `n_out` points of (x, y) by `method`"""
+    if method == 'lttb':
+        return lttb(x, y, n_out)
+    if method == 'minmax':
+        return minmax(y, n_out)
+    raise ValueError(f"unknown downsampling method: {method!r}")
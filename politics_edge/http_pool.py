@@ -0,0 +1,101 @@
+"""Small keep-alive HTTP connection pool for JSON endpoints (stdlib only)."""
+
+import http.client
+import json
+import queue
+from urllib.parse import urlencode, urlsplit
+
+# What a keep-alive socket the server already closed fails with; the
+# request never reached the server, so it is safe to send again
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class HTTPError(Exception):
+    """Non-2xx response from the upstream API"""
+
+    def __init__(self, status, reason, body=b'', headers=None):
+        super().__init__(f"HTTP {status} {reason}")
+        self.status = status
+        self.reason = reason
+        self.body = body
+        self.headers = headers or {}
+
+
+class HTTPPool:
+    """Thread-safe pool of persistent connections to a single host"""
+
+    def __init__(self, base_url, maxsize=8, timeout=10.0):
+        parts = urlsplit(base_url)
+        self._conn_cls = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip('/')
+        self._timeout = timeout
+        self._idle = queue.LifoQueue(maxsize)
+        self.connections_opened = 0
+
+    def _acquire(self):
+        """(connection, reused): an idle pooled connection, or a new one"""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _connect(self):
+        self.connections_opened += 1
+        return self._conn_cls(self._host, self._port, timeout=self._timeout)
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def request(self, method, path, params=None, headers=None):
+        """Issue a request and return (status, headers, body bytes)"""
+        url = self._prefix + path
+        if params:
+            url += '?' + urlencode(params)
+        conn, reused = self._acquire()
+        try:
+            resp, body = self._exchange(conn, method, url, headers)
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            # Stale keep-alive socket: retry once on a fresh connection.
+            # Anything else (a timeout after the request went out) is not retried
+            conn = self._connect()
+            try:
+                resp, body = self._exchange(conn, method, url, headers)
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        return resp.status, resp_headers, body
+
+    @staticmethod
+    def _exchange(conn, method, url, headers):
+        conn.request(method, url, headers=headers or {})
+        resp = conn.getresponse()
+        return resp, resp.read()
+
+    def get_json(self, path, params=None, headers=None):
+        status, resp_headers, body = self.request('GET', path, params, headers)
+        if not 200 <= status < 300:
+            raise HTTPError(status, http.client.responses.get(status, ''), body, resp_headers)
+        return json.loads(body)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,343 @@
+"""Kalshi REST client: pooled, rate-limited, coalescing and cached on disk.
+
+KalshiClient exposes the loader interface of the mock data (markets(),
+race_specs(), constraints(t), paths(t), events(t),
+price_history(t) and tables(), shaped like the get_mock_* results), so
+build_default_provider(source=client) swaps the mock data for the API
+without touching anything above the provider. The catalog-wide loaders
+are bulk calls: race_specs() is one request for every seat-control
+market and tables() one request for the whole catalog, so a markets
+reload never costs a request per market.
+
+Every GET goes through, in order:
+
+    cache       a fresh entry (younger than its max-age) is returned with
+                no network call; entries live on disk and survive restarts
+    coalescing  identical in-flight requests share one upstream call
+    rate limit  a token bucket shared by every thread, so every session
+                of the process draws from one budget
+    pool        keep-alive HTTPPool connections
+    revalidate  a cached entry is sent with If-None-Match /
+                If-Modified-Since; a 304 refreshes it without a body
+    throttling  a 429 pushes the whole bucket back by its Retry-After and
+                the call is retried (5xx and connection errors back off)
+    fallback    when retries run out and a cached body exists, it is
+                served stale rather than failing the render
+
+client_from_env() builds the process-wide client from KALSHI_API_URL
+(unset: None, and the app keeps using the mock data), KALSHI_RATE_LIMIT
+(requests per second, default 10) and KALSHI_CACHE_DIR.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from itertools import chain
+from urllib.parse import urlencode
+
+import pandas as pd
+
+from politics_edge.columnar import CatalogTables
+from politics_edge.http_pool import HTTPError, HTTPPool
+
+DEFAULT_RATE = 10.0
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'politics-edge', 'kalshi')
+# Seconds a response is served without revalidation when the API sends no max-age
+DEFAULT_MAX_AGE = 0.0
+RETRIES = 3
+BACKOFF = 0.25
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` banked.
+
+    Callers reserve tokens first-come first-served; the balance can go
+    negative and each caller sleeps until its own reservation is covered,
+    so a burst of threads is spread out instead of retrying in lockstep.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1.0):
+        """Take `tokens`, sleeping until they are available; returns the seconds waited"""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+            self.waited += wait
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens=1.0):
+        """Take `tokens` if available now: 0.0, else the seconds until they would be"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def pause(self, seconds):
+        """Push every caller back by `seconds` (a 429's Retry-After), dropping banked tokens"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class ResponseCache:
+    """Response entries keyed by request, one JSON file each under `path`.
+
+    A bounded in-memory LRU sits in front of the files. With `path=None`
+    the cache is memory-only. Files are replaced atomically, so a crash
+    never leaves a torn entry and several processes can share a directory.
+    """
+
+    def __init__(self, path=None, memory_entries=2048):
+        self.path = path
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.path, digest[:2], digest + '.json')
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+        if not self.path:
+            return None
+        try:
+            with open(self._file(key)) as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if entry.get('key') != key:
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        entry['key'] = key
+        self._remember(key, entry)
+        if not self.path:
+            return
+        target = self._file(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+        with os.fdopen(fd, 'w') as fh:
+            json.dump(entry, fh, separators=(',', ':'))
+        os.replace(tmp, target)
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+
+def _max_age(headers, default):
+    for directive in headers.get('cache-control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        if name.lower() == 'max-age' and value.isdigit():
+            return float(value)
+        if name.lower() in ('no-cache', 'no-store'):
+            return 0.0
+    return default
+
+
+def _retry_after(headers, default):
+    value = headers.get('retry-after')
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class KalshiClient:
+    """Market data API client with the mock loaders' interface"""
+
+    def __init__(self, base_url, rate=DEFAULT_RATE, burst=None, pool_size=8, timeout=10.0,
+                 cache_dir=None, max_age=DEFAULT_MAX_AGE, retries=RETRIES, backoff=BACKOFF):
+        self.pool = HTTPPool(base_url, maxsize=pool_size, timeout=timeout)
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = ResponseCache(cache_dir)
+        self.max_age = max_age
+        self.retries = retries
+        self.backoff = backoff
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0, 'fresh_hits': 0, 'coalesced': 0, 'requests': 0, 'not_modified': 0,
+            'throttled': 0, 'retries': 0, 'stale_served': 0,
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # ------------------------------------------------------------------ core
+
+    def get_json(self, path, params=None):
+        """Decoded JSON body of GET `path`, through cache, coalescing and the rate limit"""
+        key = path + ('?' + urlencode(sorted(params.items())) if params else '')
+        self._count('calls')
+        entry = self.cache.get(key)
+        if entry is not None and time.time() - entry['stored_at'] < entry['max_age']:
+            self._count('fresh_hits')
+            return entry['body']
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats['coalesced'] += 1
+        if owner:
+            try:
+                future.set_result(self._fetch(key, path, params, entry))
+            except Exception as exc:
+                future.set_exception(exc)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return future.result()
+
+    def _fetch(self, key, path, params, entry):
+        headers = {'Accept': 'application/json'}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count('retries')
+            # No backoff after the final attempt; nothing follows it
+            last = attempt == self.retries
+            self.bucket.acquire()
+            self._count('requests')
+            try:
+                status, resp_headers, body = self.pool.request('GET', path, params, headers)
+            except (http.client.HTTPException, OSError) as exc:
+                error = exc
+                if not last:
+                    time.sleep(self.backoff * 2 ** attempt)
+                continue
+            if status == 304 and entry is not None:
+                self._count('not_modified')
+                return self._store(key, entry['body'], resp_headers, entry)
+            if 200 <= status < 300:
+                return self._store(key, json.loads(body), resp_headers)
+            error = HTTPError(status, http.client.responses.get(status, ''), body, resp_headers)
+            if status == 429:
+                self._count('throttled')
+                # Everyone in the process waits, not just this caller
+                self.bucket.pause(_retry_after(resp_headers, self.backoff * 2 ** attempt))
+            elif status >= 500:
+                if not last:
+                    time.sleep(_retry_after(resp_headers, self.backoff * 2 ** attempt))
+            else:
+                raise error
+        if entry is not None:
+            self._count('stale_served')
+            return entry['body']
+        raise error
+
+    def _store(self, key, body, headers, previous=None):
+        previous = previous or {}
+        self.cache.put(key, {
+            'body': body,
+            'etag': headers.get('etag', previous.get('etag')),
+            'last_modified': headers.get('last-modified', previous.get('last_modified')),
+            'stored_at': time.time(),
+            'max_age': _max_age(headers, self.max_age),
+        })
+        return body
+
+    # --------------------------------------------------------------- loaders
+
+    def markets(self):
+        return pd.DataFrame(self.get_json('/markets'))
+
+    def race_specs(self):
+        """Race specs of every seat-control market, keyed by ticker, in one request"""
+        return self.get_json('/races')
+
+    def constraints(self, ticker):
+        return self.get_json(f"/markets/{ticker}/constraints")
+
+    def paths(self, ticker):
+        return self.get_json(f"/markets/{ticker}/paths")
+
+    def events(self, ticker):
+        return self.get_json(f"/markets/{ticker}/events")
+
+    def price_history(self, ticker):
+        df = pd.DataFrame(self.get_json(f"/markets/{ticker}/history"), columns=['date', 'price'])
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def tables(self):
+        """Every market's constraints, paths and events as CatalogTables, from one /catalog request"""
+        catalog = self.get_json('/catalog')
+        constraints, paths, events = (catalog.get(part, {}) for part in ('constraints', 'paths', 'events'))
+        tickers = list(dict.fromkeys(chain(constraints, paths, events)))
+        return CatalogTables.from_loaders(
+            tickers,
+            lambda t: constraints.get(t, []),
+            lambda t: paths.get(t, {}),
+            lambda t: events.get(t, []),
+        )
+
+    def close(self):
+        self.pool.close()
+
+
+@lru_cache(maxsize=1)
+def client_from_env():
+    """Process-wide KalshiClient configured from the environment, or None without KALSHI_API_URL"""
+    base_url = os.environ.get('KALSHI_API_URL')
+    if not base_url:
+        return None
+    return KalshiClient(
+        base_url,
+        rate=float(os.environ.get('KALSHI_RATE_LIMIT', DEFAULT_RATE)),
+        cache_dir=os.environ.get('KALSHI_CACHE_DIR', DEFAULT_CACHE_DIR),
+    )
+
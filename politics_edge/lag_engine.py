@@ -0,0 +1,170 @@
+"""Streaming, incremental market-lag detection.
+
+Consumes two streams per ticker: price ticks and structural-state changes
+(certainty label and remaining YES/NO path counts). Every update is O(1):
+the detector keeps a time-decayed EWMA of price, the time of the last
+constraint change and the structurally implied YES probability, and flips
+`lag_status` with hysteresis when the EWMA price diverges from what the
+structure implies. Nothing rescans history.
+
+Lag = the structure says one thing and the price has not caught up yet.
+"""
+
+import math
+
+# How far structure pushes the implied probability away from 50/50
+CERTAINTY_CONFIDENCE = {'high': 0.95, 'medium': 0.75, 'low': 0.55, 'resolved': 1.0}
+
+DETECTED = 'detected'
+NONE = 'none'
+
+
+def implied_probability(certainty, paths_yes, paths_no, p_yes=None):
+    """YES probability the structure implies.
+
+    `p_yes` is a probability-weighted estimate when one exists (the seat
+    DP's P(YES), or the band-weighted share of the listed paths) and is
+    used as is. Otherwise the path counts only say which side the structure
+    favours, not how likely it is (one live path can outweigh ten remote
+    ones), so the certainty label sets the distance from 50/50.
+    """
+    if p_yes is not None and not math.isnan(p_yes):
+        return p_yes
+    if paths_yes == paths_no:
+        return 0.5
+    confidence = CERTAINTY_CONFIDENCE.get(certainty, 0.5)
+    return confidence if paths_yes > paths_no else 1.0 - confidence
+
+
+class TickerState:
+    __slots__ = (
+        'ewma_price', 'last_price', 'last_tick', 'implied', 'certainty',
+        'last_structure_change', 'divergence', 'lag_status', 'ticks',
+    )
+
+    def __init__(self):
+        self.ewma_price = None
+        self.last_price = None
+        self.last_tick = None
+        self.implied = None
+        self.certainty = None
+        self.last_structure_change = None
+        self.divergence = 0.0
+        self.lag_status = NONE
+        self.ticks = 0
+
+    def as_dict(self, now=None):
+        since = None
+        if now is not None and self.last_structure_change is not None:
+            since = now - self.last_structure_change
+        return {
+            'ewma_price': self.ewma_price,
+            'last_price': self.last_price,
+            'implied_probability': self.implied,
+            'divergence': self.divergence,
+            'seconds_since_structure_change': since,
+            'lag_status': self.lag_status,
+            'ticks': self.ticks,
+        }
+
+
+class LagDetector:
+    """Per-ticker rolling state with O(1) price and structure updates.
+
+    `halflife` is the EWMA half-life in seconds. Lag is entered when the
+    divergence reaches `enter_threshold` and cleared once it falls below
+    `exit_threshold`, so a price hovering at the boundary does not flap.
+    `grace` seconds after a structural change are ignored, giving the
+    market a moment to react before a lag is called.
+    """
+
+    def __init__(self, halflife=300.0, enter_threshold=0.12, exit_threshold=0.08, grace=0.0, on_change=None):
+        self.decay = math.log(2) / halflife
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.grace = grace
+        self.on_change = on_change
+        self.states = {}
+
+    def _state(self, ticker):
+        state = self.states.get(ticker)
+        if state is None:
+            state = self.states[ticker] = TickerState()
+        return state
+
+    def on_price(self, ticker, ts, price):
+        """Feed a price tick; returns the new lag_status if it flipped, else None"""
+        state = self._state(ticker)
+        if state.ewma_price is None:
+            state.ewma_price = price
+        else:
+            dt = max(0.0, ts - state.last_tick)
+            alpha = 1.0 - math.exp(-self.decay * dt)
+            state.ewma_price += alpha * (price - state.ewma_price)
+        state.last_price = price
+        state.last_tick = ts
+        state.ticks += 1
+        return self._evaluate(ticker, state, ts)
+
+    def on_structure(self, ticker, ts, certainty, paths_yes, paths_no, p_yes=None):
+        """Feed a structural-state change; returns the new lag_status if it flipped"""
+        state = self._state(ticker)
+        state.certainty = certainty
+        state.implied = implied_probability(certainty, paths_yes, paths_no, p_yes)
+        state.last_structure_change = ts
+        return self._evaluate(ticker, state, ts)
+
+    def _evaluate(self, ticker, state, ts):
+        if state.implied is None or state.ewma_price is None:
+            return None
+        state.divergence = abs(state.implied - state.ewma_price)
+
+        if state.certainty == 'resolved':
+            new_status = NONE
+        elif state.lag_status == DETECTED:
+            new_status = NONE if state.divergence < self.exit_threshold else DETECTED
+        elif state.divergence >= self.enter_threshold and ts - state.last_structure_change >= self.grace:
+            new_status = DETECTED
+        else:
+            new_status = NONE
+
+        if new_status == state.lag_status:
+            return None
+        state.lag_status = new_status
+        if self.on_change is not None:
+            self.on_change(ticker, new_status, state)
+        return new_status
+
+    def status(self, ticker):
+        state = self.states.get(ticker)
+        return state.lag_status if state is not None else NONE
+
+    def snapshot(self, ticker, now=None):
+        state = self.states.get(ticker)
+        return state.as_dict(now) if state is not None else None
+
+
+def detect_lag_status(markets_df, detector=None, ts=0.0):
+    """Seed a detector from the market table and return lag_status per row.
+
+    Each market contributes its structural state (with structural_p_yes
+    where the frame has it) and its current yes_price as
+    a first tick; streaming updates (see on_price / on_structure) move it on
+    from there.
+    """
+    detector = detector or LagDetector()
+    columns = ['ticker', 'structural_certainty', 'paths_yes', 'paths_no', 'yes_price']
+    p_yes = structural_p_yes(markets_df)
+    statuses = []
+    for (ticker, certainty, paths_yes, paths_no, price), p in zip(markets_df[columns].itertuples(index=False), p_yes):
+        detector.on_structure(ticker, ts, certainty, int(paths_yes), int(paths_no), p)
+        detector.on_price(ticker, ts, float(price))
+        statuses.append(detector.status(ticker))
+    return statuses
+
+
+def structural_p_yes(markets_df):
+    """The frame's structural_p_yes values (NaN where unknown), or all-NaN without the column"""
+    if 'structural_p_yes' in markets_df:
+        return markets_df['structural_p_yes'].to_numpy(dtype=float)
+    return [math.nan] * len(markets_df)
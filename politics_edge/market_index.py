@@ -0,0 +1,182 @@
+"""Precomputed filter indexes and single-pass summary metrics for the markets table.
+
+Built once per data load (the DataProvider caches it alongside the markets
+frame). The frame is stored with the compact dtypes of
+columnar.compact_markets (the filter columns among them are categoricals)
+and, for each filter value, the sorted row positions holding that value
+are stored. Filtering a rerun is then a union of position arrays per column
+followed by an intersection across columns, instead of four fresh boolean
+masks over the whole catalog.
+"""
+
+import numpy as np
+import pandas as pd
+
+from politics_edge.columnar import compact_markets
+
+FILTER_COLUMNS = ('category', 'status', 'lag_status', 'structural_certainty')
+
+
+class MarketIndex:
+    """Markets frame plus per-value row-position indexes for the filter columns"""
+
+    def __init__(self, df):
+        self.df = df = compact_markets(df.reset_index(drop=True))
+        self.positions = {column: self._build(df[column]) for column in FILTER_COLUMNS}
+        self._tickers = None
+
+    @staticmethod
+    def _build(series):
+        codes = series.cat.codes.to_numpy()
+        order = np.argsort(codes, kind='stable').astype(np.int32)
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        # NaN rows (code -1) sort first; skip them
+        offset = int((codes < 0).sum())
+        return {
+            value: order[offset + bounds[i]:offset + bounds[i + 1]]
+            for i, value in enumerate(series.cat.categories)
+        }
+
+    def row_positions(self, tickers):
+        """Row position of each ticker, -1 for tickers not in the catalog"""
+        if self._tickers is None:
+            self._tickers = pd.Index(self.df['ticker'])
+        return self._tickers.get_indexer(list(tickers))
+
+    def patched(self, rows, values):
+        """New index with `values` (column -> one value per row) written at row positions `rows`.
+
+        The frame is a shallow copy with only the written columns replaced,
+        and a filter index changes only for the values those rows leave or
+        join; everything else is shared with this index, which is untouched.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        new = object.__new__(MarketIndex)
+        new.df = df = self.df.copy(deep=False)
+        new.positions = dict(self.positions)
+        new._tickers = self._tickers
+        for column, column_values in values.items():
+            current = df[column]
+            if isinstance(current.dtype, pd.CategoricalDtype):
+                categorical = current.array
+                added = [v for v in dict.fromkeys(column_values) if not pd.isna(v) and v not in categorical.categories]
+                if added:
+                    categorical = categorical.add_categories(added)
+                old_codes = categorical.codes
+                codes = old_codes.copy()
+                codes[rows] = categorical.categories.get_indexer(column_values)
+                df[column] = pd.Categorical.from_codes(codes, dtype=categorical.dtype)
+                if column in new.positions:
+                    new.positions[column] = self._moved(
+                        new.positions[column], categorical.categories, rows, old_codes[rows], codes[rows])
+            else:
+                array = current.to_numpy().copy()
+                array[rows] = column_values
+                df[column] = array
+        return new
+
+    @staticmethod
+    def _moved(index, categories, rows, old_codes, new_codes):
+        """Per-value positions with `rows` moved from their old codes to their new ones"""
+        index = dict(index)
+        moved = old_codes != new_codes
+        rows, old_codes, new_codes = rows[moved], old_codes[moved], new_codes[moved]
+        for code in np.unique(np.concatenate((old_codes, new_codes))):
+            if code < 0:
+                continue
+            value = categories[code]
+            positions = index.get(value, np.empty(0, dtype=np.int32))
+            leaving, joining = rows[old_codes == code], rows[new_codes == code]
+            # Position lists are sorted: delete and insert by binary search
+            if len(leaving):
+                positions = np.delete(positions, np.searchsorted(positions, np.sort(leaving)))
+            if len(joining):
+                joining = np.sort(joining)
+                positions = np.insert(positions, np.searchsorted(positions, joining), joining)
+            index[value] = positions.astype(np.int32, copy=False)
+        return index
+
+    def values(self, column):
+        """Values of `column` that occur in the catalog, in first-seen order"""
+        present = self.df[column].dropna().unique()
+        return list(present)
+
+    def _union(self, column, values):
+        index = self.positions[column]
+        parts = [index[v] for v in values if v in index]
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        # Value position lists are disjoint, so a sort is a union
+        return np.sort(np.concatenate(parts))
+
+    def select_positions(self, include=None, exclude=None):
+        """Sorted row positions matching every include and no exclude filter.
+
+        `include` / `exclude` map a filter column to an iterable of values.
+        An include column with no values selects nothing, as isin([]) would.
+        """
+        include = include or {}
+        exclude = exclude or {}
+        sets = sorted((self._union(col, vals) for col, vals in include.items()), key=len)
+        if sets:
+            result = sets[0]
+            for other in sets[1:]:
+                if not len(result):
+                    break
+                result = np.intersect1d(result, other, assume_unique=True)
+        else:
+            result = np.arange(len(self.df), dtype=np.int32)
+        for column, values in exclude.items():
+            if len(result):
+                result = np.setdiff1d(result, self._union(column, values), assume_unique=True)
+        return result
+
+    def select(self, include=None, exclude=None):
+        """Filtered view of the markets frame"""
+        return self.df.iloc[self.select_positions(include, exclude)]
+
+
+def filter_spec(categories, statuses=('active',), show_lag=True, show_high_certainty=True):
+    """(include, exclude) for select_positions from the dashboard's filter settings"""
+    include = {'category': categories, 'status': statuses}
+    exclude = {}
+    if not show_lag:
+        exclude['lag_status'] = ['detected']
+    if not show_high_certainty:
+        exclude['structural_certainty'] = ['high']
+    return include, exclude
+
+
+def summary_metrics(df):
+    """Dashboard metrics from one grouped aggregation pass over `df`.
+
+    Rows are bucketed by (status, lag_status, structural_certainty) with a
+    single bincount for counts and one for volume; every metric is read off
+    those buckets.
+    """
+    empty = {'active': 0, 'lag_detected': 0, 'high_certainty': 0, 'total_volume': 0}
+    if not len(df):
+        return empty
+
+    columns = ('status', 'lag_status', 'structural_certainty')
+    cats = [df[c].astype('category') if not isinstance(df[c].dtype, pd.CategoricalDtype) else df[c] for c in columns]
+    sizes = [len(c.cat.categories) + 1 for c in cats]  # +1 bucket for NaN
+    key = np.zeros(len(df), dtype=np.int64)
+    for cat, size in zip(cats, sizes):
+        key = key * size + (cat.cat.codes.to_numpy().astype(np.int64) + 1)
+    n_buckets = int(np.prod(sizes))
+    counts = np.bincount(key, minlength=n_buckets).reshape(sizes)
+    volume = np.bincount(key, weights=df['volume'].to_numpy(dtype=np.float64), minlength=n_buckets)
+
+    def code(cat, value):
+        categories = list(cat.cat.categories)
+        return categories.index(value) + 1 if value in categories else None
+
+    active, lag, high = code(cats[0], 'active'), code(cats[1], 'detected'), code(cats[2], 'high')
+    return {
+        'active': int(counts[active].sum()) if active else 0,
+        'lag_detected': int(counts[:, lag].sum()) if lag else 0,
+        'high_certainty': int(counts[:, :, high].sum()) if high else 0,
+        'total_volume': volume.sum(),
+    }
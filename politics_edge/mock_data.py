@@ -0,0 +1,316 @@
+"""Mock data - Replace with real API calls in v1.1
+
+Set MOCK_MARKET_COUNT (and optionally MOCK_SEED) to swap the hand-written
+catalog for a seeded SyntheticCatalog of that many markets; every loader
+below then serves the synthetic constraints, paths and events.
+"""
+
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from politics_edge.columnar import CatalogTables
+from politics_edge.path_engine import NO, YES, market_from_spec
+from politics_edge.price_history import get_price_history
+from politics_edge.profiling import timed
+from politics_edge.synthetic import SyntheticCatalog
+
+
+@lru_cache(maxsize=2)
+def _synthetic(n, seed):
+    return SyntheticCatalog(n, seed)
+
+
+def synthetic_catalog():
+    """The SyntheticCatalog selected by MOCK_MARKET_COUNT / MOCK_SEED, or None"""
+    n = os.environ.get('MOCK_MARKET_COUNT')
+    if not n:
+        return None
+    return _synthetic(int(n), int(os.environ.get('MOCK_SEED', 0)))
+
+
+
+@timed()
+def get_mock_markets():
+    """Mock political markets data - will be replaced with Kalshi API"""
+    catalog = synthetic_catalog()
+    if catalog is not None:
+        return catalog.markets()
+    markets = [
+        {
+            'ticker': 'PRES-2024-DEM',
+            'title': 'Democratic Nominee 2024',
+            'category': 'Elections',
+            'subcategory': 'Presidential',
+            'yes_price': 0.92,
+            'volume': 245000,
+            'expiration': '2024-08-22',
+            'status': 'active',
+            'lag_status': 'none',
+            'structural_certainty': 'high',
+            'paths_yes': 1,
+            'paths_no': 0,
+            'constraint_summary': 'Nomination structurally resolved'
+        },
+        {
+            'ticker': 'PRES-2024-GOP',
+            'title': 'Republican Nominee 2024',
+            'category': 'Elections',
+            'subcategory': 'Presidential',
+            'yes_price': 0.94,
+            'volume': 312000,
+            'expiration': '2024-07-18',
+            'status': 'active',
+            'lag_status': 'none',
+            'structural_certainty': 'high',
+            'paths_yes': 1,
+            'paths_no': 0,
+            'constraint_summary': 'Primary process complete'
+        },
+        {
+            'ticker': 'SENATE-2024-CONTROL',
+            'title': 'Senate Control 2024',
+            'category': 'Elections',
+            'subcategory': 'Congressional',
+            'yes_price': 0.51,
+            'volume': 189000,
+            'expiration': '2024-11-06',
+            'status': 'active',
+            'lag_status': 'detected',
+            'structural_certainty': 'low',
+            'paths_yes': 8,
+            'paths_no': 7,
+            'constraint_summary': 'Multiple paths open, thin liquidity'
+        },
+        {
+            'ticker': 'GOV-2024-NC',
+            'title': 'NC Governor 2024',
+            'category': 'Elections',
+            'subcategory': 'Gubernatorial',
+            'yes_price': 0.67,
+            'volume': 45000,
+            'expiration': '2024-11-06',
+            'status': 'active',
+            'lag_status': 'detected',
+            'structural_certainty': 'medium',
+            'paths_yes': 2,
+            'paths_no': 2,
+            'constraint_summary': 'Filing complete, legal challenge pending'
+        },
+        {
+            'ticker': 'SCOTUS-2024-TERM',
+            'title': 'SCOTUS Retirement 2024 Term',
+            'category': 'Legal',
+            'subcategory': 'Supreme Court',
+            'yes_price': 0.15,
+            'volume': 28000,
+            'expiration': '2024-10-01',
+            'status': 'active',
+            'lag_status': 'none',
+            'structural_certainty': 'medium',
+            'paths_yes': 3,
+            'paths_no': 1,
+            'constraint_summary': 'Term window closing, no signals'
+        },
+        {
+            'ticker': 'IMPEACH-2024',
+            'title': 'Impeachment Vote 2024',
+            'category': 'Congress',
+            'subcategory': 'Procedures',
+            'yes_price': 0.08,
+            'volume': 67000,
+            'expiration': '2024-12-31',
+            'status': 'active',
+            'lag_status': 'none',
+            'structural_certainty': 'high',
+            'paths_yes': 1,
+            'paths_no': 4,
+            'constraint_summary': 'Procedural path exists but blocked'
+        },
+        {
+            'ticker': 'SHUTDOWN-2024-Q1',
+            'title': 'Government Shutdown Q1 2024',
+            'category': 'Congress',
+            'subcategory': 'Fiscal',
+            'yes_price': 0.35,
+            'volume': 92000,
+            'expiration': '2024-03-31',
+            'status': 'resolved',
+            'lag_status': 'none',
+            'structural_certainty': 'resolved',
+            'paths_yes': 0,
+            'paths_no': 0,
+            'constraint_summary': 'CR passed, outcome resolved'
+        },
+        {
+            'ticker': 'TX-BORDER-2024',
+            'title': 'TX Border Federal Intervention',
+            'category': 'Legal',
+            'subcategory': 'Federal',
+            'yes_price': 0.42,
+            'volume': 156000,
+            'expiration': '2024-06-30',
+            'status': 'active',
+            'lag_status': 'detected',
+            'structural_certainty': 'low',
+            'paths_yes': 4,
+            'paths_no': 3,
+            'constraint_summary': 'SCOTUS ruling pending, multiple paths'
+        },
+    ]
+    return pd.DataFrame(markets)
+
+@timed()
+def get_mock_constraints(ticker):
+    """Mock constraint data for a specific market"""
+    catalog = synthetic_catalog()
+    if catalog is not None and ticker in catalog:
+        return catalog.constraints(ticker)
+    constraints = {
+        'PRES-2024-DEM': [
+            {'name': 'Primary Elections', 'status': 'passed', 'date': '2024-06-04', 'notes': 'All state primaries complete'},
+            {'name': 'Delegate Threshold', 'status': 'passed', 'date': '2024-03-12', 'notes': 'Majority secured'},
+            {'name': 'Convention Vote', 'status': 'passed', 'date': '2024-08-22', 'notes': 'Formal nomination complete'},
+            {'name': 'Legal Challenges', 'status': 'resolved', 'date': '2024-04-15', 'notes': 'No active challenges'},
+        ],
+        'SENATE-2024-CONTROL': [
+            {'name': 'Filing Deadlines', 'status': 'passed', 'date': '2024-06-15', 'notes': 'All states closed'},
+            {'name': 'Primary Certifications', 'status': 'open', 'date': '2024-09-15', 'notes': '42/50 complete'},
+            {'name': 'Early Voting Start', 'status': 'open', 'date': '2024-10-15', 'notes': 'Pending'},
+            {'name': 'Legal Challenges', 'status': 'open', 'date': None, 'notes': '3 active in swing states'},
+        ],
+        'GOV-2024-NC': [
+            {'id': 'NC-GOV-FILING', 'name': 'Filing Deadline', 'status': 'passed', 'date': '2024-03-01', 'notes': 'Candidates locked'},
+            {'id': 'NC-GOV-PRIMARY', 'name': 'Primary Election', 'status': 'passed', 'date': '2024-05-14', 'notes': 'Nominees selected',
+             'depends_on': ['NC-GOV-FILING']},
+            {'id': 'NC-GOV-BALLOT', 'name': 'Ballot Challenge', 'status': 'open', 'date': '2024-08-30', 'notes': 'Robinson challenge pending',
+             'depends_on': ['NC-GOV-PRIMARY']},
+            {'id': 'NC-GOV-CERT', 'name': 'Certification', 'status': 'open', 'date': '2024-11-26', 'notes': 'Post-election',
+             'depends_on': ['NC-GOV-PRIMARY']},
+        ],
+        'TX-BORDER-2024': [
+            {'name': 'SCOTUS Emergency Stay', 'status': 'passed', 'date': '2024-01-22', 'notes': 'Federal access granted'},
+            {'name': 'Full SCOTUS Review', 'status': 'open', 'date': '2024-04-15', 'notes': 'Oral arguments pending'},
+            {'name': 'Congressional Action', 'status': 'open', 'date': None, 'notes': 'Bills in committee'},
+            {'name': 'Executive Order Window', 'status': 'open', 'date': None, 'notes': 'Presidential discretion'},
+        ],
+    }
+    return constraints.get(ticker, [
+        {'name': 'Data Pending', 'status': 'open', 'date': None, 'notes': 'Structural analysis in progress'}
+    ])
+
+@timed()
+def get_mock_race_specs():
+    """Mock per-race states of every seat-control market, keyed by ticker (YES = Democratic control)"""
+    return {
+        'SENATE-2024-CONTROL': {
+            'threshold': 50,  # 50 + VP tiebreak
+            'base_yes_seats': 42,  # seats not up in 2024 or safe
+            'races': [
+                {'key': 'WV', 'incumbent': 'yes', 'p_yes': 0.10},
+                {'key': 'MT', 'incumbent': 'yes', 'p_yes': 0.45},
+                {'key': 'OH', 'incumbent': 'yes', 'p_yes': 0.50},
+                {'key': 'PA', 'incumbent': 'yes', 'p_yes': 0.60},
+                {'key': 'MI', 'incumbent': 'yes', 'p_yes': 0.60},
+                {'key': 'WI', 'incumbent': 'yes', 'p_yes': 0.62},
+                {'key': 'AZ', 'incumbent': 'yes', 'p_yes': 0.62},
+                {'key': 'NV', 'incumbent': 'yes', 'p_yes': 0.60},
+                {'key': 'TX', 'incumbent': 'no', 'p_yes': 0.25},
+                {'key': 'FL', 'incumbent': 'no', 'p_yes': 0.20},
+            ],
+        },
+    }
+
+@timed()
+def get_mock_races(ticker):
+    """Mock per-race states for one seat-control market (None for other markets)"""
+    return get_mock_race_specs().get(ticker)
+
+@timed()
+def get_mock_paths(ticker):
+    """Mock path data for a specific market"""
+    catalog = synthetic_catalog()
+    if catalog is not None and ticker in catalog:
+        return catalog.paths(ticker)
+    paths = {
+        'SENATE-2024-CONTROL': {
+            # yes_paths / no_paths are generated from get_mock_races below
+            'recently_collapsed': [
+                {'description': 'Flip TX via O\'Rourke', 'collapsed_date': '2024-02-15', 'reason': 'Candidate withdrew'},
+            ]
+        },
+        'GOV-2024-NC': {
+            'yes_paths': [
+                {'description': 'Standard election, no disqualification', 'status': 'viable', 'probability_band': 'high',
+                 'requires': ['NC-GOV-BALLOT', 'NC-GOV-CERT']},
+                {'description': 'Post-challenge reinstatement', 'status': 'viable', 'probability_band': 'low',
+                 'requires': ['NC-GOV-CERT']},
+            ],
+            'no_paths': [
+                {'description': 'Ballot disqualification upheld', 'status': 'viable', 'probability_band': 'medium',
+                 'blocked_by': ['NC-GOV-BALLOT']},
+                {'description': 'Candidate withdrawal', 'status': 'viable', 'probability_band': 'low',
+                 'blocked_by': ['NC-GOV-CERT']},
+            ],
+            'recently_collapsed': []
+        },
+    }
+    result = paths.get(ticker, {'yes_paths': [], 'no_paths': [], 'recently_collapsed': []})
+    
+    # Seat-control markets: count the full path space, list the likeliest paths
+    spec = get_mock_races(ticker)
+    if spec:
+        market = market_from_spec(spec)
+        yes_count, no_count = market.count_paths()
+        result = {
+            **result,
+            'yes_paths': market.top_paths(YES),
+            'no_paths': market.top_paths(NO),
+            'yes_count': yes_count,
+            'no_count': no_count,
+        }
+    return result
+
+@timed()
+def get_mock_events(ticker):
+    """Mock event timeline for a specific market"""
+    catalog = synthetic_catalog()
+    if catalog is not None and ticker in catalog:
+        return catalog.events(ticker)
+    events = {
+        'SENATE-2024-CONTROL': [
+            {'date': '2024-08-15', 'event': 'MT primary certification complete', 'impact': 'neutral'},
+            {'date': '2024-08-10', 'event': 'OH polling shift detected', 'impact': 'negative'},
+            {'date': '2024-08-05', 'event': 'WV incumbent retirement confirmed', 'impact': 'negative'},
+            {'date': '2024-07-28', 'event': 'TX filing deadline passed', 'impact': 'neutral'},
+            {'date': '2024-07-15', 'event': 'FL legal challenge dismissed', 'impact': 'positive'},
+        ],
+        'GOV-2024-NC': [
+            {'date': '2024-08-20', 'event': 'Ballot challenge hearing scheduled', 'impact': 'negative'},
+            {'date': '2024-08-12', 'event': 'CNN report on candidate statements', 'impact': 'negative'},
+            {'date': '2024-07-30', 'event': 'Primary runoff avoided', 'impact': 'positive'},
+            {'date': '2024-06-15', 'event': 'Major endorsement received', 'impact': 'positive'},
+        ],
+        'TX-BORDER-2024': [
+            {'date': '2024-08-18', 'event': 'DOJ brief filed', 'impact': 'positive'},
+            {'date': '2024-08-05', 'event': 'TX Governor press conference', 'impact': 'negative'},
+            {'date': '2024-07-22', 'event': 'SCOTUS grants cert', 'impact': 'neutral'},
+            {'date': '2024-07-10', 'event': '5th Circuit ruling', 'impact': 'negative'},
+        ],
+    }
+    return events.get(ticker, [])
+
+@timed()
+def get_mock_tables():
+    """Constraints, paths and events of the whole catalog as columnar CatalogTables"""
+    catalog = synthetic_catalog()
+    if catalog is not None:
+        return catalog.tables
+    return CatalogTables.from_loaders(
+        get_mock_markets()['ticker'], get_mock_constraints, get_mock_paths, get_mock_events)
+
+@timed()
+def get_mock_price_history(ticker):
+    """Generate mock price history for charts (seeded per ticker)"""
+    return get_price_history(ticker, periods=90, freq='D')
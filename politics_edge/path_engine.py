@@ -0,0 +1,316 @@
+"""Combinatorial path counting for seat-control markets.
+
+A chamber-control market resolves YES when the YES party ends up with at
+least `threshold` seats. Each race is decided for YES, decided for NO, or
+still open; every assignment of outcomes to the open races is a path. With
+N open races there are 2^N paths, so they are counted, not listed.
+
+Counting is a DP over seats: the open races form the generating polynomial
+prod(1 + x^seats_i), whose coefficient k is the number of outcome
+combinations giving the YES party k extra seats. YES paths are the
+coefficients at or above the seats still needed. When one race changes
+state, its factor is divided out (exact integer synthetic division) or
+multiplied in, so an update costs O(total seats) instead of re-enumerating
+2^N combinations.
+
+The most likely paths (top_paths) come from a best-first search over the
+open races, most decisive first, guided by an exact bound: a DP over
+(race, seats so far) gives the likeliest completion that still lands on
+the requested side. Each of the k results is reached by popping at most
+one node per race, so the search costs O(k * N log N + N * total seats)
+however many paths there are. iter_paths() lists every path and is only
+meant for small markets.
+"""
+
+import heapq
+
+import numpy as np
+
+OPEN = 'open'
+YES = 'yes'
+NO = 'no'
+
+# Path likelihood relative to a coin-flip path (0.5^open) -> display band,
+# matching the probability_band field of the path records
+PROBABILITY_BANDS = ((4.0, 'high'), (1.0, 'medium'))
+# Representative likelihood per band, for weighting listed paths by band
+BAND_WEIGHTS = {'high': 4.0, 'medium': 2.0, 'low': 0.5}
+
+
+class Race:
+    __slots__ = ('key', 'label', 'seats', 'state', 'incumbent', 'p_yes')
+
+    def __init__(self, key, label=None, seats=1, state=OPEN, incumbent=None, p_yes=0.5):
+        self.key = key
+        self.label = label or key
+        self.seats = seats
+        self.state = state
+        self.incumbent = incumbent  # party currently holding the seat: YES / NO / None
+        self.p_yes = p_yes
+
+    def verb(self, outcome):
+        """'hold' / 'flip' / 'win' / 'lose' / 'miss' from the YES party's point of view"""
+        if outcome == YES:
+            return 'hold' if self.incumbent == YES else 'flip' if self.incumbent == NO else 'win'
+        return 'lose' if self.incumbent == YES else 'miss'
+
+
+def _multiply(poly, seats):
+    """poly * (1 + x^seats)"""
+    out = poly + [0] * seats
+    for k in range(len(poly)):
+        out[k + seats] += poly[k]
+    return out
+
+
+def _divide(poly, seats):
+    """poly / (1 + x^seats), exact because the factor was multiplied in earlier"""
+    out = [0] * (len(poly) - seats)
+    for k in range(len(out)):
+        out[k] = poly[k] - (out[k - seats] if k >= seats else 0)
+    return out
+
+
+def probability_band(probability, n_open):
+    ratio = probability * 2.0 ** n_open
+    for floor, band in PROBABILITY_BANDS:
+        if ratio >= floor:
+            return band
+    return 'low'
+
+
+class SeatControlMarket:
+    """Incrementally maintained YES/NO path counts for one chamber-control market"""
+
+    def __init__(self, races, threshold, base_yes_seats=0):
+        self.threshold = threshold
+        self.base_yes_seats = base_yes_seats
+        self.races = {}
+        self.decided_yes_seats = 0
+        self.poly = [1]
+        for race in races:
+            self.races[race.key] = race
+            self._apply(race, race.state)
+
+    def _apply(self, race, state):
+        if state == OPEN:
+            self.poly = _multiply(self.poly, race.seats)
+        elif state == YES:
+            self.decided_yes_seats += race.seats
+
+    def _remove(self, race):
+        if race.state == OPEN:
+            self.poly = _divide(self.poly, race.seats)
+        elif race.state == YES:
+            self.decided_yes_seats -= race.seats
+
+    def set_state(self, key, state):
+        """Move one race to open / yes / no, updating counts in O(total seats)"""
+        race = self.races[key]
+        if state == race.state:
+            return False
+        self._remove(race)
+        race.state = state
+        self._apply(race, state)
+        return True
+
+    @property
+    def seats_needed(self):
+        """Extra seats YES still needs from the open races"""
+        return self.threshold - self.base_yes_seats - self.decided_yes_seats
+
+    def count_paths(self):
+        """(yes_paths, no_paths) over all outcome combinations of the open races"""
+        need = self.seats_needed
+        total = sum(self.poly)
+        if need <= 0:
+            return total, 0
+        yes = sum(self.poly[need:])
+        return yes, total - yes
+
+    def probability_yes(self):
+        """P(YES) with each open race decided independently at its p_yes.
+
+        The same DP over seats as the counts, with each factor weighted
+        (1 - p) + p x^seats, so a likely path counts for more than an
+        unlikely one. O(open races * total seats).
+        """
+        need = self.seats_needed
+        if need <= 0:
+            return 1.0
+        dist = [1.0]
+        for race in self.open_races():
+            out = [0.0] * (len(dist) + race.seats)
+            for k, mass in enumerate(dist):
+                out[k] += mass * (1.0 - race.p_yes)
+                out[k + race.seats] += mass * race.p_yes
+            dist = out
+        return sum(dist[need:])
+
+    def open_races(self):
+        return [r for r in self.races.values() if r.state == OPEN]
+
+    def open_races_by_seats(self):
+        return sorted(self.open_races(), key=lambda r: -r.seats)
+
+    def iter_paths(self, side=YES):
+        """Yield every path for `side` as a tuple of (race, outcome) pairs.
+
+        Depth-first over the open races with suffix bounds, which skip the
+        branches that can no longer land on `side`. Every path on that side
+        is still walked to full depth, so this is O(2^N): use top_paths()
+        for the likeliest ones.
+        """
+        races = self.open_races_by_seats()
+        need = self.seats_needed
+        suffix = [0] * (len(races) + 1)
+        for i in range(len(races) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + races[i].seats
+        chosen = []
+
+        def walk(i, seats):
+            if side == YES and seats + suffix[i] < need:
+                return
+            if side == NO and seats >= need:
+                return
+            if i == len(races):
+                yield tuple(chosen)
+                return
+            race = races[i]
+            for outcome, gained in ((YES, race.seats), (NO, 0)):
+                chosen.append((race, outcome))
+                yield from walk(i + 1, seats + gained)
+                chosen.pop()
+
+        yield from walk(0, 0)
+
+    @staticmethod
+    def path_probability(path):
+        prob = 1.0
+        for race, outcome in path:
+            prob *= race.p_yes if outcome == YES else 1.0 - race.p_yes
+        return prob
+
+    @staticmethod
+    def describe(path):
+        """e.g. 'Hold WV, MT + flip TX + lose OH'"""
+        groups = {}
+        for race, outcome in path:
+            groups.setdefault(race.verb(outcome), []).append(race.label)
+        parts = [f"{verb} {', '.join(labels)}" for verb, labels in groups.items()]
+        text = ' + '.join(parts)
+        return text[:1].upper() + text[1:] if text else 'No open races'
+
+    def _lands(self, side, seats):
+        return seats >= self.seats_needed if side == YES else seats < self.seats_needed
+
+    def best_paths(self, side=YES, k=5):
+        """The k most likely paths for `side`, most likely first, without enumerating them.
+
+        Best-first over races ordered by likelihood ratio. A node's priority
+        is its probability so far times the likeliest feasible completion
+        (bound[i][seats], computed by DP), which is exact, so every node
+        popped lies on one of the k best paths.
+        """
+        order = sorted(self.open_races(), key=lambda r: -max(r.p_yes, 1.0 - r.p_yes))
+        n, total = len(order), sum(r.seats for r in order)
+        # bound[i][s]: likeliest outcome of races i.. given s seats so far that
+        # lands on `side`; None when no outcome does
+        bound = [[None] * (total + 1) for _ in range(n + 1)]
+        bound[n] = [1.0 if self._lands(side, s) else None for s in range(total + 1)]
+        for i in range(n - 1, -1, -1):
+            race, after, row = order[i], bound[i + 1], bound[i]
+            for s in range(total + 1 - race.seats):
+                yes, no = after[s + race.seats], after[s]
+                if yes is not None or no is not None:
+                    row[s] = max(race.p_yes * (yes if yes is not None else -1.0),
+                                 (1.0 - race.p_yes) * (no if no is not None else -1.0), 0.0)
+
+        rank = {race.key: i for i, race in enumerate(self.open_races_by_seats())}
+        heap = [(-bound[0][0], 0, 0, 0, 1.0, None)] if bound[0][0] is not None else []
+        counter = 1
+        found = []
+        while heap and len(found) < k:
+            _, _, i, seats, prob, chosen = heapq.heappop(heap)
+            if i == n:
+                path = []
+                while chosen is not None:
+                    chosen, step = chosen
+                    path.append(step)
+                found.append(tuple(sorted(path, key=lambda step: rank[step[0].key])))
+                continue
+            race = order[i]
+            for outcome, gained, p in ((YES, race.seats, race.p_yes), (NO, 0, 1.0 - race.p_yes)):
+                best = bound[i + 1][seats + gained]
+                if best is not None:
+                    heapq.heappush(heap, (-prob * p * best, counter, i + 1, seats + gained, prob * p,
+                                          (chosen, (race, outcome))))
+                    counter += 1
+        return found
+
+    def top_paths(self, side=YES, k=5):
+        """The k most likely paths for `side`, in the get_mock_paths record format"""
+        n_open = len(self.open_races())
+        return [
+            {
+                'description': self.describe(path),
+                'status': 'viable',
+                'probability_band': probability_band(self.path_probability(path), n_open),
+            }
+            for path in self.best_paths(side, k)
+        ]
+
+
+def apply_path_counts(markets_df, race_specs):
+    """Overwrite paths_yes / paths_no and set structural_p_yes for markets with per-race states.
+
+    `race_specs` maps ticker to spec for the seat-control markets only
+    (see mock_data.get_mock_race_specs); other markets are not visited.
+    """
+    if 'structural_p_yes' not in markets_df:
+        markets_df['structural_p_yes'] = np.nan
+    columns = [markets_df.columns.get_loc(c) for c in ('paths_yes', 'paths_no', 'structural_p_yes')]
+    positions = {ticker: i for i, ticker in enumerate(markets_df['ticker'])} if race_specs else {}
+    for ticker, spec in race_specs.items():
+        i = positions.get(ticker)
+        if i is not None and spec:
+            market = market_from_spec(spec)
+            for col, value in zip(columns, (*market.count_paths(), market.probability_yes())):
+                markets_df.iloc[i, col] = value
+    return markets_df
+
+
+def band_yes_share(path_rows):
+    """Band-weighted YES share of each market's listed paths (NaN when none are listed).
+
+    `path_rows` is the catalog's paths ChildTable; returns an array aligned
+    with its tickers. Each YES / NO path counts with the BAND_WEIGHTS of its
+    probability_band, so one likely path outweighs several unlikely ones.
+    """
+    n = len(path_rows.tickers)
+    columns = path_rows.columns
+    if not len(path_rows) or 'probability_band' not in columns:
+        return np.full(n, np.nan)
+    owner = np.repeat(np.arange(n), np.diff(path_rows.offsets))
+    bands = _labels(columns['probability_band'])
+    weights = np.array([BAND_WEIGHTS.get(b, 1.0) for b in bands])
+    sections = _labels(columns['section'])
+    yes = np.bincount(owner, weights * (sections == 'yes_paths'), minlength=n)
+    no = np.bincount(owner, weights * (sections == 'no_paths'), minlength=n)
+    total = yes + no
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, yes / total, np.nan)
+
+
+def _labels(column):
+    """Per-row labels of a ChildTable column (Categorical or ndarray) as an object array"""
+    if hasattr(column, 'codes'):
+        labels = np.append(column.categories.to_numpy(dtype=object), None)
+        return labels[column.codes]
+    return np.asarray(column, dtype=object)
+
+
+def market_from_spec(spec):
+    """Build a SeatControlMarket from a plain dict spec (see mock_data.get_mock_races)"""
+    races = [Race(**race) for race in spec['races']]
+    return SeatControlMarket(races, spec['threshold'], spec.get('base_yes_seats', 0))
@@ -0,0 +1,92 @@
+"""Vectorized, seeded random-walk price history generator.
+
+Each ticker gets its own NumPy Generator seeded from a stable hash of the
+ticker, so a market's chart is identical across reruns, processes and batch
+compositions. A walk is the cumulative sum of normal draws, clipped to the
+[0.01, 0.99] contract price range in one vectorized pass.
+
+Used for the demo chart and for load testing: `price_matrix` produces
+thousands of tickers at once and `iter_price_matrix` streams arbitrarily long
+histories (e.g. minute bars over several years) in blocks of at most
+`chunk_size` tickers by `time_chunk` periods. Each walk's generator and
+unclipped level carry over from block to block, so the streamed values are
+the ones price_matrix would produce.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+PRICE_MIN = 0.01
+PRICE_MAX = 0.99
+
+
+def ticker_seed(ticker, salt=''):
+    """Stable 64-bit seed for a ticker (unlike hash(), not randomized per process)"""
+    digest = hashlib.blake2b(f"{salt}{ticker}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _step(rng, periods, vol, level, dtype):
+    """Next `periods` prices of a walk at unclipped `level`: (clipped path, new level)"""
+    steps = rng.standard_normal(periods, dtype=dtype)
+    steps *= vol
+    steps[0] += level
+    path = np.cumsum(steps, dtype=dtype)
+    level = path[-1]
+    np.clip(path, PRICE_MIN, PRICE_MAX, out=path)
+    return path, level
+
+
+def _walk(rng, periods, vol, base_range, dtype):
+    return _step(rng, periods, vol, rng.uniform(*base_range), dtype)[0]
+
+
+def price_dates(periods, freq='D', end=None):
+    """Timestamp index ending at `end` (defaults to now, floored to `freq`)"""
+    if end is None:
+        end = pd.Timestamp.now().floor(freq)
+    return pd.date_range(end=end, periods=periods, freq=freq)
+
+
+def price_matrix(tickers, periods=90, vol=0.02, base_range=(0.3, 0.7), dtype=np.float64, salt=''):
+    """Prices for many tickers as a (len(tickers), periods) array"""
+    out = np.empty((len(tickers), periods), dtype=dtype)
+    for i, ticker in enumerate(tickers):
+        rng = np.random.default_rng(ticker_seed(ticker, salt))
+        out[i] = _walk(rng, periods, vol, base_range, dtype)
+    return out
+
+
+def iter_price_matrix(tickers, periods, chunk_size=256, time_chunk=16_384, vol=0.02, base_range=(0.3, 0.7),
+                      dtype=np.float64, salt=''):
+    """Yield (ticker_chunk, first_period, block) blocks of at most chunk_size x time_chunk prices"""
+    tickers = list(tickers)
+    for start in range(0, len(tickers), chunk_size):
+        chunk = tickers[start:start + chunk_size]
+        rngs = [np.random.default_rng(ticker_seed(ticker, salt)) for ticker in chunk]
+        levels = [rng.uniform(*base_range) for rng in rngs]
+        for first in range(0, periods, time_chunk):
+            block = np.empty((len(chunk), min(time_chunk, periods - first)), dtype=dtype)
+            for i, rng in enumerate(rngs):
+                block[i], levels[i] = _step(rng, block.shape[1], vol, levels[i], dtype)
+            yield chunk, first, block
+
+
+def get_price_history(ticker, periods=90, freq='D', end=None, **kwargs):
+    """Single-ticker history as a DataFrame with `date` and `price` columns"""
+    prices = price_matrix([ticker], periods, **kwargs)[0]
+    return pd.DataFrame({'date': price_dates(periods, freq, end), 'price': prices})
+
+
+def get_price_history_batch(tickers, periods=90, freq='D', end=None, **kwargs):
+    """Long-format history for many tickers: `ticker`, `date`, `price` columns"""
+    tickers = list(tickers)
+    prices = price_matrix(tickers, periods, **kwargs)
+    dates = price_dates(periods, freq, end)
+    return pd.DataFrame({
+        'ticker': pd.Categorical.from_codes(np.repeat(np.arange(len(tickers)), periods), categories=tickers),
+        'date': np.tile(dates.values, len(tickers)),
+        'price': prices.ravel(),
+    })
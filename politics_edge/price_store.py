@@ -0,0 +1,214 @@
+"""Append-only, memory-mapped columnar price-history store.
+
+Layout on disk, one directory per ticker and one segment per calendar year:
+
+    <root>/<ticker>/<year>/ts.i8       int64 nanoseconds since epoch (UTC)
+    <root>/<ticker>/<year>/price.f4    float32 YES price
+    <root>/<ticker>/<year>/volume.i4   int32 volume
+
+Columns are raw little-endian arrays, so appends are plain writes to the
+end of the current segment and reads are np.memmap views: a time-range
+query binary-searches the memory-mapped timestamps and slices the other
+columns without reading the rest of the file. Only pages that are actually
+touched get faulted in, so opening years of minute bars costs a handful of
+mmaps, not the file size in RAM.
+
+Timestamps must be non-decreasing per ticker; append() rejects anything
+older than what is already stored.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = {'ts': np.dtype('<i8'), 'price': np.dtype('<f4'), 'volume': np.dtype('<i4')}
+EXTENSIONS = {'ts': 'i8', 'price': 'f4', 'volume': 'i4'}
+
+DEFAULT_ROOT = os.environ.get('PRICE_STORE_DIR', '.price_store')
+
+
+def _to_ns(value):
+    return pd.Timestamp(value).value if value is not None else None
+
+
+def _year_bounds_ns(year):
+    return pd.Timestamp(year=year, month=1, day=1).value, pd.Timestamp(year=year + 1, month=1, day=1).value
+
+
+class PriceSlice:
+    """Result of a range query: column arrays (memmap views when zero-copy)"""
+
+    __slots__ = ('ts', 'price', 'volume')
+
+    def __init__(self, ts, price, volume):
+        self.ts = ts
+        self.price = price
+        self.volume = volume
+
+    def __len__(self):
+        return len(self.ts)
+
+    def to_frame(self):
+        """DataFrame in the get_mock_price_history shape (date, price, volume)"""
+        return pd.DataFrame({
+            'date': pd.to_datetime(np.asarray(self.ts), unit='ns'),
+            'price': np.asarray(self.price),
+            'volume': np.asarray(self.volume),
+        })
+
+
+class PriceStore:
+    """Per-ticker, per-year segmented column files with mmap range reads"""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self._lock = threading.Lock()
+        self._last_ts = {}
+
+    # ----------------------------------------------------------------- paths
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.root, ticker)
+
+    def _segment_dir(self, ticker, year):
+        return os.path.join(self.root, ticker, str(year))
+
+    def _column_path(self, ticker, year, column):
+        return os.path.join(self._segment_dir(ticker, year), f"{column}.{EXTENSIONS[column]}")
+
+    def tickers(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def years(self, ticker):
+        path = self._ticker_dir(ticker)
+        if not os.path.isdir(path):
+            return []
+        return sorted(int(d) for d in os.listdir(path) if d.isdigit())
+
+    def __contains__(self, ticker):
+        return bool(self.years(ticker))
+
+    # ----------------------------------------------------------------- write
+
+    def _segment_last_ts(self, ticker):
+        last = self._edge_ts(ticker, reverse=True)
+        return int(last[-1]) if last is not None else None
+
+    def _edge_ts(self, ticker, reverse=False):
+        """Timestamps of the first (last with `reverse`) segment holding rows, or None.
+
+        A segment directory can exist without rows (an append interrupted
+        after creating it), so empty ones are skipped.
+        """
+        years = self.years(ticker)
+        for year in reversed(years) if reverse else years:
+            ts = self._open_column(ticker, year, 'ts')
+            if len(ts):
+                return ts
+        return None
+
+    def append(self, ticker, ts, price, volume=None):
+        """Append rows for one ticker; `ts` is anything pd.to_datetime accepts"""
+        ts = np.asarray(ts)
+        if not np.issubdtype(ts.dtype, np.integer):
+            ts = pd.DatetimeIndex(pd.to_datetime(ts)).as_unit('ns').asi8
+        ts = ts.astype(COLUMNS['ts'], copy=False)
+        price = np.asarray(price, dtype=COLUMNS['price'])
+        volume = np.zeros(len(ts), dtype=COLUMNS['volume']) if volume is None else np.asarray(volume, dtype=COLUMNS['volume'])
+        if not (len(ts) == len(price) == len(volume)):
+            raise ValueError("ts, price and volume must have the same length")
+        if not len(ts):
+            return 0
+        if np.any(np.diff(ts) < 0):
+            raise ValueError("timestamps must be non-decreasing")
+
+        with self._lock:
+            last = self._last_ts.get(ticker)
+            if last is None:
+                last = self._segment_last_ts(ticker)
+            if last is not None and ts[0] < last:
+                raise ValueError(f"{ticker}: append at {pd.Timestamp(ts[0])} is older than stored data")
+
+            years = pd.DatetimeIndex(ts).year.to_numpy()
+            cuts = np.flatnonzero(np.diff(years)) + 1
+            for lo, hi in zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [len(ts)]))):
+                year = int(years[lo])
+                os.makedirs(self._segment_dir(ticker, year), exist_ok=True)
+                for column, values in (('ts', ts), ('price', price), ('volume', volume)):
+                    with open(self._column_path(ticker, year, column), 'ab') as fh:
+                        fh.write(values[lo:hi].tobytes())
+            self._last_ts[ticker] = int(ts[-1])
+        return len(ts)
+
+    # ------------------------------------------------------------------ read
+
+    def _open_column(self, ticker, year, column):
+        path = self._column_path(ticker, year, column)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size == 0:
+            return np.empty(0, dtype=COLUMNS[column])
+        # Only whole rows; a concurrent append may have a partial tail
+        n = size // COLUMNS[column].itemsize
+        return np.memmap(path, dtype=COLUMNS[column], mode='r', shape=(n,))
+
+    def iter_query(self, ticker, start=None, end=None):
+        """Yield one zero-copy PriceSlice of memmap views per yearly segment in range"""
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        for year in self.years(ticker):
+            lo_year, hi_year = _year_bounds_ns(year)
+            if (end_ns is not None and lo_year >= end_ns) or (start_ns is not None and hi_year <= start_ns):
+                continue
+            columns = {column: self._open_column(ticker, year, column) for column in COLUMNS}
+            n = min(len(values) for values in columns.values())
+            ts = columns['ts'][:n]
+            lo = int(np.searchsorted(ts, start_ns, 'left')) if start_ns is not None else 0
+            hi = int(np.searchsorted(ts, end_ns, 'left')) if end_ns is not None else n
+            if hi > lo:
+                yield PriceSlice(columns['ts'][lo:hi], columns['price'][lo:hi], columns['volume'][lo:hi])
+
+    def query(self, ticker, start=None, end=None):
+        """Rows with start <= ts < end (either bound optional) as a PriceSlice.
+
+        A range inside one yearly segment comes back as memmap views
+        (zero-copy); a range spanning segments concatenates just the
+        selected rows. Use iter_query to walk long ranges without copying.
+        """
+        parts = list(self.iter_query(ticker, start, end))
+        if not parts:
+            return PriceSlice(*(np.empty(0, dtype=dtype) for dtype in COLUMNS.values()))
+        if len(parts) == 1:
+            return parts[0]
+        return PriceSlice(*(np.concatenate([getattr(p, column) for p in parts]) for column in COLUMNS))
+
+    def span(self, ticker):
+        """(first, last) timestamp stored for a ticker, or None when it has no rows"""
+        first = self._edge_ts(ticker)
+        if first is None:
+            return None
+        last = self._edge_ts(ticker, reverse=True)
+        return pd.Timestamp(int(first[0])), pd.Timestamp(int(last[-1]))
+
+
+def store_history_loader(store, fallback, window=pd.Timedelta(days=90)):
+    """price_history fetcher: the stored window for tickers in `store`, else `fallback`"""
+    def load(ticker):
+        span = store.span(ticker) if ticker in store else None
+        if span is None:
+            return fallback(ticker)
+        rows = store.query(ticker, span[1] - window, span[1] + pd.Timedelta(1, 'ns'))
+        return rows.to_frame() if len(rows) else fallback(ticker)
+    return load
+
+
+def store_window_loader(store, fallback):
+    """(ticker, start, end) fetcher for a zoomed chart: stored rows in range, else `fallback` sliced"""
+    def load(ticker, start, end):
+        if ticker in store:
+            return store.query(ticker, start, end).to_frame()
+        df = fallback(ticker)
+        return df[(df['date'] >= start) & (df['date'] < end)]
+    return load
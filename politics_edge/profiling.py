@@ -0,0 +1,265 @@
+"""Rerun profiling: named timing spans, element counts and a JSON-lines log.
+
+A rerun (full script run or fragment-only run) is one RunProfile. Code
+marks sections with `span(name)`; spans nest, and repeated spans with the
+same name under the same parent (a data function called per ticker) are
+merged into one entry with a call count. Inside a Streamlit script run
+each span also counts the elements it emitted, by counting delta messages
+the run context enqueues. That hooks the context's private `_enqueue`; on
+a Streamlit without it, element counts are reported as None.
+
+Profiles are per thread. Work handed to a thread pool joins the
+submitting run's profile when the callable is wrapped with propagate():
+its spans land under the span that was open at submit time, and time
+spent on several threads at once adds up.
+
+`span()` is a no-op outside an active profile, so instrumented library code
+(the get_mock_* loaders, background refreshes) costs one thread-local read
+when nobody is profiling.
+
+Finished profiles go to the process-wide RERUN_LOG: a bounded in-memory
+ring (for the debug panel and percentiles) and, when PROFILE_LOG_PATH is
+set, one JSON object per line appended to that file.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+PROFILE_LOG_PATH = os.environ.get('PROFILE_LOG_PATH')
+
+_local = threading.local()
+
+
+def _script_ctx():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
+
+
+def _element_counter(ctx):
+    """Per-context delta counter, installed once by wrapping the context's enqueue"""
+    if ctx is None or not hasattr(ctx, '_enqueue'):
+        return None
+    counter = getattr(ctx, '_profile_counter', None)
+    if counter is None:
+        counter = [0]
+        enqueue = ctx._enqueue
+
+        def counting_enqueue(msg):
+            if msg.HasField('delta'):
+                counter[0] += 1
+            enqueue(msg)
+        ctx._enqueue = counting_enqueue
+        ctx._profile_counter = counter
+    return counter
+
+
+class RunProfile:
+    """Spans for one rerun"""
+
+    def __init__(self, kind, root=None):
+        ctx = _script_ctx()
+        self.kind = kind
+        self.session = ctx.session_id if ctx is not None else None
+        self.root = root
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._counter = _element_counter(ctx)
+        self._elements0 = self._counter[0] if self._counter else 0
+        self._stack = []
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def branch(self, stack=None):
+        """View for another thread: same spans, its own stack (default: a copy of this one), no element counts"""
+        view = copy.copy(self)
+        view._stack = list(self._stack if stack is None else stack)
+        view._counter = None
+        return view
+
+    def elements(self):
+        return self._counter[0] - self._elements0 if self._counter else None
+
+    @contextmanager
+    def span(self, name):
+        parent = self._stack[-1] if self._stack else None
+        with self._lock:
+            entry = self._spans.get((parent, name))
+            if entry is None:
+                # Registered on entry so spans list in start order, parents first
+                entry = self._spans[(parent, name)] = {
+                    'name': name, 'parent': parent, 'depth': len(self._stack),
+                    'ms': 0.0, 'calls': 0, 'elements': 0 if self._counter else None,
+                }
+        self._stack.append(name)
+        before = self._counter[0] if self._counter else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            self._stack.pop()
+            with self._lock:
+                entry['ms'] += ms
+                entry['calls'] += 1
+                if self._counter:
+                    entry['elements'] += self._counter[0] - before
+
+    def record(self, status='ok'):
+        with self._lock:
+            spans = [{**s, 'ms': round(s['ms'], 3)} for s in self._spans.values()]
+        return {
+            'ts': self.started,
+            'session': self.session,
+            'kind': self.kind,
+            'root': self.root,
+            'status': status,
+            'total_ms': round((time.perf_counter() - self._t0) * 1000, 3),
+            'elements': self.elements(),
+            'spans': spans,
+        }
+
+
+class RerunLog:
+    """Bounded ring of finished profiles, optionally mirrored to a JSON-lines file"""
+
+    def __init__(self, maxlen=1000, path=PROFILE_LOG_PATH):
+        self.path = path
+        self._records = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        with self._lock:
+            self._records.append(record)
+            if self.path:
+                with open(self.path, 'a') as fh:
+                    fh.write(json.dumps(record, default=str) + '\n')
+
+    def records(self, session=None):
+        with self._lock:
+            records = list(self._records)
+        return [r for r in records if session is None or r['session'] == session]
+
+    def percentiles(self, session=None, q=(50, 95)):
+        """{section: {'runs', 'p50', 'p95', ...}} over span times, plus '(total)' per run kind"""
+        samples = {}
+        for record in self.records(session):
+            samples.setdefault(f"(total {record['kind']})", []).append(record['total_ms'])
+            for s in record['spans']:
+                samples.setdefault(s['name'], []).append(s['ms'])
+        return {
+            name: {'runs': len(values), **{f"p{p}": float(np.percentile(values, p)) for p in q}}
+            for name, values in samples.items()
+        }
+
+
+RERUN_LOG = RerunLog()
+
+
+def current():
+    return getattr(_local, 'profile', None)
+
+
+def begin_run(kind='full', log=RERUN_LOG):
+    """Start profiling a rerun on this thread; flushes a run left open by st.rerun/st.stop"""
+    leftover = current()
+    if leftover is not None:
+        log.append(leftover.record(status='interrupted'))
+    _local.profile = RunProfile(kind)
+    return _local.profile
+
+
+def end_run(log=RERUN_LOG):
+    """Finish the thread's active profile and log it; returns the record"""
+    profile = current()
+    if profile is None:
+        return None
+    _local.profile = None
+    record = profile.record()
+    log.append(record)
+    return record
+
+
+@contextmanager
+def span(name):
+    """Time a section of the active profile (no-op when none is active)"""
+    profile = current()
+    if profile is None:
+        yield
+        return
+    with profile.span(name):
+        yield
+
+
+@contextmanager
+def section(name, log=RERUN_LOG):
+    """Span inside a full run, or a profile of its own for a fragment-only rerun"""
+    if current() is not None:
+        with span(name):
+            yield
+        return
+    profile = _local.profile = RunProfile('fragment', root=name)
+    try:
+        with profile.span(name):
+            yield
+    finally:
+        _local.profile = None
+        log.append(profile.record())
+
+
+def propagate(fn):
+    """Wrap `fn` to run inside the calling thread's active profile wherever it is called.
+
+    For callables submitted to a thread pool; returns `fn` unchanged when
+    nothing is being profiled.
+    """
+    profile = current()
+    if profile is None:
+        return fn
+    stack = list(profile._stack)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        previous = current()
+        _local.profile = profile.branch(stack)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.profile = previous
+    return wrapper
+
+
+def timed(name=None):
+    """Decorator: run the function inside span(name or function name)"""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current() is None:
+                return fn(*args, **kwargs)
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def profiled(name):
+    """Decorator for fragment bodies: run the function inside section(name)"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with section(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
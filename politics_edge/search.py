@@ -0,0 +1,516 @@
+"""In-memory inverted index for full-text market search.
+
+Indexes the text a user searches by: the market `ticker`, `title` and
+`constraint_summary`, constraint `name` / `notes`, path `description` and
+collapse `reason` (every section) and event text. Text is lowercased and
+split on non-alphanumerics, so "NC" finds GOV-2024-NC and "SCOTUS ruling"
+finds the markets whose title, constraints, paths or events mention both.
+
+The index is log-structured:
+
+    base     term -> (market codes, weights) as CSR arrays, built in one
+             vectorized pass over the columnar tables; every distinct
+             Categorical label is tokenized once, not once per row
+    delta    markets re-indexed since the base was built, as plain dicts;
+             their base postings are hidden by a per-code `stale` flag
+    compact  folds the delta back into the base once it grows past a
+             fraction of the catalog
+
+Queries AND their terms, the last one also matching as a prefix (for
+type-ahead), and rank by a BM25-style score without length
+normalization: idf(term) times a saturated sum of the field weights the
+term occurs in for that market.
+
+CatalogSearch keeps a SearchIndex in step with a DataProvider. A markets
+or tables reload re-indexes only the markets whose text fingerprint
+changed. Per-ticker constraints / paths / events reloads are fingerprinted
+the same way, and only the markets whose text actually moved are
+re-indexed. Either kind of sync falls back to a full build when more than
+REBUILD_FRACTION of the catalog changed. Syncs run on a background thread,
+and queries answer from the current index meanwhile.
+"""
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from politics_edge.columnar import PATH_SECTIONS, CatalogTables
+
+TOKEN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(['a', 'an', 'and', 'at', 'by', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'via'])
+
+# Field weights: a term in the title or ticker says more than one in an event
+MARKET_FIELDS = {'ticker': 3.0, 'title': 3.0, 'constraint_summary': 1.0}
+# Loader name -> (CatalogTables attribute, {record field: weight})
+CHILD_FIELDS = {
+    'constraints': ('constraint_rows', {'name': 2.0, 'notes': 1.0}),
+    'paths': ('path_rows', {'description': 1.5, 'reason': 1.0}),
+    'events': ('event_rows', {'event': 1.5}),
+}
+
+K1 = 1.2
+# Prefix expansions of the last query term
+MAX_EXPANSIONS = 32
+# Compact once the delta holds this many markets or this share of the catalog
+COMPACT_MIN = 1000
+COMPACT_FRACTION = 0.05
+# A reload changing more than this share of markets is rebuilt, not patched
+REBUILD_FRACTION = 0.1
+
+_FIELD_SALT = np.uint64(0x9E3779B97F4A7C15)
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens of `text`, stopwords dropped"""
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def market_document(market, constraints=(), paths=None, events=()):
+    """(text, weight) pairs for one market from loader-shaped records.
+
+    `market` is a markets row (dict or Series); the rest are what
+    get_mock_constraints / get_mock_paths / get_mock_events return.
+    """
+    doc = [(market.get(field), weight) for field, weight in MARKET_FIELDS.items()]
+    paths = paths or {}
+    records = {
+        'constraints': constraints or (),
+        'paths': [p for section in PATH_SECTIONS for p in paths.get(section, [])],
+        'events': events or (),
+    }
+    for name, (_, fields) in CHILD_FIELDS.items():
+        doc.extend((record.get(field), weight) for record in records[name] for field, weight in fields.items())
+    return [(text, weight) for text, weight in doc if isinstance(text, str)]
+
+
+class SearchIndex:
+    """Inverted index from terms to market codes, with incremental updates.
+
+    Not thread-safe: CatalogSearch serialises access.
+    """
+
+    def __init__(self):
+        self.terms = {}
+        self._new_terms = []
+        self.tickers = []
+        self.codes = {}
+        self._removed = set()
+        self._install(np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32))
+
+    # ----------------------------------------------------------------- build
+
+    @classmethod
+    def build(cls, markets, tables=None):
+        """Index every market of a markets frame and, optionally, its CatalogTables"""
+        index = cls()
+        index.tickers = markets['ticker'].tolist()
+        index.codes = {t: i for i, t in enumerate(index.tickers)}
+        codes = np.arange(len(index.tickers))
+        parts = [
+            index._column_postings(markets[field], codes, weight)
+            for field, weight in MARKET_FIELDS.items() if field in markets
+        ]
+        if tables is not None:
+            for attr, fields in CHILD_FIELDS.values():
+                table = getattr(tables, attr)
+                owner = np.repeat(pd.Index(index.tickers).get_indexer(table.tickers), np.diff(table.offsets))
+                parts.extend(
+                    index._column_postings(table.columns[field], owner, weight)
+                    for field, weight in fields.items() if field in table.columns
+                )
+        index._install(*(np.concatenate(arrays) for arrays in zip(*parts)))
+        return index
+
+    def _column_postings(self, values, owner, weight):
+        """(term ids, codes, weights) for one text column whose row i belongs to code owner[i]"""
+        if isinstance(values, pd.Categorical):
+            labels, label_codes = values.categories, values.codes
+        else:
+            label_codes, labels = pd.factorize(pd.Series(values, dtype=object))
+        label_terms = [[self._term_id(t) for t in tokenize(str(label))] for label in labels]
+        # Code -1 (missing label) indexes the trailing empty entry
+        lengths = np.array([len(terms) for terms in label_terms] + [0], dtype=np.int64)
+        starts = np.concatenate(([0], np.cumsum(lengths)))
+        flat = np.fromiter(chain.from_iterable(label_terms), np.int64, count=int(lengths.sum()))
+
+        keep = owner >= 0
+        label_codes, owner = label_codes[keep], owner[keep]
+        n_tokens = lengths[label_codes]
+        total = int(n_tokens.sum())
+        # Position of every token of every row inside `flat`
+        first = np.cumsum(n_tokens) - n_tokens
+        gather = np.arange(total) - np.repeat(first - starts[label_codes], n_tokens)
+        return flat[gather], np.repeat(owner, n_tokens), np.full(total, weight, np.float32)
+
+    def _install(self, terms, codes, weights):
+        """Replace the base with the aggregated (term, code, weight) triples"""
+        n_codes = max(len(self.tickers), 1)
+        key = terms.astype(np.int64) * n_codes + codes
+        key, inverse = np.unique(key, return_inverse=True)
+        self._weights = np.bincount(inverse, weights=weights).astype(np.float32)
+        self._post_codes = (key % n_codes).astype(np.int32)
+        per_term = np.bincount(key // n_codes, minlength=len(self.terms))
+        self._offsets = np.concatenate(([0], np.cumsum(per_term)))
+        self._stale = np.zeros(len(self.tickers), dtype=bool)
+        self._delta = {}
+        self._delta_postings = {}
+        self._sorted_terms = sorted(self.terms)
+        self._new_terms = []
+
+    def _term_id(self, term):
+        term_id = self.terms.get(term)
+        if term_id is None:
+            term_id = self.terms[term] = len(self.terms)
+            self._new_terms.append(term)
+        return term_id
+
+    # ---------------------------------------------------------------- update
+
+    def __len__(self):
+        return len(self.tickers) - len(self._removed)
+
+    def __contains__(self, ticker):
+        code = self.codes.get(ticker)
+        return code is not None and code not in self._removed
+
+    def update(self, ticker, document):
+        """(Re-)index one market from market_document() pairs"""
+        counts = Counter()
+        for text, weight in document:
+            for term in tokenize(text):
+                counts[self._term_id(term)] += weight
+        code = self.codes.get(ticker)
+        if code is None:
+            code = self.codes[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        self._hide(code)
+        self._removed.discard(code)
+        self._delta[code] = counts
+        for term_id, weight in counts.items():
+            self._delta_postings.setdefault(term_id, {})[code] = weight
+        if len(self._delta) > max(COMPACT_MIN, COMPACT_FRACTION * len(self)):
+            self.compact()
+
+    def remove(self, ticker):
+        code = self.codes.get(ticker)
+        if code is not None and code not in self._removed:
+            self._hide(code)
+            self._removed.add(code)
+
+    def _hide(self, code):
+        old = self._delta.pop(code, None)
+        if old is not None:
+            for term_id in old:
+                postings = self._delta_postings[term_id]
+                del postings[code]
+                if not postings:
+                    del self._delta_postings[term_id]
+        if code < len(self._stale):
+            self._stale[code] = True
+
+    def compact(self):
+        """Fold the delta into the base arrays"""
+        live = ~self._stale[self._post_codes]
+        base_terms = np.repeat(np.arange(len(self._offsets) - 1), np.diff(self._offsets))
+        delta = [(t, c, w) for c, counts in self._delta.items() for t, w in counts.items()]
+        d_terms, d_codes, d_weights = (np.array(col) for col in zip(*delta)) if delta else ([], [], [])
+        self._install(
+            np.concatenate([base_terms[live], np.asarray(d_terms, np.int64)]),
+            np.concatenate([self._post_codes[live].astype(np.int64), np.asarray(d_codes, np.int64)]),
+            np.concatenate([self._weights[live], np.asarray(d_weights, np.float32)]),
+        )
+
+    # ----------------------------------------------------------------- query
+
+    def _expand(self, token, prefix):
+        """Term ids for one query token: the exact term, plus prefix matches"""
+        ids = [self.terms[token]] if token in self.terms else []
+        if prefix:
+            i = bisect_left(self._sorted_terms, token)
+            candidates = chain(self._sorted_terms[i:i + MAX_EXPANSIONS + 1], sorted(self._new_terms))
+            for term in candidates:
+                if len(ids) >= MAX_EXPANSIONS:
+                    break
+                if term != token and term.startswith(token):
+                    ids.append(self.terms[term])
+        return ids
+
+    def _postings(self, term_id):
+        """Live (codes, weights) of one term across base and delta"""
+        if term_id < len(self._offsets) - 1:
+            lo, hi = self._offsets[term_id], self._offsets[term_id + 1]
+            codes, weights = self._post_codes[lo:hi], self._weights[lo:hi]
+            live = ~self._stale[codes]
+            if not live.all():
+                codes, weights = codes[live], weights[live]
+        else:
+            codes, weights = np.empty(0, np.int32), np.empty(0, np.float32)
+        delta = self._delta_postings.get(term_id)
+        if delta:
+            codes = np.concatenate([codes, np.fromiter(delta.keys(), np.int32, len(delta))])
+            weights = np.concatenate([weights, np.fromiter(delta.values(), np.float32, len(delta))])
+        return codes, weights
+
+    def _scores(self, term_ids):
+        """(sorted codes, scores) of the markets matching any of `term_ids`"""
+        n = max(len(self), 1)
+        codes, scores = [], []
+        for term_id in term_ids:
+            c, w = self._postings(term_id)
+            if len(c):
+                idf = math.log(1 + (n - len(c) + 0.5) / (len(c) + 0.5))
+                codes.append(c)
+                scores.append(idf * w * (K1 + 1) / (w + K1))
+        if not codes:
+            return np.empty(0, np.int32), np.empty(0, np.float32)
+        codes, scores = np.concatenate(codes), np.concatenate(scores)
+        if len(codes) > 1 and not (codes[1:] > codes[:-1]).all():
+            codes, inverse = np.unique(codes, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores).astype(np.float32)
+        return codes, scores
+
+    def match(self, query):
+        """(sorted codes, scores) of the markets matching every term of `query`"""
+        tokens = tokenize(query)
+        if not tokens:
+            return np.empty(0, np.int32), np.empty(0, np.float32)
+        groups = [self._scores(self._expand(t, i == len(tokens) - 1)) for i, t in enumerate(tokens)]
+        groups.sort(key=lambda group: len(group[0]))
+        codes, scores = groups[0]
+        for other_codes, other_scores in groups[1:]:
+            if not len(codes):
+                break
+            at = np.minimum(np.searchsorted(other_codes, codes), len(other_codes) - 1)
+            hit = other_codes[at] == codes
+            codes, scores = codes[hit], scores[hit] + other_scores[at[hit]]
+        return codes, scores
+
+    def search(self, query, limit=20):
+        """Best `limit` matches as (ticker, score), highest score first"""
+        codes, scores = self.top(*self.match(query), limit)
+        return [(self.tickers[c], float(s)) for c, s in zip(codes, scores)]
+
+    @staticmethod
+    def top(codes, scores, limit):
+        """The `limit` best of match()'s (codes, scores), ranked; ties go to the lower code"""
+        if limit is not None and len(codes) > limit:
+            # Everything scoring at least the limit-th best, so ties are cut by code
+            kth = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            keep = scores >= kth
+            codes, scores = codes[keep], scores[keep]
+        order = np.lexsort((codes, -scores))[:limit]
+        return codes[order], scores[order]
+
+    def nbytes(self):
+        arrays = (self._offsets, self._post_codes, self._weights, self._stale)
+        return sum(a.nbytes for a in arrays)
+
+
+def fingerprints(markets, tables=None):
+    """Per-market uint64 hash of every indexed text field, aligned with `markets` rows.
+
+    Child rows are summed per market, so the hash tracks the set of labels
+    a market carries, which is all the index sees.
+    """
+    columns = [field for field in MARKET_FIELDS if field in markets]
+    fp = pd.util.hash_pandas_object(markets[columns], index=False).to_numpy().copy()
+    if tables is None:
+        return fp
+    tickers = pd.Index(markets['ticker'])
+    for salt, (attr, fields) in enumerate(CHILD_FIELDS.values()):
+        table = getattr(tables, attr)
+        at = tickers.get_indexer(table.tickers)
+        found = at >= 0
+        for k, field in enumerate(fields):
+            column = table.columns.get(field)
+            if column is None:
+                # Still mix the salt, so a field no row carries hashes like an all-missing one
+                fp[at[found]] = fp[at[found]] * _FIELD_SALT
+                continue
+            if isinstance(column, pd.Categorical):
+                labels = pd.util.hash_pandas_object(column.categories, index=False).to_numpy()
+                rows = np.append(labels, np.uint64(0))[column.codes]
+            else:
+                rows = pd.util.hash_pandas_object(pd.Series(column, dtype=object), index=False).to_numpy()
+            rows = rows * (_FIELD_SALT + np.uint64(2 * (salt * 8 + k) + 1))
+            running = np.concatenate(([np.uint64(0)], np.cumsum(rows, dtype=np.uint64)))
+            per_market = running[table.offsets[1:]] - running[table.offsets[:-1]]
+            fp[at[found]] = fp[at[found]] * _FIELD_SALT + per_market[found]
+    return fp
+
+
+class CatalogSearch:
+    """SearchIndex kept in step with a DataProvider, shared by every session.
+
+    The first query builds the index on the calling thread. Later queries
+    only compare the provider's version with the one last synced. When it
+    moved, they start a background sync and answer from the current index
+    until it lands. With `background=False` the sync runs inline instead.
+    """
+
+    def __init__(self, provider, background=True):
+        self.provider = provider
+        self.background = background
+        self.index = None
+        self._markets = None
+        self._rows = None
+        self._tables = None
+        self._fingerprints = None
+        self._version = provider.version
+        self._aligned = (None, None)
+        # _lock guards the index for queries; _sync_lock serialises writers
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._syncing = False
+        self.stats = {'builds': 0, 'syncs': 0, 'updates': 0, 'removals': 0}
+
+    # ---------------------------------------------------------------- sync
+
+    def refresh(self):
+        """Bring the index up to date with the provider's markets, tables and per-ticker reloads"""
+        with self._sync_lock:
+            keys, version = self.provider.changes_since(self._version)
+            markets = self.provider.market_index().df
+            tables = self.provider.tables()
+            if self.index is None or keys is None:
+                self._build(markets, tables)
+            else:
+                if markets is not self._markets or tables is not self._tables:
+                    self._sync(markets, tables)
+                self._sync_details({args[0] for name, args in keys if name in CHILD_FIELDS and args})
+            self._version = version
+
+    def _catch_up(self):
+        """Build on first use; afterwards sync in the background once the provider moved"""
+        if self.index is None or not self.background:
+            if self.index is None or self.provider.version != self._version:
+                self.refresh()
+            return
+        with self._lock:
+            if self._syncing or self.provider.version == self._version:
+                return
+            self._syncing = True
+        threading.Thread(target=self._background_refresh, name='search-sync', daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception:
+            # Keep serving the current index; the next query after a reload retries
+            pass
+        finally:
+            with self._lock:
+                self._syncing = False
+
+    def _build(self, markets, tables):
+        index = SearchIndex.build(markets, tables)
+        fp = fingerprints(markets, tables)
+        with self._lock:
+            self.index = index
+            self._fingerprints = fp
+        self._use(markets, tables)
+        self.stats['builds'] += 1
+
+    def _sync(self, markets, tables):
+        """Re-index the markets whose text changed between two loads"""
+        index = self.index
+        fp = fingerprints(markets, tables)
+        codes = pd.Index(index.tickers).get_indexer(markets['ticker'])
+        known = np.zeros(len(index.tickers) + 1, dtype=bool)
+        known[codes] = True
+        old = np.zeros(len(index.tickers) + 1, dtype=np.uint64)
+        old[:len(self._fingerprints)] = self._fingerprints
+        changed = np.flatnonzero((codes < 0) | (old[codes] != fp))
+        gone = [index.tickers[c] for c in np.flatnonzero(~known[:-1]) if index.tickers[c] in index]
+        self._use(markets, tables)
+        if len(changed) + len(gone) > REBUILD_FRACTION * len(markets):
+            self._build(markets, tables)
+            return
+        for ticker in gone:
+            with self._lock:
+                index.remove(ticker)
+        tickers = markets['ticker'].iloc[changed].tolist()
+        details = self._details(tickers)
+        for ticker in tickers:
+            self._reindex(ticker, details)
+        # New tickers got codes above the old fingerprint array
+        fingerprints_by_code = np.zeros(len(index.tickers), dtype=np.uint64)
+        fingerprints_by_code[pd.Index(index.tickers).get_indexer(markets['ticker'])] = fp
+        with self._lock:
+            self._fingerprints = fingerprints_by_code
+        self.stats['syncs'] += 1
+        self.stats['removals'] += len(gone)
+
+    def _sync_details(self, tickers):
+        """Re-index the markets whose per-ticker reloads changed their indexed text"""
+        tickers = [t for t in tickers if t in self._rows]
+        if not tickers:
+            return
+        if len(tickers) > REBUILD_FRACTION * len(self._markets):
+            # Cheaper than patching; the tables carry the same detail datasets
+            self._build(self._markets, self._tables)
+            return
+        details = self._details(tickers)
+        fp = fingerprints(self._markets.iloc[self._rows.get_indexer(tickers)], details)
+        for ticker, value in zip(tickers, fp):
+            code = self.index.codes[ticker]
+            if self._fingerprints[code] != value:
+                self._reindex(ticker, details)
+                self._fingerprints[code] = value
+
+    def _details(self, tickers):
+        """CatalogTables of `tickers` from the freshest detail records: per-ticker cache, else the tables"""
+        def loader(name):
+            def load(ticker):
+                value = self.provider.peek(name, ticker)
+                return value if value is not None else getattr(self._tables, name)(ticker)
+            return load
+        return CatalogTables.from_loaders(tickers, *(loader(name) for name in CHILD_FIELDS))
+
+    def _use(self, markets, tables):
+        self._markets, self._tables = markets, tables
+        self._rows = pd.Index(markets['ticker'])
+
+    def _reindex(self, ticker, details):
+        """Re-index one market from its markets row and its records in `details`"""
+        try:
+            row = self._markets.iloc[self._rows.get_loc(ticker)]
+        except KeyError:
+            return
+        document = market_document(row, **{name: getattr(details, name)(ticker) for name in CHILD_FIELDS})
+        with self._lock:
+            self.index.update(ticker, document)
+        self.stats['updates'] += 1
+
+    # ---------------------------------------------------------------- query
+
+    def search(self, query, limit=20):
+        """Ranked (ticker, score) hits for `query`"""
+        self._catch_up()
+        with self._lock:
+            return self.index.search(query, limit)
+
+    def find(self, query, market_index, top=5):
+        """(sorted row positions of every hit, row positions of the `top` best) in `market_index`"""
+        self._catch_up()
+        with self._lock:
+            codes, scores = self.index.match(query)
+            best = self.index.top(codes, scores, top)[0] if top else codes[:0]
+            mapping = self._mapping(market_index)
+        positions = mapping[codes]
+        best = mapping[best]
+        return np.sort(positions[positions >= 0]).astype(np.int32), best[best >= 0]
+
+    def _mapping(self, market_index):
+        """Index code -> row position in `market_index` (-1 when absent), cached per index"""
+        cached_for, mapping = self._aligned
+        if cached_for is not market_index or len(mapping) != len(self.index.tickers):
+            mapping = pd.Index(market_index.df['ticker']).get_indexer(self.index.tickers)
+            self._aligned = (market_index, mapping)
+        return mapping
@@ -0,0 +1,92 @@
+"""Pre-built HTML for the list sections of the detail panel and signals.
+
+Each builder turns a whole list (a market's constraints, its YES/NO and
+collapsed paths, its events, or the lag / high-certainty signal cards) into
+one HTML string, rendered with a single st.markdown call, so a section is
+one delta over the websocket however many items it holds. Strings are
+cached by SharedMarketState.section() per snapshot version, keyed by
+ticker for the detail sections and by filter result for the signals.
+
+Text from the data is escaped; the markup uses the classes in
+static/app.css.
+"""
+
+from hashlib import blake2b
+from html import escape
+
+CONSTRAINT_ICONS = {'passed': '✅', 'open': '🔶', 'blocked': '🔴', 'resolved': '✅'}
+BAND_ICONS = {'high': '🟢', 'medium': '🟡', 'low': '🔴'}
+IMPACT_ICONS = {'positive': '📈', 'negative': '📉', 'neutral': '➡️'}
+
+
+def constraints_html(constraints):
+    items = []
+    for c in constraints:
+        date = f"<br>📅 {escape(str(c['date']))}" if c.get('date') else ''
+        items.append(
+            f"<div class=\"constraint-item\"><strong>{escape(c['name'])}</strong><br>"
+            f"{CONSTRAINT_ICONS.get(c['status'], '⚪')} {escape(c['status'].upper())}{date}"
+            f"<br><em>{escape(c.get('notes') or '')}</em></div>"
+        )
+    return f"<div class=\"section-list\">{''.join(items)}</div>"
+
+
+def _path_items(paths):
+    return ''.join(
+        f"<li>{BAND_ICONS.get(p['probability_band'], '⚪')} {escape(p['description'])}</li>" for p in paths
+    )
+
+
+def paths_html(paths):
+    """YES and NO path lists with their full counts, then recently collapsed paths"""
+    # Seat-control markets carry full path-space counts; lists show the likeliest
+    yes_count = paths.get('yes_count', len(paths['yes_paths']))
+    no_count = paths.get('no_count', len(paths['no_paths']))
+    parts = [
+        f"<p><strong>YES Paths Remaining:</strong> {yes_count:,}</p>",
+        f"<ul class=\"path-list\">{_path_items(paths['yes_paths'])}</ul>",
+        f"<p><strong>NO Paths Remaining:</strong> {no_count:,}</p>",
+        f"<ul class=\"path-list\">{_path_items(paths['no_paths'])}</ul>",
+    ]
+    if paths['recently_collapsed']:
+        parts.append("<p><strong>Recently Collapsed:</strong></p>")
+        parts.extend(
+            f"<div class=\"path-collapse\">❌ {escape(p['description'])}<br>"
+            f"<small>Collapsed: {escape(str(p['collapsed_date']))} — {escape(p['reason'])}</small></div>"
+            for p in paths['recently_collapsed']
+        )
+    return f"<div class=\"section-list\">{''.join(parts)}</div>"
+
+
+def events_html(events):
+    items = ''.join(
+        f"<div class=\"event-item\"><strong>{escape(str(e['date']))}</strong><br>"
+        f"{IMPACT_ICONS.get(e['impact'], '➡️')} {escape(e['event'])}</div>"
+        for e in events
+    )
+    return f"<div class=\"section-list\">{items}</div>"
+
+
+def lag_cards_html(df):
+    """One card per lag-detected market in `df`, in one scrollable block"""
+    cards = ''.join(
+        f"<div class=\"lag-detected\"><strong>{escape(str(title))}</strong><br>"
+        f"Price: ${price:.2f} • {escape(str(summary))}</div>"
+        for title, price, summary in zip(df['title'], df['yes_price'], df['constraint_summary'])
+    )
+    return f"<div class=\"signal-list\">{cards}</div>"
+
+
+def certainty_cards_html(df):
+    """One card per high-certainty market in `df`, in one scrollable block"""
+    cards = ''.join(
+        f"<div class=\"structural-resolved\"><strong>{escape(str(title))}</strong><br>"
+        f"Price: ${price:.2f} • Paths: {yes}Y / {no}N</div>"
+        for title, price, yes, no in zip(df['title'], df['yes_price'], df['paths_yes'], df['paths_no'])
+    )
+    return f"<div class=\"signal-list\">{cards}</div>"
+
+
+def positions_key(positions):
+    """Short cache key for a filter result (an array of row positions)"""
+    return blake2b(positions.tobytes(), digest_size=16).hexdigest()
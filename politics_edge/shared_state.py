@@ -0,0 +1,290 @@
+"""Process-wide shared market state, read by every session by reference.
+
+SharedMarketState sits between the DataProvider and the Streamlit
+sessions. It hands out immutable, versioned MarketSnapshots: a session
+grabs the current snapshot once per rerun and reads everything from it, so
+a run never sees half of an update. Snapshots are never modified. An
+update builds a new one copy-on-write (pandas copy-on-write means only the
+columns that actually change are copied) and swaps the reference
+atomically, leaving older snapshots intact for runs still using them.
+
+Per-market detail (constraints, paths, events, price history) is cached
+per snapshot version and coalesced, so a hundred sessions opening the same
+market trigger one set of upstream fetches. Memory and upstream request
+rate therefore track the number of markets and data versions, not the
+number of sessions.
+
+Constraint status changes (from the alert worker's diff of reloaded
+constraints) go through set_constraint_status(): the provider's
+ConstraintGraph propagates them incrementally and only the touched market
+rows, and their filter index entries, are patched into a new snapshot
+copy-on-write. The statuses are kept and re-applied whenever a provider
+reload installs a fresh index, so a reload never silently reverts them,
+and are dropped once the reloaded source data carries them itself.
+
+The HTML the detail panel and signals summary render from that data is
+cached the same way, per snapshot version and section (see sections.py),
+so a repeat click re-sends one pre-built element per section.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from politics_edge.constraint_graph import ChangeSet
+from politics_edge.detail_loader import load_market_detail
+from politics_edge.lag_engine import detect_lag_status
+from politics_edge.market_index import MarketIndex
+
+# Seconds between sweeps of sessions that stopped taking snapshots
+PRUNE_EVERY = 60.0
+
+
+def _freeze(index):
+    """Make the index's shared arrays read-only so no session can mutate them"""
+    for positions in index.positions.values():
+        for array in positions.values():
+            array.flags.writeable = False
+    return index
+
+
+class MarketSnapshot:
+    """One immutable version of the market state"""
+
+    __slots__ = ('version', 'index', 'created_at')
+
+    def __init__(self, version, index):
+        self.version = version
+        self.index = _freeze(index)
+        self.created_at = time.time()
+
+    @property
+    def markets(self):
+        return self.index.df
+
+
+def _rewrite_rows(index, changes):
+    """`index` patched with a ChangeSet's path counts and certainty, and those rows' lag re-detected"""
+    tickers = list(changes.markets)
+    rows = index.row_positions(tickers)
+    known = rows >= 0
+    if not known.any():
+        return index
+    summaries = [changes.markets[t] for t, k in zip(tickers, known) if k]
+    rows = rows[known]
+    values = {
+        column: [summary[k] for summary in summaries]
+        for k, column in enumerate(('paths_yes', 'paths_no', 'structural_certainty'))
+    }
+    values['lag_status'] = detect_lag_status(index.df.iloc[rows].assign(**values))
+    return index.patched(rows, values)
+
+
+class SharedMarketState:
+    """Current snapshot plus bounded per-(version, ticker) detail and section caches"""
+
+    def __init__(self, provider, detail_cache_size=512, section_cache_size=2048, session_ttl=3600.0):
+        self.provider = provider
+        self.detail_cache_size = detail_cache_size
+        self.section_cache_size = section_cache_size
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+        # Serialises copy-on-write updates and reload installs; readers never take it
+        self._write_lock = threading.RLock()
+        self._snapshot = None
+        self._source_index = None
+        self._details = OrderedDict()
+        self._sections = OrderedDict()
+        self._statuses = {}
+        self._graph = None
+        self._sessions = {}
+        self._pruned_at = time.time()
+        self.stats = {
+            'snapshots': 0, 'detail_fetches': 0, 'detail_hits': 0, 'detail_waits': 0,
+            'section_builds': 0, 'section_hits': 0,
+        }
+
+    # ------------------------------------------------------------- snapshots
+
+    def snapshot(self, session_id=None):
+        """Current snapshot; rebuilt only when the provider reloaded the markets"""
+        index = self.provider.market_index()
+        with self._lock:
+            if session_id is not None:
+                now = time.time()
+                self._sessions[session_id] = now
+                if now - self._pruned_at >= PRUNE_EVERY:
+                    self._prune(now)
+            if index is self._source_index:
+                return self._snapshot
+        # A reload: re-apply recorded statuses, serialised with other writers
+        with self._write_lock:
+            with self._lock:
+                if index is self._source_index:
+                    return self._snapshot
+            installed = self._reapply(index)
+            with self._lock:
+                self._install(installed)
+                self._source_index = index
+                return self._snapshot
+
+    def snapshot_nowait(self):
+        """Current snapshot when taking it needs no markets load or reload install; else None"""
+        index = self.provider.get_nowait('markets')
+        with self._lock:
+            if index is not None and index is self._source_index:
+                return self._snapshot
+        return None
+
+    def _install(self, index):
+        version = self._snapshot.version + 1 if self._snapshot is not None else 1
+        self._snapshot = MarketSnapshot(version, index)
+        self.stats['snapshots'] += 1
+
+    def update_markets(self, update):
+        """Copy-on-write update: `update(df)` returns the new markets frame.
+
+        The frame passed in is a shallow copy of the current one; assigning
+        columns to it never touches the snapshot other sessions are reading.
+        """
+        with self._write_lock:
+            current = self._snapshot or self.snapshot()
+            new_index = MarketIndex(update(current.markets.copy(deep=False)))
+            with self._lock:
+                self._install(new_index)
+                return self._snapshot
+
+    def apply_changes(self, changes):
+        """New snapshot with a constraint_graph ChangeSet's market rows patched in"""
+        with self._write_lock:
+            current = self._snapshot or self.snapshot()
+            if not changes.markets:
+                return current
+            index = _rewrite_rows(current.index, changes)
+            with self._lock:
+                self._install(index)
+                return self._snapshot
+
+    def set_constraint_status(self, cid, status):
+        """Propagate one constraint's new status into the current snapshot; returns the ChangeSet.
+
+        Unknown constraint ids are ignored (empty ChangeSet).
+        """
+        with self._write_lock:
+            graph, merged = self._sync_graph()
+            if cid not in graph.constraints:
+                return ChangeSet()
+            self._statuses[cid] = status
+            changes = graph.set_status(cid, status)
+            merged.markets.update(changes.markets)
+            self.apply_changes(merged)
+        return changes
+
+    def _sync_graph(self):
+        """The provider's graph with the recorded statuses applied; and the market changes that took.
+
+        A graph the provider reloaded gets them once. Statuses the reloaded
+        source data already has, or constraints it no longer links, are
+        dropped from the record. Caller holds _write_lock.
+        """
+        graph = self.provider.constraint_graph()
+        merged = ChangeSet()
+        if graph is self._graph:
+            return graph, merged
+        for cid, status in list(self._statuses.items()):
+            node = graph.constraints.get(cid)
+            if node is None or node.status == status:
+                del self._statuses[cid]
+            else:
+                merged.markets.update(graph.set_status(cid, status).markets)
+        self._graph = graph
+        return graph, merged
+
+    def _reapply(self, index):
+        """`index` with the rows below every recorded constraint status rewritten from the graph.
+
+        The reloaded index may come from a graph with or without the
+        statuses applied; rewriting those rows from current summaries is
+        right either way, and touches only them.
+        """
+        graph, _ = self._sync_graph()
+        changes = ChangeSet()
+        for cid in self._statuses:
+            for ticker in graph.downstream_markets(cid):
+                summary = graph.market_summary(ticker)
+                if summary is not None:
+                    changes.markets[ticker] = summary
+        return _rewrite_rows(index, changes) if changes.markets else index
+
+    # ---------------------------------------------------------------- detail
+
+    def detail(self, snapshot, ticker, parts, fetchers, executor=None):
+        """Detail parts for `ticker` at `snapshot.version`, fetched at most once.
+
+        Concurrent callers for the same key wait on the first caller's fetch
+        instead of issuing their own.
+        """
+        key = (snapshot.version, ticker, tuple(sorted(parts)))
+        with self._lock:
+            future = self._details.get(key)
+            if future is not None:
+                self._details.move_to_end(key)
+                self.stats['detail_hits' if future.done() else 'detail_waits'] += 1
+                owner = False
+            else:
+                future = self._details[key] = Future()
+                self.stats['detail_fetches'] += 1
+                owner = True
+                while len(self._details) > self.detail_cache_size:
+                    self._details.popitem(last=False)
+        if owner:
+            try:
+                future.set_result(load_market_detail(ticker, fetchers, executor, parts))
+            except Exception as exc:
+                with self._lock:
+                    self._details.pop(key, None)
+                future.set_exception(exc)
+        return future.result()
+
+    def section(self, snapshot, key, build):
+        """Rendered section `key` (e.g. (ticker, 'events')) at `snapshot.version`.
+
+        `build()` runs on a miss; two sessions missing at once may both
+        build, which is cheaper than making one wait for the other.
+        """
+        key = (snapshot.version, *key)
+        with self._lock:
+            html = self._sections.get(key)
+            if html is not None:
+                self._sections.move_to_end(key)
+                self.stats['section_hits'] += 1
+                return html
+        html = build()
+        with self._lock:
+            self._sections[key] = html
+            self.stats['section_builds'] += 1
+            while len(self._sections) > self.section_cache_size:
+                self._sections.popitem(last=False)
+        return html
+
+    def invalidate(self):
+        """Drop cached detail and sections; the next snapshot() call picks up reloaded markets"""
+        with self._lock:
+            self._details.clear()
+            self._sections.clear()
+
+    def session_count(self, within=None):
+        """Sessions that took a snapshot in the last `within` seconds (default session_ttl)"""
+        now = time.time()
+        cutoff = now - (within if within is not None else self.session_ttl)
+        with self._lock:
+            self._prune(now)
+            return sum(1 for seen in self._sessions.values() if seen >= cutoff)
+
+    def _prune(self, now):
+        """Forget sessions not seen within session_ttl (caller holds _lock)"""
+        cutoff = now - self.session_ttl
+        for session_id in [sid for sid, seen in self._sessions.items() if seen < cutoff]:
+            del self._sessions[session_id]
+        self._pruned_at = now
@@ -0,0 +1,125 @@
+"""Process start-up: preload the app's dependencies and data before serving.
+
+Streamlit runs the app script inside the server process, so whatever the
+script imports or builds once per process (pandas and NumPy, plotly's
+figure classes, the DataProvider with its markets index, constraint graph
+and columnar tables) is normally paid by the first session of every new
+replica. preload() does that work up front:
+
+    imports    the modules the first render and the detail panel need
+    figure     one small price figure, built and serialized, which loads
+               plotly's lazily imported trace and layout classes
+    assets     the stylesheet, read and minified once per process
+    data       a DataProvider with markets and tables loaded; the app's
+               get_data_provider() takes it over instead of building one
+
+`python -m politics_edge.startup [streamlit run options]` preloads and
+then starts the Streamlit server in the same process, so a replica only
+answers health checks once a session would render warm.
+"""
+
+import argparse
+import importlib
+import os
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'streamlit_app.py')
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'app.css')
+
+# What the first render and the first detail panel import, heaviest first
+PRELOAD_MODULES = (
+    'pandas',
+    'numpy',
+    'plotly.graph_objects',
+    'politics_edge.data_provider',
+    'politics_edge.kalshi_client',
+    'politics_edge.shared_state',
+    'politics_edge.alerts',
+    'politics_edge.dashboard',
+    'politics_edge.chart',
+    'politics_edge.detail_loader',
+    'politics_edge.price_store',
+)
+
+_preloaded = []
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def app_css():
+    """The app stylesheet, comments and layout whitespace stripped (read once per process)"""
+    with open(CSS_PATH) as fh:
+        css = fh.read()
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return re.sub(r'\s+', ' ', css).replace(';}', '}').strip()
+
+
+def take_provider():
+    """The DataProvider preload() warmed, handed out once; None if there is none"""
+    with _lock:
+        return _preloaded.pop() if _preloaded else None
+
+
+def preload(data=True):
+    """Import, build and load everything a first session would; returns seconds per step"""
+    timings = {}
+
+    def step(name, fn):
+        start = time.perf_counter()
+        fn()
+        timings[name] = time.perf_counter() - start
+
+    step('imports', lambda: [importlib.import_module(name) for name in PRELOAD_MODULES])
+    step('figure', _warm_figure)
+    step('assets', app_css)
+    if data:
+        step('data', _warm_provider)
+    return timings
+
+
+def _warm_figure():
+    import pandas as pd
+    import plotly.io as pio
+
+    from politics_edge.chart import build_price_figure
+    prices = pd.DataFrame({'date': pd.date_range('2024-01-01', periods=3), 'price': [0.4, 0.5, 0.6]})
+    pio.to_json(build_price_figure(prices))
+
+
+def _warm_provider():
+    from politics_edge.data_provider import build_default_provider
+    from politics_edge.kalshi_client import client_from_env
+    provider = build_default_provider(source=client_from_env())
+    provider.market_index()
+    provider.tables()
+    with _lock:
+        _preloaded[:] = [provider]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog='Remaining arguments are passed to `streamlit run`.',
+    )
+    parser.add_argument('--no-data', action='store_true', help='preload modules and assets only')
+    args, streamlit_args = parser.parse_known_args()
+
+    # Under `python -m` this file runs as __main__, a module of its own; warm
+    # the politics_edge.startup the app imports, or it would not see the provider
+    from politics_edge import startup
+    timings = startup.preload(data=not args.no_data)
+    print('preloaded in ' + ', '.join(f"{name} {seconds:.2f} s" for name, seconds in timings.items()), flush=True)
+
+    from streamlit.web import cli
+    sys.argv = ['streamlit', 'run', APP, *streamlit_args]
+    sys.exit(cli.main())
+
+
+if __name__ == '__main__':
+    main()
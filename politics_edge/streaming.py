@@ -0,0 +1,272 @@
+"""Streaming price ingestion into a shared, in-place-updated markets table.
+
+A StreamIngestor consumes a tick feed on a background thread. Each tick
+updates yes_price and volume in place in the LiveMarketTable (flat NumPy
+columns aligned to the market index, shared by every session), lands in a
+fixed-size per-ticker RingBuffer, and is fed to the LagDetector so
+lag_status flips as prices move. Every row carries the version of its last
+update, so readers can ask for exactly the rows that changed since they
+last looked instead of rebuilding the table.
+
+Tick sources are plain iterables of (ticker, ts_seconds, price, volume):
+a local JSON-lines replay file standing in for the Kalshi feed, or a
+synthetic random-walk generator for demos. A WebSocket client only needs
+to yield the same tuples.
+
+The LiveFeed runs its ingestor only while some session is streaming. A
+session that turns streaming off releases the feed, and one that stops
+asking for the table (a closed tab) expires after `session_ttl`. With no
+streaming session left the ingestor stops, and the next table_for()
+starts a fresh one.
+"""
+
+import json
+import threading
+import time
+
+import numpy as np
+
+from politics_edge.lag_engine import LagDetector, structural_p_yes
+
+
+class RingBuffer:
+    """Fixed-capacity ring of (ts, price, volume) ticks for one ticker"""
+
+    __slots__ = ('ts', 'price', 'volume', 'head', 'count')
+
+    def __init__(self, capacity):
+        self.ts = np.zeros(capacity, dtype=np.float64)
+        self.price = np.zeros(capacity, dtype=np.float32)
+        self.volume = np.zeros(capacity, dtype=np.int32)
+        self.head = 0
+        self.count = 0
+
+    def append(self, ts, price, volume):
+        i = self.head
+        self.ts[i] = ts
+        self.price[i] = price
+        self.volume[i] = volume
+        self.head = (i + 1) % len(self.ts)
+        self.count = min(self.count + 1, len(self.ts))
+
+    def __len__(self):
+        return self.count
+
+    def snapshot(self):
+        """(ts, price, volume) copies, oldest first"""
+        capacity = len(self.ts)
+        if self.count < capacity:
+            sl = slice(0, self.count)
+            return self.ts[sl].copy(), self.price[sl].copy(), self.volume[sl].copy()
+        order = np.r_[self.head:capacity, 0:self.head]
+        return self.ts[order], self.price[order], self.volume[order]
+
+
+class LiveMarketTable:
+    """yes_price / volume / lag_status columns updated in place by ticks"""
+
+    def __init__(self, markets_df, ring_capacity=512, previous=None):
+        """Build from a markets frame; `previous` carries live state across reloads"""
+        self._lock = threading.Lock()
+        self.tickers = markets_df['ticker'].tolist()
+        self.positions = {t: i for i, t in enumerate(self.tickers)}
+        self.yes_price = markets_df['yes_price'].to_numpy(dtype=np.float64).copy()
+        self.volume = markets_df['volume'].to_numpy(dtype=np.int64).copy()
+        self.lag_detected = (markets_df['lag_status'] == 'detected').to_numpy().copy()
+        self.row_version = np.zeros(len(self.tickers), dtype=np.int64)
+        self.version = previous.version if previous is not None else 0
+        self.ring_capacity = ring_capacity
+        self.rings = previous.rings if previous is not None else {}
+        self.ticks = previous.ticks if previous is not None else 0
+        self.detector = previous.detector if previous is not None else LagDetector()
+
+        now = time.time()
+        p_yes = structural_p_yes(markets_df)
+        for pos, ((t, cert, py, pn, price), p) in enumerate(zip(markets_df[
+            ['ticker', 'structural_certainty', 'paths_yes', 'paths_no', 'yes_price']
+        ].itertuples(index=False), p_yes)):
+            old = previous.positions.get(t) if previous is not None else None
+            self.detector.on_structure(t, now, cert, int(py), int(pn), p)
+            if old is None:
+                self.detector.on_price(t, now, float(price))
+            else:
+                # Live values beat the (older) reloaded snapshot
+                self.yes_price[pos] = previous.yes_price[old]
+                self.volume[pos] = previous.volume[old]
+                self.row_version[pos] = previous.row_version[old]
+            self.lag_detected[pos] = self.detector.status(t) == 'detected'
+
+    def apply_tick(self, ticker, ts, price, volume=0):
+        """Apply one tick in place; unknown tickers are ignored"""
+        pos = self.positions.get(ticker)
+        if pos is None:
+            return False
+        with self._lock:
+            self.version += 1
+            self.yes_price[pos] = price
+            self.volume[pos] += volume
+            self.row_version[pos] = self.version
+            self.ticks += 1
+            ring = self.rings.get(ticker)
+            if ring is None:
+                ring = self.rings[ticker] = RingBuffer(self.ring_capacity)
+            ring.append(ts, price, volume)
+            flipped = self.detector.on_price(ticker, ts, price)
+            if flipped is not None:
+                self.lag_detected[pos] = flipped == 'detected'
+        return True
+
+    def changed_since(self, version):
+        """Row positions updated after `version`, and the current version"""
+        with self._lock:
+            return np.flatnonzero(self.row_version > version), self.version
+
+    def overlay(self, df, positions):
+        """Copy of `df` (rows at `positions` of the base table) with live values"""
+        positions = np.asarray(positions)
+        with self._lock:
+            prices = self.yes_price[positions]
+            volumes = self.volume[positions]
+            lag = self.lag_detected[positions]
+        return df.assign(
+            yes_price=prices,
+            volume=volumes,
+            lag_status=np.where(lag, 'detected', 'none'),
+        )
+
+    def recent(self, ticker):
+        """Recent ticks for a ticker from its ring buffer (oldest first)"""
+        with self._lock:
+            ring = self.rings.get(ticker)
+            return ring.snapshot() if ring is not None else None
+
+
+def replay_file_source(path, speed=1.0, loop=False):
+    """Ticks from a JSON-lines file ({ticker, ts, price, volume}), paced by ts.
+
+    speed > 1 replays faster than real time; speed <= 0 replays flat out.
+    """
+    while True:
+        first_ts = None
+        started = time.monotonic()
+        with open(path) as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                tick = json.loads(line)
+                ts = float(tick['ts'])
+                if speed > 0:
+                    first_ts = ts if first_ts is None else first_ts
+                    delay = (ts - first_ts) / speed - (time.monotonic() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+                yield tick['ticker'], ts, float(tick['price']), int(tick.get('volume', 0))
+        if not loop:
+            return
+
+
+def synthetic_source(table, rate=50.0, vol=0.01, seed=None):
+    """Endless random-walk ticks at roughly `rate` ticks/second over the markets of `table()`.
+
+    `table` returns the current LiveMarketTable and is re-read on every
+    tick, so markets added by a reload start ticking; each market walks on
+    from its live price.
+    """
+    rng = np.random.default_rng(seed)
+    interval = 1.0 / rate if rate > 0 else 0.0
+    while True:
+        current = table()
+        if current is not None and current.tickers:
+            pos = int(rng.integers(len(current.tickers)))
+            price = min(0.99, max(0.01, float(current.yes_price[pos]) + float(rng.normal(0, vol))))
+            yield current.tickers[pos], time.time(), round(price, 2), int(rng.integers(1, 500))
+        if interval:
+            time.sleep(interval)
+
+
+class StreamIngestor:
+    """Consumes a tick source on a daemon thread and applies it to a LiveMarketTable.
+
+    `idle`, when given, is checked before every tick; once it returns True
+    the ingestor stops.
+    """
+
+    def __init__(self, table, source, idle=None):
+        self.table = table
+        self.source = source
+        self.idle = idle
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='tick-ingest', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        try:
+            for ticker, ts, price, volume in self.source:
+                if self._stop.is_set() or (self.idle is not None and self.idle()):
+                    self._stop.set()
+                    return
+                self.table.apply_tick(ticker, ts, price, volume)
+        except Exception as exc:
+            self.error = exc
+
+
+class LiveFeed:
+    """Process-wide stream: one ingestor, one live table per market-index load"""
+
+    def __init__(self, source_factory, ring_capacity=512, session_ttl=90.0, clock=time.monotonic):
+        """`source_factory(feed)` returns the tick iterable for the stream"""
+        self.source_factory = source_factory
+        self.ring_capacity = ring_capacity
+        self.session_ttl = session_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index = None
+        self._sessions = {}
+        self.table = None
+        self.ingestor = None
+
+    def table_for(self, market_index, session_id=None):
+        """Live table aligned with `market_index`; marks `session_id` as streaming and starts the stream"""
+        with self._lock:
+            if market_index is not self._index:
+                self.table = LiveMarketTable(market_index.df, self.ring_capacity, previous=self.table)
+                self._index = market_index
+                if self.ingestor is not None:
+                    self.ingestor.table = self.table
+            self._sessions[session_id] = self._clock()
+            if self.ingestor is None or not self.ingestor.running:
+                self.ingestor = StreamIngestor(self.table, self.source_factory(self), idle=self._idle).start()
+            return self.table
+
+    def release(self, session_id):
+        """`session_id` stopped streaming; stops the ingestor when no session is left"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if not self._sessions and self.ingestor is not None:
+                self.ingestor.stop()
+                self.ingestor = None
+
+    def _idle(self):
+        """Drop sessions not seen within session_ttl; True when none is left"""
+        with self._lock:
+            cutoff = self._clock() - self.session_ttl
+            for session_id in [sid for sid, seen in self._sessions.items() if seen < cutoff]:
+                del self._sessions[session_id]
+            return not self._sessions
+
+    @property
+    def session_count(self):
+        return len(self._sessions)
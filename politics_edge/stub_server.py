@@ -0,0 +1,199 @@
+"""Local stub of the market data API, serving the mock data over HTTP.
+
+Stands in for the Kalshi endpoints so the network-bound code paths (pooled
+client, concurrent detail loading, the rate-limited KalshiClient) can be
+exercised and timed offline. Besides /markets and the per-market
+/markets/<ticker>/<resource> routes it serves two bulk routes: /races (race
+specs of every seat-control market, keyed by ticker) and /catalog (every
+market's constraints, paths and events in one body). Every request sleeps for `latency` seconds
+(plus up to `jitter`) before answering.
+
+Like the real API it can push back: with `rate_limit` set, requests beyond
+that many per second (after a `burst`) get a 429 with Retry-After, and
+`throttle_rate` answers that fraction of requests with a 429 at random.
+Responses carry an ETag and Last-Modified; a matching If-None-Match or
+If-Modified-Since gets an empty 304. `max_age` adds Cache-Control.
+
+    python -m politics_edge.stub_server --port 8765 --latency 0.05 --rate-limit 20
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from politics_edge.kalshi_client import TokenBucket
+from politics_edge.mock_data import (
+    get_mock_markets,
+    get_mock_race_specs,
+    get_mock_races,
+    get_mock_constraints,
+    get_mock_paths,
+    get_mock_events,
+    get_mock_price_history,
+)
+
+
+def _price_history_records(ticker):
+    df = get_mock_price_history(ticker)
+    return [{'date': d.isoformat(), 'price': float(p)} for d, p in zip(df['date'], df['price'])]
+
+
+def _catalog_records():
+    tickers = get_mock_markets()['ticker']
+    return {part: {t: RESOURCES[part](t) for t in tickers} for part in CATALOG_PARTS}
+
+
+# /markets/<ticker>/<resource> handlers
+RESOURCES = {
+    'races': get_mock_races,
+    'constraints': get_mock_constraints,
+    'paths': get_mock_paths,
+    'events': get_mock_events,
+    'history': _price_history_records,
+}
+# Parts of every market served in one body by /catalog
+CATALOG_PARTS = ('constraints', 'paths', 'events')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive so pooled connections are reused
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+        with server.counter_lock:
+            server.request_count += 1
+
+        retry_after = server.throttle()
+        if retry_after is not None:
+            with server.counter_lock:
+                server.throttled_count += 1
+            self._send(429, {'error': 'rate limited'}, {'Retry-After': str(max(1, math.ceil(retry_after)))})
+            return
+
+        parts = [p for p in urlsplit(self.path).path.split('/') if p]
+        if parts == ['markets']:
+            body = get_mock_markets().to_dict(orient='records')
+        elif parts == ['races']:
+            body = get_mock_race_specs()
+        elif parts == ['catalog']:
+            body = _catalog_records()
+        elif len(parts) == 3 and parts[0] == 'markets' and parts[2] in RESOURCES:
+            body = RESOURCES[parts[2]](parts[1])
+        else:
+            self._send(404, {'error': 'not found'})
+            return
+        self._send_cacheable(body)
+
+    def _send_cacheable(self, body):
+        server = self.server
+        payload = json.dumps(body).encode()
+        etag = '"' + hashlib.blake2b(payload, digest_size=12).hexdigest() + '"'
+        headers = {'ETag': etag, 'Last-Modified': formatdate(server.modified, usegmt=True)}
+        if server.max_age is not None:
+            headers['Cache-Control'] = f"max-age={server.max_age}"
+        if self._not_modified(etag):
+            with server.counter_lock:
+                server.not_modified_count += 1
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send(200, payload, headers)
+
+    def _not_modified(self, etag):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        since = self.headers.get('If-Modified-Since')
+        if since:
+            try:
+                return int(self.server.modified) <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send(self, status, body, headers=None):
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), latency=0.0, jitter=0.0, rate_limit=None, burst=None,
+                 throttle_rate=0.0, max_age=None):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.throttle_rate = throttle_rate
+        self.max_age = max_age
+        # Every resource reports the server's start as its Last-Modified
+        self.modified = time.time()
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.throttled_count = 0
+        self.counter_lock = threading.Lock()
+
+    def throttle(self):
+        """Seconds the client should wait if this request is to be refused with a 429, else None"""
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            return 1.0
+        if self.limiter is not None:
+            wait = self.limiter.try_acquire()
+            if wait:
+                return wait
+        return None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve on a daemon thread and return self (handy for benchmarks)"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random seconds per request, up to')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second before 429s')
+    parser.add_argument('--burst', type=float, default=None, help='requests allowed at once (default: the rate)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered 429 at random')
+    parser.add_argument('--max-age', type=int, default=None, help='Cache-Control max-age to send, in seconds')
+    args = parser.parse_args()
+    server = StubServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                        rate_limit=args.rate_limit, burst=args.burst, throttle_rate=args.throttle_rate,
+                        max_age=args.max_age)
+    limit = f", {args.rate_limit:g} req/s" if args.rate_limit else ''
+    print(f"Stub API on {server.base_url} (latency {args.latency * 1000:.0f} ms{limit})")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+"""Seeded, vectorized synthetic market catalog for load testing.
+
+SyntheticCatalog(n, seed) generates n markets plus, per market,
+constraints, YES/NO paths with probability bands, recently collapsed paths
+and dated events, all in the shapes the get_mock_* loaders return. The
+same (n, seed) always yields the same catalog.
+
+Everything is drawn with NumPy in one pass per table. Child rows are
+stored as columnar.ChildTables (text fields are Categoricals built straight
+from codes into the template pools), so the catalog is already in the
+compact representation and the per-ticker dicts are only materialized when
+a loader asks for that ticker. 100k markets generate in about a second.
+
+Distributions are loosely modelled on a political-contracts board: mostly
+Elections, ~80% active, U-shaped prices, log-normal volume, and
+structural certainty derived from path and open-constraint counts the same
+way the constraint graph derives it.
+"""
+
+import numpy as np
+import pandas as pd
+
+from politics_edge.columnar import PATH_SECTIONS, CatalogTables, ChildTable
+
+CATEGORIES = {
+    # category: (weight, ticker prefix, subcategories)
+    'Elections': (0.5, 'ELEC', ['Presidential', 'Senate', 'House', 'Governor', 'Primary']),
+    'Legal': (0.25, 'LEGAL', ['Federal', 'State', 'SCOTUS', 'Appeals']),
+    'Congress': (0.25, 'CONG', ['Legislation', 'Shutdown', 'Confirmation', 'Leadership']),
+}
+
+REGIONS = np.array([
+    'AZ', 'CA', 'FL', 'GA', 'MI', 'MT', 'NC', 'NV', 'NY', 'OH', 'PA', 'TX', 'VA', 'WI', 'US',
+], dtype=object)
+
+CONSTRAINT_NAMES = np.array([
+    'Filing Deadline', 'Primary Certification', 'Ballot Challenge', 'Early Voting Start',
+    'Court Review', 'Committee Vote', 'Floor Vote', 'Certification', 'Appeal Window',
+    'Emergency Stay', 'Recount Deadline', 'Executive Order Window',
+], dtype=object)
+CONSTRAINT_STATUSES = np.array(['passed', 'open', 'blocked', 'resolved'], dtype=object)
+CONSTRAINT_NOTES = np.array([
+    'Pending', 'Complete', 'Hearing scheduled', 'Awaiting ruling', 'Challenge filed',
+    'No active challenges', 'Scheduled', 'Under review',
+], dtype=object)
+
+YES_PATHS = np.array([
+    'Standard outcome', 'Favourable ruling', 'Coalition holds', 'Late surge',
+    'Challenge dismissed', 'Turnout advantage', 'Procedural win',
+], dtype=object)
+NO_PATHS = np.array([
+    'Disqualification upheld', 'Coalition collapse', 'Adverse ruling', 'Candidate withdrawal',
+    'Deadline missed', 'Recount reversal', 'Procedural block',
+], dtype=object)
+BANDS = np.array(['high', 'medium', 'low'], dtype=object)
+COLLAPSE_REASONS = np.array([
+    'Candidate withdrew', 'Court ruling', 'Deadline passed', 'Vote failed', 'Filing rejected',
+], dtype=object)
+
+EVENTS = np.array([
+    'Polling shift detected', 'Court filing', 'Hearing scheduled', 'Endorsement received',
+    'Debate performance', 'Committee markup', 'Fundraising report', 'Legal challenge filed',
+    'Certification complete', 'Press conference',
+], dtype=object)
+IMPACTS = np.array(['positive', 'negative', 'neutral'], dtype=object)
+
+EPOCH = np.datetime64('2024-01-01')
+
+
+def _offsets(counts):
+    return np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+
+def _owner(counts):
+    """Market position for every child row, given per-market child counts"""
+    return np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+
+
+def _iso(days):
+    return np.datetime_as_string(EPOCH + days.astype('timedelta64[D]'), unit='D').astype(object)
+
+
+def _dates(days, present=None):
+    """Categorical of ISO dates for day offsets; missing where `present` is False"""
+    unique, codes = np.unique(days, return_inverse=True)
+    if present is not None:
+        codes = np.where(present, codes, -1)
+    return pd.Categorical.from_codes(codes, _iso(unique))
+
+
+def _labels(codes, pool):
+    return pd.Categorical.from_codes(codes, pool)
+
+
+def certainty_labels(status, paths_yes, paths_no, open_constraints, n_constraints):
+    """Vectorized constraint_graph.certainty_from, with resolved markets labelled resolved"""
+    total = np.maximum(paths_yes + paths_no, 1)
+    share = np.maximum(paths_yes, paths_no) / total
+    one_sided = (paths_yes == 0) | (paths_no == 0)
+    return np.select(
+        [status == 'resolved',
+         one_sided & (open_constraints == 0),
+         one_sided,
+         (share >= 0.75) | (open_constraints <= n_constraints / 2)],
+        ['resolved', 'resolved', 'high', 'medium'],
+        'low',
+    ).astype(object)
+
+
+class SyntheticCatalog:
+    """n seeded markets with constraints, paths and events"""
+
+    def __init__(self, n, seed=0):
+        self.n = n
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._generate_markets(rng)
+        self._generate_constraints(rng)
+        self._generate_paths(rng)
+        self._generate_events(rng)
+        self._finish_markets()
+
+    # ------------------------------------------------------------- generate
+
+    def _generate_markets(self, rng):
+        n = self.n
+        names = list(CATEGORIES)
+        weights = np.array([CATEGORIES[c][0] for c in names])
+        cat = rng.choice(len(names), n, p=weights / weights.sum())
+        sub = np.empty(n, dtype=object)
+        prefix = np.empty(n, dtype=object)
+        for i, name in enumerate(names):
+            mask = cat == i
+            _, pfx, subs = CATEGORIES[name]
+            sub[mask] = np.array(subs, dtype=object)[rng.integers(len(subs), size=int(mask.sum()))]
+            prefix[mask] = pfx
+        self.category = np.array(names, dtype=object)[cat]
+        self.subcategory = sub
+        region = REGIONS[rng.integers(len(REGIONS), size=n)]
+        year = rng.choice([2024, 2025, 2026], n, p=[0.6, 0.3, 0.1])
+
+        self.status = np.where(rng.random(n) < 0.8, 'active', 'resolved').astype(object)
+        resolved = self.status == 'resolved'
+        # U-shaped prices; resolved markets sit at the rails
+        price = np.clip(rng.beta(0.8, 0.8, n), 0.01, 0.99)
+        price[resolved] = np.where(rng.random(int(resolved.sum())) < 0.5, 0.01, 0.99)
+        self.yes_price = np.round(price, 2)
+        self.volume = (np.round(rng.lognormal(10.5, 1.3, n) / 1000) * 1000).astype(np.int64)
+        self.expiration_days = (year - 2024) * 365 + rng.integers(30, 365, n)
+        self.expiration_days[resolved] = rng.integers(0, 200, int(resolved.sum()))
+
+        seq = pd.Series(np.arange(n)).map('{:06d}'.format).to_numpy(dtype=object)
+        year_s = year.astype(str).astype(object)
+        self.ticker = prefix + '-' + year_s + '-' + seq
+        self.title = region + ' ' + sub + ' ' + year_s + ' #' + seq
+
+    def _generate_constraints(self, rng):
+        n = self.n
+        counts = np.clip(rng.poisson(2.5, n) + 1, 1, 8)
+        owner = _owner(counts)
+        rows = len(owner)
+        resolved = self.status[owner] == 'resolved'
+        # passed / open / blocked / resolved for active markets; settled for resolved ones
+        status = rng.choice(4, rows, p=[0.45, 0.42, 0.08, 0.05])
+        status[resolved] = np.where(rng.random(int(resolved.sum())) < 0.7, 0, 3)
+        days = self.expiration_days[owner] - rng.integers(0, 240, rows)
+        has_date = rng.random(rows) < 0.85
+        self.constraint_rows = ChildTable(self.ticker, _offsets(counts), {
+            'name': _labels(rng.integers(len(CONSTRAINT_NAMES), size=rows), CONSTRAINT_NAMES),
+            'status': _labels(status, CONSTRAINT_STATUSES),
+            'date': _dates(days, has_date),
+            'notes': _labels(rng.integers(len(CONSTRAINT_NOTES), size=rows), CONSTRAINT_NOTES),
+        })
+        self.n_constraints = counts
+        self.open_constraints = np.bincount(owner, weights=status == 1, minlength=n).astype(np.int64)
+
+    def _generate_paths(self, rng):
+        n = self.n
+        resolved = self.status == 'resolved'
+        yes = rng.poisson(2.0, n)
+        no = rng.poisson(1.8, n)
+        # Resolved markets keep only the side that won
+        won_yes = self.yes_price > 0.5
+        yes[resolved & ~won_yes] = 0
+        no[resolved & won_yes] = 0
+        self.paths_yes, self.paths_no = yes, no
+        counts = yes + no
+        owner = _owner(counts)
+        # Within each market the YES rows come first, numbered per side
+        rank = np.arange(len(owner)) - _offsets(counts)[owner]
+        side_yes = rank < yes[owner]
+        number = np.where(side_yes, rank, rank - yes[owner]) + 1
+        template = rng.integers(len(YES_PATHS), size=len(owner))
+        label = np.where(side_yes, YES_PATHS[template], NO_PATHS[template])
+        viable_desc = label + ' (' + number.astype(str).astype(object) + ')'
+        band = rng.choice(3, len(owner), p=[0.25, 0.4, 0.35])
+
+        collapsed = np.where(resolved, 0, rng.poisson(0.4, n))
+        c_owner = _owner(collapsed)
+        c_rows = len(c_owner)
+        c_template = rng.integers(len(NO_PATHS), size=c_rows)
+        c_desc = np.where(rng.random(c_rows) < 0.5, YES_PATHS[c_template], NO_PATHS[c_template])
+        c_days = self.expiration_days[c_owner] - rng.integers(30, 300, c_rows)
+
+        # One table for all three sections; viable rows precede collapsed ones per market
+        order = np.argsort(np.concatenate([owner, c_owner]), kind='stable')
+        viable = np.concatenate([np.ones(len(owner), bool), np.zeros(c_rows, bool)])[order]
+        section = np.concatenate([np.where(side_yes, 0, 1), np.full(c_rows, 2)])[order]
+        missing = np.full(c_rows, -1)
+        self.path_rows = ChildTable(self.ticker, _offsets(counts + collapsed), {
+            'section': _labels(section, np.array(PATH_SECTIONS, dtype=object)),
+            'description': pd.Categorical(np.concatenate([viable_desc, c_desc])[order]),
+            'status': _labels(np.where(viable, 0, -1), np.array(['viable'], dtype=object)),
+            'probability_band': _labels(np.concatenate([band, missing])[order], BANDS),
+            'collapsed_date': _dates(np.concatenate([np.zeros(len(owner), np.int64), c_days])[order], ~viable),
+            'reason': _labels(np.concatenate([np.full(len(owner), -1), rng.integers(len(COLLAPSE_REASONS), size=c_rows)])[order],
+                              COLLAPSE_REASONS),
+        }, optional=('status', 'probability_band', 'collapsed_date', 'reason'))
+
+    def _generate_events(self, rng):
+        n = self.n
+        counts = rng.integers(2, 7, n)
+        owner = _owner(counts)
+        days = self.expiration_days[owner] - rng.integers(1, 150, len(owner))
+        # Newest first within each market, like the hand-written timelines
+        order = np.lexsort((-days, owner))
+        self.event_rows = ChildTable(self.ticker, _offsets(counts), {
+            'date': _dates(days[order]),
+            'event': _labels(rng.integers(len(EVENTS), size=len(owner)), EVENTS),
+            'impact': _labels(rng.choice(3, len(owner), p=[0.35, 0.35, 0.3]), IMPACTS),
+        })
+
+    def _finish_markets(self):
+        self.structural_certainty = certainty_labels(
+            self.status, self.paths_yes, self.paths_no, self.open_constraints, self.n_constraints)
+        rng = np.random.default_rng(self.seed + 1)
+        self.lag_status = np.where(rng.random(self.n) < 0.1, 'detected', 'none').astype(object)
+        self.tables = CatalogTables(self.constraint_rows, self.path_rows, self.event_rows)
+
+    # ---------------------------------------------------------------- access
+
+    def markets(self):
+        """Markets frame with the get_mock_markets columns"""
+        open_ = self.open_constraints.astype(str).astype(object)
+        total = self.n_constraints.astype(str).astype(object)
+        summary = np.where(
+            self.status == 'resolved', 'All constraints settled',
+            open_ + ' of ' + total + ' constraints open',
+        )
+        return pd.DataFrame({
+            'ticker': self.ticker,
+            'title': self.title,
+            'category': self.category,
+            'subcategory': self.subcategory,
+            'yes_price': self.yes_price,
+            'volume': self.volume,
+            'expiration': _iso(self.expiration_days),
+            'status': self.status,
+            'lag_status': self.lag_status,
+            'structural_certainty': self.structural_certainty,
+            'paths_yes': self.paths_yes,
+            'paths_no': self.paths_no,
+            'constraint_summary': summary,
+        })
+
+    def __contains__(self, ticker):
+        return ticker in self.tables
+
+    def constraints(self, ticker):
+        return self.tables.constraints(ticker)
+
+    def paths(self, ticker):
+        return self.tables.paths(ticker)
+
+    def events(self, ticker):
+        return self.tables.events(ticker)
@@ -1,8 +1,28 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+import os
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+
+from politics_edge.dashboard import (
+    PAGE_SIZES, SORT_OPTIONS, TABLE_COLUMNS, page_count, page_window, sort_markets
+)
+from politics_edge.data_provider import build_default_provider
+from politics_edge.kalshi_client import client_from_env
+from politics_edge.alerts import AlertHub, AlertWorker
+from politics_edge.market_index import filter_spec, summary_metrics
+from politics_edge.profiling import RERUN_LOG, begin_run, end_run, profiled, span, timed
+from politics_edge.sections import (
+    certainty_cards_html, constraints_html, events_html, lag_cards_html, paths_html, positions_key
+)
+from politics_edge.shared_state import SharedMarketState
+from politics_edge.startup import app_css, take_provider
+# The chart, price store, detail loaders, live feed and search index are
+# imported where first used, so a new session renders the dashboard
+# without them (python -m politics_edge.startup preloads them instead)
 
 # ============================================================================
 # KALSHI POLITICS STRUCTURAL EDGE v1.0
@@ -15,77 +35,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for serious, data-first UI
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: #1a1a2e;
-        margin-bottom: 0;
-    }
-    .sub-header {
-        font-size: 0.95rem;
-        color: #666;
-        margin-top: 0;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1rem;
-        border-radius: 8px;
-        color: white;
-    }
-    .constraint-open { color: #f59e0b; font-weight: 600; }
-    .constraint-passed { color: #10b981; font-weight: 600; }
-    .constraint-blocked { color: #ef4444; font-weight: 600; }
-    .lag-detected { 
-        background: #fef3c7; 
-        border-left: 4px solid #f59e0b;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-        border-radius: 0 4px 4px 0;
-    }
-    .path-collapse {
-        background: #fee2e2;
-        border-left: 4px solid #ef4444;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-        border-radius: 0 4px 4px 0;
-    }
-    .structural-resolved {
-        background: #d1fae5;
-        border-left: 4px solid #10b981;
-        padding: 0.75rem;
-        margin: 0.5rem 0;
-        border-radius: 0 4px 4px 0;
-    }
-    .disclaimer {
-        background: #f8fafc;
-        border: 1px solid #e2e8f0;
-        padding: 0.75rem;
-        border-radius: 4px;
-        font-size: 0.8rem;
-        color: #64748b;
-    }
-    .event-item {
-        border-left: 3px solid #6366f1;
-        padding-left: 0.75rem;
-        margin: 0.5rem 0;
-    }
-    .tier-locked {
-        opacity: 0.5;
-        pointer-events: none;
-    }
-    .tier-badge {
-        background: #6366f1;
-        color: white;
-        padding: 0.25rem 0.5rem;
-        border-radius: 4px;
-        font-size: 0.75rem;
-        font-weight: 600;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Per-rerun timing spans and element counts (see politics_edge.profiling)
+begin_run()
+
+# Custom CSS for serious, data-first UI (politics_edge/static/app.css, minified once per process)
+with span('css'):
+    st.markdown(f"<style>{app_css()}</style>", unsafe_allow_html=True)
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
@@ -95,244 +50,199 @@ if 'user_tier' not in st.session_state:
     st.session_state.user_tier = 'pro'  # Default to pro for demo
 if 'selected_market' not in st.session_state:
     st.session_state.selected_market = None
+if 'chart_window' not in st.session_state:
+    st.session_state.chart_window = None
 if 'alerts_enabled' not in st.session_state:
     st.session_state.alerts_enabled = {}
+if 'alert_session_id' not in st.session_state:
+    st.session_state.alert_session_id = uuid.uuid4().hex
+if 'alert_log' not in st.session_state:
+    st.session_state.alert_log = []
 
 # ============================================================================
-# MOCK DATA - Replace with real API calls in v1.1
+# DATA LAYER
 # ============================================================================
 
-def get_mock_markets():
-    """Mock political markets data - will be replaced with Kalshi API"""
-    markets = [
-        {
-            'ticker': 'PRES-2024-DEM',
-            'title': 'Democratic Nominee 2024',
-            'category': 'Elections',
-            'subcategory': 'Presidential',
-            'yes_price': 0.92,
-            'volume': 245000,
-            'expiration': '2024-08-22',
-            'status': 'active',
-            'lag_status': 'none',
-            'structural_certainty': 'high',
-            'paths_yes': 1,
-            'paths_no': 0,
-            'constraint_summary': 'Nomination structurally resolved'
-        },
-        {
-            'ticker': 'PRES-2024-GOP',
-            'title': 'Republican Nominee 2024',
-            'category': 'Elections',
-            'subcategory': 'Presidential',
-            'yes_price': 0.94,
-            'volume': 312000,
-            'expiration': '2024-07-18',
-            'status': 'active',
-            'lag_status': 'none',
-            'structural_certainty': 'high',
-            'paths_yes': 1,
-            'paths_no': 0,
-            'constraint_summary': 'Primary process complete'
-        },
-        {
-            'ticker': 'SENATE-2024-CONTROL',
-            'title': 'Senate Control 2024',
-            'category': 'Elections',
-            'subcategory': 'Congressional',
-            'yes_price': 0.51,
-            'volume': 189000,
-            'expiration': '2024-11-06',
-            'status': 'active',
-            'lag_status': 'detected',
-            'structural_certainty': 'low',
-            'paths_yes': 8,
-            'paths_no': 7,
-            'constraint_summary': 'Multiple paths open, thin liquidity'
-        },
-        {
-            'ticker': 'GOV-2024-NC',
-            'title': 'NC Governor 2024',
-            'category': 'Elections',
-            'subcategory': 'Gubernatorial',
-            'yes_price': 0.67,
-            'volume': 45000,
-            'expiration': '2024-11-06',
-            'status': 'active',
-            'lag_status': 'detected',
-            'structural_certainty': 'medium',
-            'paths_yes': 2,
-            'paths_no': 2,
-            'constraint_summary': 'Filing complete, legal challenge pending'
-        },
-        {
-            'ticker': 'SCOTUS-2024-TERM',
-            'title': 'SCOTUS Retirement 2024 Term',
-            'category': 'Legal',
-            'subcategory': 'Supreme Court',
-            'yes_price': 0.15,
-            'volume': 28000,
-            'expiration': '2024-10-01',
-            'status': 'active',
-            'lag_status': 'none',
-            'structural_certainty': 'medium',
-            'paths_yes': 3,
-            'paths_no': 1,
-            'constraint_summary': 'Term window closing, no signals'
-        },
-        {
-            'ticker': 'IMPEACH-2024',
-            'title': 'Impeachment Vote 2024',
-            'category': 'Congress',
-            'subcategory': 'Procedures',
-            'yes_price': 0.08,
-            'volume': 67000,
-            'expiration': '2024-12-31',
-            'status': 'active',
-            'lag_status': 'none',
-            'structural_certainty': 'high',
-            'paths_yes': 1,
-            'paths_no': 4,
-            'constraint_summary': 'Procedural path exists but blocked'
-        },
-        {
-            'ticker': 'SHUTDOWN-2024-Q1',
-            'title': 'Government Shutdown Q1 2024',
-            'category': 'Congress',
-            'subcategory': 'Fiscal',
-            'yes_price': 0.35,
-            'volume': 92000,
-            'expiration': '2024-03-31',
-            'status': 'resolved',
-            'lag_status': 'none',
-            'structural_certainty': 'resolved',
-            'paths_yes': 0,
-            'paths_no': 0,
-            'constraint_summary': 'CR passed, outcome resolved'
-        },
-        {
-            'ticker': 'TX-BORDER-2024',
-            'title': 'TX Border Federal Intervention',
-            'category': 'Legal',
-            'subcategory': 'Federal',
-            'yes_price': 0.42,
-            'volume': 156000,
-            'expiration': '2024-06-30',
-            'status': 'active',
-            'lag_status': 'detected',
-            'structural_certainty': 'low',
-            'paths_yes': 4,
-            'paths_no': 3,
-            'constraint_summary': 'SCOTUS ruling pending, multiple paths'
-        },
-    ]
-    return pd.DataFrame(markets)
-
-def get_mock_constraints(ticker):
-    """Mock constraint data for a specific market"""
-    constraints = {
-        'PRES-2024-DEM': [
-            {'name': 'Primary Elections', 'status': 'passed', 'date': '2024-06-04', 'notes': 'All state primaries complete'},
-            {'name': 'Delegate Threshold', 'status': 'passed', 'date': '2024-03-12', 'notes': 'Majority secured'},
-            {'name': 'Convention Vote', 'status': 'passed', 'date': '2024-08-22', 'notes': 'Formal nomination complete'},
-            {'name': 'Legal Challenges', 'status': 'resolved', 'date': '2024-04-15', 'notes': 'No active challenges'},
-        ],
-        'SENATE-2024-CONTROL': [
-            {'name': 'Filing Deadlines', 'status': 'passed', 'date': '2024-06-15', 'notes': 'All states closed'},
-            {'name': 'Primary Certifications', 'status': 'open', 'date': '2024-09-15', 'notes': '42/50 complete'},
-            {'name': 'Early Voting Start', 'status': 'open', 'date': '2024-10-15', 'notes': 'Pending'},
-            {'name': 'Legal Challenges', 'status': 'open', 'date': None, 'notes': '3 active in swing states'},
-        ],
-        'GOV-2024-NC': [
-            {'name': 'Filing Deadline', 'status': 'passed', 'date': '2024-03-01', 'notes': 'Candidates locked'},
-            {'name': 'Primary Election', 'status': 'passed', 'date': '2024-05-14', 'notes': 'Nominees selected'},
-            {'name': 'Ballot Challenge', 'status': 'open', 'date': '2024-08-30', 'notes': 'Robinson challenge pending'},
-            {'name': 'Certification', 'status': 'open', 'date': '2024-11-26', 'notes': 'Post-election'},
-        ],
-        'TX-BORDER-2024': [
-            {'name': 'SCOTUS Emergency Stay', 'status': 'passed', 'date': '2024-01-22', 'notes': 'Federal access granted'},
-            {'name': 'Full SCOTUS Review', 'status': 'open', 'date': '2024-04-15', 'notes': 'Oral arguments pending'},
-            {'name': 'Congressional Action', 'status': 'open', 'date': None, 'notes': 'Bills in committee'},
-            {'name': 'Executive Order Window', 'status': 'open', 'date': None, 'notes': 'Presidential discretion'},
-        ],
-    }
-    return constraints.get(ticker, [
-        {'name': 'Data Pending', 'status': 'open', 'date': None, 'notes': 'Structural analysis in progress'}
-    ])
-
-def get_mock_paths(ticker):
-    """Mock path data for a specific market"""
-    paths = {
-        'SENATE-2024-CONTROL': {
-            'yes_paths': [
-                {'description': 'Hold WV + flip TX + hold MT', 'status': 'viable', 'probability_band': 'low'},
-                {'description': 'Hold WV + hold MT + flip FL', 'status': 'viable', 'probability_band': 'low'},
-                {'description': 'Hold WV + hold MT + hold OH', 'status': 'viable', 'probability_band': 'medium'},
-            ],
-            'no_paths': [
-                {'description': 'Lose WV + lose MT', 'status': 'viable', 'probability_band': 'medium'},
-                {'description': 'Lose WV + lose OH + lose PA', 'status': 'viable', 'probability_band': 'low'},
-            ],
-            'recently_collapsed': [
-                {'description': 'Flip TX via O\'Rourke', 'collapsed_date': '2024-02-15', 'reason': 'Candidate withdrew'},
-            ]
-        },
-        'GOV-2024-NC': {
-            'yes_paths': [
-                {'description': 'Standard election, no disqualification', 'status': 'viable', 'probability_band': 'high'},
-                {'description': 'Post-challenge reinstatement', 'status': 'viable', 'probability_band': 'low'},
-            ],
-            'no_paths': [
-                {'description': 'Ballot disqualification upheld', 'status': 'viable', 'probability_band': 'medium'},
-                {'description': 'Candidate withdrawal', 'status': 'viable', 'probability_band': 'low'},
-            ],
-            'recently_collapsed': []
-        },
-    }
-    return paths.get(ticker, {'yes_paths': [], 'no_paths': [], 'recently_collapsed': []})
-
-def get_mock_events(ticker):
-    """Mock event timeline for a specific market"""
-    events = {
-        'SENATE-2024-CONTROL': [
-            {'date': '2024-08-15', 'event': 'MT primary certification complete', 'impact': 'neutral'},
-            {'date': '2024-08-10', 'event': 'OH polling shift detected', 'impact': 'negative'},
-            {'date': '2024-08-05', 'event': 'WV incumbent retirement confirmed', 'impact': 'negative'},
-            {'date': '2024-07-28', 'event': 'TX filing deadline passed', 'impact': 'neutral'},
-            {'date': '2024-07-15', 'event': 'FL legal challenge dismissed', 'impact': 'positive'},
-        ],
-        'GOV-2024-NC': [
-            {'date': '2024-08-20', 'event': 'Ballot challenge hearing scheduled', 'impact': 'negative'},
-            {'date': '2024-08-12', 'event': 'CNN report on candidate statements', 'impact': 'negative'},
-            {'date': '2024-07-30', 'event': 'Primary runoff avoided', 'impact': 'positive'},
-            {'date': '2024-06-15', 'event': 'Major endorsement received', 'impact': 'positive'},
-        ],
-        'TX-BORDER-2024': [
-            {'date': '2024-08-18', 'event': 'DOJ brief filed', 'impact': 'positive'},
-            {'date': '2024-08-05', 'event': 'TX Governor press conference', 'impact': 'negative'},
-            {'date': '2024-07-22', 'event': 'SCOTUS grants cert', 'impact': 'neutral'},
-            {'date': '2024-07-10', 'event': '5th Circuit ruling', 'impact': 'negative'},
-        ],
-    }
-    return events.get(ticker, [])
-
-def get_mock_price_history(ticker):
-    """Generate mock price history for charts"""
-    dates = pd.date_range(end=datetime.now(), periods=90, freq='D')
-    base_price = random.uniform(0.3, 0.7)
-    prices = []
-    current = base_price
-    for _ in range(90):
-        change = random.gauss(0, 0.02)
-        current = max(0.01, min(0.99, current + change))
-        prices.append(current)
-    return pd.DataFrame({'date': dates, 'price': prices})
+@st.cache_resource
+def get_data_provider():
+    """Process-wide cached data provider (survives reruns and sessions)"""
+    # Warmed before the server started when launched via politics_edge.startup;
+    # reads the Kalshi API when KALSHI_API_URL is set, the mock data otherwise
+    return take_provider() or build_default_provider(source=client_from_env())
+
+@st.cache_resource
+def get_shared_state():
+    """Process-wide versioned market snapshots, read by every session by reference"""
+    return SharedMarketState(get_data_provider())
+
+@st.cache_resource
+def get_market_search():
+    """Process-wide inverted index over market text, updated as the provider reloads"""
+    from politics_edge.search import CatalogSearch
+    return CatalogSearch(get_data_provider())
+
+@st.cache_resource
+def get_detail_executor():
+    """Shared worker pool for concurrent detail-panel fetches"""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix='detail')
+
+@st.cache_resource
+def get_price_store():
+    from politics_edge.price_store import PriceStore
+    return PriceStore()
+
+def history_fallback():
+    """Price history for tickers the store lacks: the Kalshi client's if configured, else mock"""
+    client = client_from_env()
+    if client is not None:
+        return client.price_history
+    from politics_edge.mock_data import get_mock_price_history
+    return get_mock_price_history
+
+@st.cache_resource
+def get_price_history_loader():
+    """Stored history (memory-mapped) where available, the API or mock generator otherwise"""
+    from politics_edge.price_store import store_history_loader
+    return store_history_loader(get_price_store(), history_fallback())
+
+@st.cache_resource
+def get_price_window_loader():
+    """Full-resolution rows for a zoomed chart window"""
+    from politics_edge.price_store import store_window_loader
+    return store_window_loader(get_price_store(), history_fallback())
+
+@st.cache_resource
+def get_live_feed():
+    """Process-wide tick stream: replay file if TICK_REPLAY_FILE is set, else synthetic"""
+    from politics_edge.streaming import LiveFeed, replay_file_source, synthetic_source
+    replay = os.environ.get('TICK_REPLAY_FILE')
+    if replay:
+        return LiveFeed(lambda feed: replay_file_source(replay, loop=True))
+    return LiveFeed(lambda feed: synthetic_source(lambda: feed.table))
+
+@st.cache_resource
+def get_alert_hub():
+    """Process-wide alert worker (own thread) and its session fan-out hub"""
+    hub = AlertHub()
+    # Constraint status changes it detects propagate into the shared snapshot
+    AlertWorker(get_data_provider(), hub, interval=15.0,
+                on_constraint_status=get_shared_state().set_constraint_status).start()
+    return hub
+
+with span('data_layer'):
+    data = get_data_provider()
+    shared = get_shared_state()
+    alert_hub = get_alert_hub()
+
+    # Snapshot for the full-run sections; fragments re-read the current one on their own reruns
+    snapshot = shared.snapshot(st.session_state.alert_session_id)
+
+# ============================================================================
+# INTERACTION CALLBACKS
+# ============================================================================
+# Each interaction reruns only the fragments it affects (st.rerun with
+# fragment keys from a callback); tier, live-stream and refresh changes
+# still rerun the whole app.
+
+def rerun_market_views():
+    """Filter changed: redraw the dashboard and the signals summary"""
+    st.rerun(['dashboard', 'signals'])
+
+def select_market(ticker):
+    """Market picked from the dashboard: redraw the detail panel only"""
+    st.session_state.selected_market = ticker
+    st.session_state.chart_window = None
+    st.rerun(['detail', 'signals'])
+
+def clear_market():
+    st.session_state.selected_market = None
+    st.session_state.chart_window = None
+    st.rerun(['detail', 'signals'])
+
+def zoom_chart():
+    """Range selected on the price chart: redraw it from that window's full-resolution rows"""
+    boxes = st.session_state.price_chart.selection.get('box', [])
+    if boxes:
+        start, end = sorted(pd.Timestamp(x) for x in boxes[0]['x'])
+        st.session_state.chart_window = (start, end)
+    st.rerun(['detail'])
+
+def reset_zoom():
+    st.session_state.chart_window = None
+    st.rerun(['detail'])
+
+def stop_streaming():
+    """Stream toggled off: this session no longer keeps the tick feed running"""
+    if not st.session_state.live_stream:
+        get_live_feed().release(st.session_state.alert_session_id)
+
+def rerun_search():
+    """Search text changed: redraw the hit list and the filtered views"""
+    st.rerun(['search', 'dashboard', 'signals'])
+
+def quick_filter(category, categories):
+    # Full rerun so the category multiselect shows the new selection
+    st.session_state.filter_category = [category] if category in categories else []
+    st.rerun()
+
+@st.fragment(key='alerts')
+@profiled('alerts')
+def render_alert_settings():
+    """Alert preferences and inbox; toggling a checkbox reruns only this fragment"""
+    st.markdown("### Alert Settings")
+    if st.session_state.user_tier in ['pro', 'pro_plus']:
+        alert_constraint = st.checkbox("Constraint Changes", value=True)
+        alert_path = st.checkbox("Path Collapses", value=True)
+        alert_lag = st.checkbox("Lag Detection", value=True)
+        alert_deadline = st.checkbox("Deadline Crossings", value=True)
+        st.session_state.alerts_enabled = {
+            'constraint': alert_constraint,
+            'path': alert_path,
+            'lag': alert_lag,
+            'deadline': alert_deadline,
+        }
+    else:
+        st.session_state.alerts_enabled = {}
+        st.markdown("*Upgrade to Pro for alerts*")
+
+    # The worker evaluates alerts in the background; this session only
+    # syncs its preferences and drains whatever was delivered to it
+    alert_hub.subscribe(st.session_state.alert_session_id, st.session_state.alerts_enabled)
+    st.session_state.alert_log = (
+        alert_hub.poll(st.session_state.alert_session_id)[::-1] + st.session_state.alert_log
+    )[:20]
+    if st.session_state.alert_log:
+        alert_icon = {'constraint': '📋', 'path': '❌', 'lag': '🔶', 'deadline': '⏰'}
+        with st.expander(f"Recent Alerts ({len(st.session_state.alert_log)})"):
+            for a in st.session_state.alert_log:
+                st.markdown(f"{alert_icon.get(a['type'], '•')} **{a['ticker']}** — {a['message']}")
+
+@st.fragment(key='search')
+@profiled('search')
+def render_search():
+    """Full-text search box; the hits also narrow the dashboard and signals"""
+    st.markdown("### Search")
+    query = st.text_input(
+        "Search markets",
+        key='search_query',
+        placeholder="e.g. SCOTUS ruling, NC",
+        label_visibility='collapsed',
+        on_change=rerun_search,
+    )
+    if not query.strip():
+        return
+    snap = shared.snapshot(st.session_state.alert_session_id)
+    with span('search.query'):
+        positions, best = get_market_search().find(query, snap.index)
+    st.caption(f"{len(positions):,} matching markets")
+    for ticker, title in snap.markets[['ticker', 'title']].iloc[best].itertuples(index=False):
+        st.button(title, key=f"search_{ticker}", use_container_width=True, on_click=select_market, args=(ticker,))
 
 # ============================================================================
 # SIDEBAR
 # ============================================================================
 
-with st.sidebar:
+with st.sidebar, span('sidebar'):
     st.markdown("### 🏛️ Politics Edge")
     st.markdown("*Structural Analysis Platform*")
     st.markdown("---")
@@ -355,21 +265,31 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Filters
+    # Search box and top hits rerun on their own
+    render_search()
+    
+    st.markdown("---")
+    
+    # Filters: a change reruns only the dashboard and signals fragments
     st.markdown("### Filters")
     
-    markets_df = get_mock_markets()
+    market_index = snapshot.index
+    if 'filter_category' not in st.session_state:
+        st.session_state.filter_category = market_index.values('category')
     
-    category_filter = st.multiselect(
+    st.multiselect(
         "Category",
-        options=markets_df['category'].unique(),
-        default=markets_df['category'].unique()
+        options=market_index.values('category'),
+        key='filter_category',
+        on_change=rerun_market_views,
     )
     
-    status_filter = st.multiselect(
+    st.multiselect(
         "Status",
         options=['active', 'resolved'],
-        default=['active']
+        default=['active'],
+        key='filter_status',
+        on_change=rerun_market_views,
     )
     
     st.markdown("---")
@@ -377,60 +297,98 @@ with st.sidebar:
     # Structural filters
     st.markdown("### Structural Signals")
     
-    show_lag = st.checkbox("🔶 Lag Detected", value=True)
-    show_path_collapse = st.checkbox("🔴 Recent Path Collapse", value=True)
-    show_high_certainty = st.checkbox("🟢 High Certainty", value=True)
+    st.checkbox("🔶 Lag Detected", value=True, key='filter_lag', on_change=rerun_market_views)
+    st.checkbox("🔴 Recent Path Collapse", value=True, key='filter_path_collapse', on_change=rerun_market_views)
+    st.checkbox("🟢 High Certainty", value=True, key='filter_high_certainty', on_change=rerun_market_views)
+    
+    st.markdown("---")
+    
+    # Live price stream (replaces the Refresh button for prices)
+    st.markdown("### Live Data")
+    live_stream = st.toggle("📡 Stream Prices", value=False, key='live_stream', on_change=stop_streaming,
+                            help="Apply ticks in place and refresh only the dashboard")
+    live_cadence = st.slider("Refresh every (s)", 1, 30, 2, disabled=not live_stream)
     
     st.markdown("---")
     
     # Quick links
     st.markdown("### Quick Access")
-    if st.button("📊 Elections", use_container_width=True):
-        category_filter = ['Elections']
-    if st.button("⚖️ Legal", use_container_width=True):
-        category_filter = ['Legal']
-    if st.button("🏛️ Congress", use_container_width=True):
-        category_filter = ['Congress']
+    for label, category in (("📊 Elections", 'Elections'), ("⚖️ Legal", 'Legal'), ("🏛️ Congress", 'Congress')):
+        st.button(label, use_container_width=True, on_click=quick_filter, args=(category, market_index.values('category')))
     
     st.markdown("---")
     
-    # Alert config
-    st.markdown("### Alert Settings")
-    if st.session_state.user_tier in ['pro', 'pro_plus']:
-        alert_constraint = st.checkbox("Constraint Changes", value=True)
-        alert_path = st.checkbox("Path Collapses", value=True)
-        alert_lag = st.checkbox("Lag Detection", value=True)
-        alert_deadline = st.checkbox("Deadline Crossings", value=True)
-    else:
-        st.markdown("*Upgrade to Pro for alerts*")
+    # Alert config and inbox rerun on their own
+    render_alert_settings()
 
 # ============================================================================
 # MAIN CONTENT
 # ============================================================================
 
 # Header
-col1, col2 = st.columns([3, 1])
-with col1:
-    st.markdown('<p class="main-header">Kalshi Politics Structural Edge</p>', unsafe_allow_html=True)
-    st.markdown('<p class="sub-header">Constraint awareness • Path counting • Market lag detection</p>', unsafe_allow_html=True)
-with col2:
-    st.markdown(f"**Last Update:** {datetime.now().strftime('%H:%M:%S')}")
-    if st.button("🔄 Refresh"):
-        st.rerun()
-
-st.markdown("---")
-
-# Filter markets
-filtered_df = markets_df[
-    (markets_df['category'].isin(category_filter)) &
-    (markets_df['status'].isin(status_filter))
-]
-
-# Apply structural filters
-if not show_lag:
-    filtered_df = filtered_df[filtered_df['lag_status'] != 'detected']
-if not show_high_certainty:
-    filtered_df = filtered_df[filtered_df['structural_certainty'] != 'high']
+with span('header'):
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown('<p class="main-header">Kalshi Politics Structural Edge</p>', unsafe_allow_html=True)
+        st.markdown('<p class="sub-header">Constraint awareness • Path counting • Market lag detection</p>', unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"**Last Update:** {datetime.now().strftime('%H:%M:%S')}")
+        if st.button("🔄 Refresh"):
+            data.invalidate()
+            shared.invalidate()
+            st.rerun()
+
+    st.markdown("---")
+
+@timed('filter')
+def filtered_markets():
+    """(snapshot, row positions, filtered frame) for the current sidebar filters.
+
+    Fragments call this on their own reruns, so it reads the latest shared
+    snapshot and the filter widgets' session state rather than module globals.
+    """
+    snap = shared.snapshot(st.session_state.alert_session_id)
+    index = snap.index
+    include, exclude = filter_spec(
+        st.session_state.get('filter_category', index.values('category')),
+        st.session_state.get('filter_status', ['active']),
+        st.session_state.get('filter_lag', True),
+        st.session_state.get('filter_high_certainty', True),
+    )
+    # Intersect the precomputed per-value row indexes
+    positions = index.select_positions(include, exclude)
+    query = st.session_state.get('search_query', '')
+    if query.strip():
+        hits, _ = get_market_search().find(query, index, top=0)
+        positions = np.intersect1d(positions, hits, assume_unique=True)
+    df = index.df.iloc[positions]
+    # Streaming mode: overlay live prices, volumes and lag flags from the tick feed
+    if st.session_state.get('live_stream'):
+        df = get_live_feed().table_for(index, st.session_state.alert_session_id).overlay(df, positions)
+    return snap, positions, df
+
+def live_view(name, index, positions, build):
+    """build(rows at `positions`, with live values), rebuilt only when a tick touched those rows.
+
+    A streaming fragment keeps its last result in session state with the
+    live-table version it saw. A timer rerun with the same `positions` asks
+    the table which rows changed since then and reuses the result when none
+    of them is among `positions`.
+    """
+    if not st.session_state.get('live_stream'):
+        return build(index.df.iloc[positions])
+    table = get_live_feed().table_for(index, st.session_state.alert_session_id)
+    key = f'live_view_{name}'
+    cached = st.session_state.get(key)
+    if cached is not None and cached[0] is table and cached[1] is positions:
+        changed, version = table.changed_since(cached[2])
+        if not np.isin(changed, positions).any():
+            st.session_state[key] = (table, positions, version, cached[3])
+            return cached[3]
+    version = table.version
+    value = build(table.overlay(index.df.iloc[positions], positions))
+    st.session_state[key] = (table, positions, version, value)
+    return value
 
 # ============================================================================
 # MARKET DASHBOARD
@@ -438,81 +396,178 @@ if not show_high_certainty:
 
 st.markdown("### Market Dashboard")
 
-# Summary metrics
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric("Active Markets", len(filtered_df[filtered_df['status'] == 'active']))
-with col2:
-    lag_count = len(filtered_df[filtered_df['lag_status'] == 'detected'])
-    st.metric("Lag Detected", lag_count, delta="Review" if lag_count > 0 else None)
-with col3:
-    high_cert = len(filtered_df[filtered_df['structural_certainty'] == 'high'])
-    st.metric("High Certainty", high_cert)
-with col4:
-    total_vol = filtered_df['volume'].sum()
-    st.metric("Total Volume", f"${total_vol:,.0f}")
-
-st.markdown("")
-
-# Market table
-for idx, row in filtered_df.iterrows():
-    with st.container():
-        cols = st.columns([3, 1, 1, 1, 1, 1])
+def select_from_table():
+    """Row-selection callback for the table view"""
+    rows = st.session_state.market_table.selection.rows
+    if rows:
+        select_market(st.session_state.table_tickers[rows[0]])
+
+@profiled('dashboard.metrics')
+def dashboard_metrics(index, positions):
+    """Summary metrics over the filtered rows"""
+    with span('metrics'):
+        metrics = live_view('metrics', index, positions, summary_metrics)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Active Markets", metrics['active'])
+    with col2:
+        lag_count = metrics['lag_detected']
+        st.metric("Lag Detected", lag_count, delta="Review" if lag_count > 0 else None)
+    with col3:
+        st.metric("High Certainty", metrics['high_certainty'])
+    with col4:
+        st.metric("Total Volume", f"${metrics['total_volume']:,.0f}")
+
+@profiled('dashboard.rows')
+def dashboard_rows(index, positions, view_mode):
+    """The visible rows: every sorted row as a grid in the table view, the current page as cards"""
+    with span('rows'):
+        rows = live_view('rows', index, positions, lambda df: df)
+
+    if view_mode == 'Table':
+        # One virtualized grid element regardless of catalog size
+        st.session_state.table_tickers = rows['ticker'].tolist()
+        st.dataframe(
+            rows[TABLE_COLUMNS],
+            hide_index=True,
+            use_container_width=True,
+            on_select=select_from_table,
+            selection_mode='single-row',
+            key='market_table',
+        )
+        return
+
+    # Market table (current page only)
+    for idx, row in rows.iterrows():
+        with st.container():
+            cols = st.columns([3, 1, 1, 1, 1, 1])
         
-        with cols[0]:
-            # Market title with structural indicator
-            indicator = ""
-            if row['lag_status'] == 'detected':
-                indicator = "🔶"
-            elif row['structural_certainty'] == 'high':
-                indicator = "🟢"
-            elif row['structural_certainty'] == 'low':
-                indicator = "⚪"
+            with cols[0]:
+                # Market title with structural indicator
+                indicator = ""
+                if row['lag_status'] == 'detected':
+                    indicator = "🔶"
+                elif row['structural_certainty'] == 'high':
+                    indicator = "🟢"
+                elif row['structural_certainty'] == 'low':
+                    indicator = "⚪"
             
-            if st.button(f"{indicator} {row['title']}", key=f"btn_{row['ticker']}", use_container_width=True):
-                st.session_state.selected_market = row['ticker']
+                st.button(f"{indicator} {row['title']}", key=f"btn_{row['ticker']}", use_container_width=True,
+                          on_click=select_market, args=(row['ticker'],))
         
-        with cols[1]:
-            st.markdown(f"**${row['yes_price']:.2f}**")
-            st.caption("YES Price")
+            with cols[1]:
+                st.markdown(f"**${row['yes_price']:.2f}**")
+                st.caption("YES Price")
         
-        with cols[2]:
-            st.markdown(f"**{row['paths_yes']}** / **{row['paths_no']}**")
-            st.caption("Paths Y/N")
+            with cols[2]:
+                st.markdown(f"**{row['paths_yes']}** / **{row['paths_no']}**")
+                st.caption("Paths Y/N")
         
-        with cols[3]:
-            cert_color = {
-                'high': '🟢',
-                'medium': '🟡', 
-                'low': '🔴',
-                'resolved': '✅'
-            }
-            st.markdown(f"{cert_color.get(row['structural_certainty'], '⚪')} {row['structural_certainty'].title()}")
-            st.caption("Certainty")
+            with cols[3]:
+                cert_color = {
+                    'high': '🟢',
+                    'medium': '🟡', 
+                    'low': '🔴',
+                    'resolved': '✅'
+                }
+                st.markdown(f"{cert_color.get(row['structural_certainty'], '⚪')} {row['structural_certainty'].title()}")
+                st.caption("Certainty")
         
-        with cols[4]:
-            st.markdown(f"${row['volume']:,}")
-            st.caption("Volume")
+            with cols[4]:
+                st.markdown(f"${row['volume']:,}")
+                st.caption("Volume")
         
-        with cols[5]:
-            st.markdown(f"`{row['subcategory']}`")
-            st.caption("Type")
+            with cols[5]:
+                st.markdown(f"`{row['subcategory']}`")
+                st.caption("Type")
         
-        # Constraint summary line
-        st.caption(f"📋 {row['constraint_summary']}")
-        st.markdown("---")
+            # Constraint summary line
+            st.caption(f"📋 {row['constraint_summary']}")
+            st.markdown("---")
+
+@profiled('dashboard')
+def render_dashboard():
+    """Summary metrics and the visible page of market rows.
+
+    Runs as the 'dashboard' fragment: filter, sort and paging changes redraw
+    only this section. In streaming mode the metrics and the visible rows
+    are nested fragments on the live cadence, so a tick reruns only them;
+    each rebuilds only when changed_since shows a tick on its rows. Rows
+    keep the order of the last sort until the dashboard itself reruns.
+    """
+    snap, positions, df = filtered_markets()
+    live_every = live_cadence if live_stream else None
+
+    st.fragment(dashboard_metrics, run_every=live_every, key='dashboard_metrics')(snap.index, positions)
+
+    st.markdown("")
+
+    # Dashboard controls: sorting is done server-side on the full filtered set,
+    # then only the visible window of rows is rendered
+    ctrl1, ctrl2, ctrl3, ctrl4 = st.columns([1, 1, 1, 1])
+    with ctrl1:
+        view_mode = st.radio("View", ['Cards', 'Table'], horizontal=True, key='dashboard_view')
+    with ctrl2:
+        sort_label = st.selectbox("Sort by", list(SORT_OPTIONS), key='dashboard_sort')
+    with ctrl3:
+        sort_desc = st.toggle("Descending", value=not SORT_OPTIONS[sort_label][1], key=f'dashboard_desc_{sort_label}')
+    with ctrl4:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key='dashboard_page_size')
+
+    with span('sort'):
+        sorted_df = sort_markets(df, sort_label, descending=sort_desc)
+
+    if view_mode == 'Table':
+        page_df = sorted_df
+    else:
+        n_pages = page_count(len(sorted_df), page_size)
+        if st.session_state.get('dashboard_page', 1) > n_pages:
+            st.session_state.dashboard_page = n_pages
+        page_df, page, n_pages = page_window(sorted_df, st.session_state.get('dashboard_page', 1), page_size)
+        if n_pages > 1:
+            st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key='dashboard_page')
+        st.caption(f"Showing {len(page_df)} of {len(sorted_df)} markets")
+
+    # The index of a filtered slice of the snapshot frame is its row positions
+    st.fragment(dashboard_rows, run_every=live_every, key='dashboard_rows')(
+        snap.index, page_df.index.to_numpy(), view_mode)
+
+st.fragment(render_dashboard, key='dashboard')()
 
 # ============================================================================
 # STRUCTURAL DETAIL PANEL
 # ============================================================================
 
-if st.session_state.selected_market:
+@st.fragment(key='detail')
+@profiled('detail')
+def render_detail():
+    """Detail panel and price chart for the selected market.
+
+    Selecting a market or going back reruns only this fragment (and the
+    signals summary it replaces); the dashboard above stays as drawn.
+    """
+    if not st.session_state.selected_market:
+        return
+    # First detail panel of the process: loads the chart and detail modules
+    from politics_edge.chart import build_price_figure
+    from politics_edge.detail_loader import local_fetchers
+
+    snap = shared.snapshot(st.session_state.alert_session_id)
     ticker = st.session_state.selected_market
-    market_row = markets_df[markets_df['ticker'] == ticker].iloc[0]
+    markets = snap.markets
+    market_row = markets[markets['ticker'] == ticker].iloc[0]
     
     st.markdown(f"## 📊 {market_row['title']}")
     st.markdown(f"`{ticker}` • Expires: {market_row['expiration']}")
     
+    # Fetch everything the panel needs in one concurrent round
+    detail_parts = ['constraints', 'price_history']
+    if st.session_state.user_tier in ['pro', 'pro_plus']:
+        detail_parts += ['paths', 'events']
+    fetchers = local_fetchers(data, get_price_history_loader())
+    with span('detail.fetch'):
+        detail = shared.detail(snap, ticker, detail_parts, fetchers, get_detail_executor())
+    
     # Structural status alert box
     if market_row['lag_status'] == 'detected':
         st.markdown(f"""
@@ -535,7 +590,7 @@ if st.session_state.selected_market:
     col1, col2, col3 = st.columns(3)
     
     # CONSTRAINT STATUS
-    with col1:
+    with col1, span('detail.constraints'):
         st.markdown("### Constraint Status")
         
         if st.session_state.user_tier == 'free':
@@ -543,131 +598,86 @@ if st.session_state.selected_market:
             st.markdown("---")
             st.markdown("**Sample (delayed):**")
         
-        constraints = get_mock_constraints(ticker)
-        for c in constraints:
-            status_icon = {
-                'passed': '✅',
-                'open': '🔶',
-                'blocked': '🔴',
-                'resolved': '✅'
-            }
-            st.markdown(f"""
-            **{c['name']}**  
-            {status_icon.get(c['status'], '⚪')} {c['status'].upper()}  
-            {f"📅 {c['date']}" if c['date'] else ""}  
-            _{c['notes']}_
-            """)
-            st.markdown("")
+        html = shared.section(snap, (ticker, 'constraints'), lambda: constraints_html(detail['constraints']))
+        st.markdown(html, unsafe_allow_html=True)
     
     # PATH COUNT
-    with col2:
+    with col2, span('detail.paths'):
         st.markdown("### Path Analysis")
         
         if st.session_state.user_tier == 'free':
             st.markdown("*🔒 Upgrade to Pro for path visibility*")
         else:
-            paths = get_mock_paths(ticker)
-            
-            st.markdown(f"**YES Paths Remaining:** {len(paths['yes_paths'])}")
-            for p in paths['yes_paths']:
-                band_color = {'high': '🟢', 'medium': '🟡', 'low': '🔴'}
-                st.markdown(f"- {band_color.get(p['probability_band'], '⚪')} {p['description']}")
-            
-            st.markdown("")
-            st.markdown(f"**NO Paths Remaining:** {len(paths['no_paths'])}")
-            for p in paths['no_paths']:
-                band_color = {'high': '🟢', 'medium': '🟡', 'low': '🔴'}
-                st.markdown(f"- {band_color.get(p['probability_band'], '⚪')} {p['description']}")
-            
-            if paths['recently_collapsed']:
-                st.markdown("")
-                st.markdown("**Recently Collapsed:**")
-                for p in paths['recently_collapsed']:
-                    st.markdown(f"""
-                    <div class="path-collapse">
-                        ❌ {p['description']}<br>
-                        <small>Collapsed: {p['collapsed_date']} — {p['reason']}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
+            html = shared.section(snap, (ticker, 'paths'), lambda: paths_html(detail['paths']))
+            st.markdown(html, unsafe_allow_html=True)
     
     # EVENT TIMELINE
-    with col3:
+    with col3, span('detail.events'):
         st.markdown("### Event Timeline")
         
         if st.session_state.user_tier in ['pro', 'pro_plus']:
-            events = get_mock_events(ticker)
-            for e in events:
-                impact_icon = {
-                    'positive': '📈',
-                    'negative': '📉',
-                    'neutral': '➡️'
-                }
-                st.markdown(f"""
-                <div class="event-item">
-                    <strong>{e['date']}</strong><br>
-                    {impact_icon.get(e['impact'], '➡️')} {e['event']}
-                </div>
-                """, unsafe_allow_html=True)
+            html = shared.section(snap, (ticker, 'events'), lambda: events_html(detail['events']))
+            st.markdown(html, unsafe_allow_html=True)
         else:
             st.markdown("*🔒 Upgrade to Pro for event mapping*")
     
     # PRICE CHART
     st.markdown("### Price History with Events")
     
-    price_df = get_mock_price_history(ticker)
-    
-    fig = go.Figure()
+    price_df = detail['price_history']
     
-    # Price line
-    fig.add_trace(go.Scatter(
-        x=price_df['date'],
-        y=price_df['price'],
-        mode='lines',
-        name='YES Price',
-        line=dict(color='#6366f1', width=2)
-    ))
+    # Event markers are pro-only; aligned with one as-of join, drawn as one trace
+    chart_events = detail['events'] if st.session_state.user_tier in ['pro', 'pro_plus'] else None
     
-    # Add event markers if pro
-    if st.session_state.user_tier in ['pro', 'pro_plus']:
-        events = get_mock_events(ticker)
-        for e in events:
-            event_date = pd.to_datetime(e['date'])
-            if event_date >= price_df['date'].min():
-                closest_idx = (price_df['date'] - event_date).abs().argmin()
-                price_at_event = price_df.iloc[closest_idx]['price']
-                
-                color = {'positive': 'green', 'negative': 'red', 'neutral': 'gray'}
-                fig.add_trace(go.Scatter(
-                    x=[event_date],
-                    y=[price_at_event],
-                    mode='markers',
-                    marker=dict(size=12, color=color.get(e['impact'], 'gray'), symbol='diamond'),
-                    name=e['event'][:30],
-                    hovertext=e['event']
-                ))
-    
-    fig.update_layout(
-        height=350,
-        margin=dict(l=0, r=0, t=30, b=0),
-        xaxis_title="",
-        yaxis_title="Price ($)",
-        yaxis=dict(range=[0, 1]),
-        showlegend=False,
-        hovermode='x unified'
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    # Downsampled to the chart width; a selected range is re-queried at full resolution
+    window = st.session_state.chart_window
+    if window is not None:
+        with span('chart.window'):
+            price_df = get_price_window_loader()(ticker, *window)
+    with span('chart.build'):
+        fig = build_price_figure(price_df, chart_events, window=window)
     
+    with span('chart.render'):
+        st.plotly_chart(fig, use_container_width=True, key='price_chart', on_select=zoom_chart, selection_mode='box')
+    meta = fig.layout.meta
+    if window is not None or meta['points'] < meta['window_points']:
+        st.caption(f"Showing {meta['points']:,} of {meta['window_points']:,} points • drag across the chart to zoom in")
+    if window is not None:
+        st.button("Reset zoom", on_click=reset_zoom)
+
+    # Streaming mode: the market's latest ticks from the live feed's ring buffer
+    if st.session_state.get('live_stream'):
+        recent = get_live_feed().table_for(snap.index, st.session_state.alert_session_id).recent(ticker)
+        if recent is not None and len(recent[1]):
+            prices = recent[1]
+            st.caption(f"📡 Last {len(prices)} live ticks: ${prices[-1]:.2f} now, "
+                       f"${prices.min():.2f}–${prices.max():.2f} range")
+
     # Back button
-    if st.button("← Back to Dashboard"):
-        st.session_state.selected_market = None
-        st.rerun()
+    st.button("← Back to Dashboard", on_click=clear_market)
+
+render_detail()
 
 # ============================================================================
 # STRUCTURAL SIGNALS SUMMARY (Pro+ only)
 # ============================================================================
 
-if st.session_state.user_tier == 'pro_plus' and not st.session_state.selected_market:
+@st.fragment(key='signals')
+@profiled('signals')
+def render_signals():
+    """Pro+ summary of the filtered markets, hidden while a market is open"""
+    if st.session_state.user_tier != 'pro_plus' or st.session_state.selected_market:
+        return
+    snap, positions, filtered_df = filtered_markets()
+    # One element per column, cached per snapshot and filter result (live
+    # prices change between snapshots, so streaming mode builds every run)
+    live = st.session_state.get('live_stream')
+    
+    def cards(kind, build, rows):
+        if live:
+            return build(rows)
+        return shared.section(snap, ('signals', kind, positions_key(positions)), lambda: build(rows))
+    
     st.markdown("---")
     st.markdown("### 🎯 Priority Structural Signals")
     
@@ -677,13 +687,7 @@ if st.session_state.user_tier == 'pro_plus' and not st.session_state.selected_ma
         st.markdown("#### Markets with Lag Detected")
         lag_markets = filtered_df[filtered_df['lag_status'] == 'detected']
         if len(lag_markets) > 0:
-            for _, row in lag_markets.iterrows():
-                st.markdown(f"""
-                <div class="lag-detected">
-                    <strong>{row['title']}</strong><br>
-                    Price: ${row['yes_price']:.2f} • {row['constraint_summary']}
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(cards('lag', lag_cards_html, lag_markets), unsafe_allow_html=True)
         else:
             st.markdown("*No lag detected in current filter*")
     
@@ -691,29 +695,40 @@ if st.session_state.user_tier == 'pro_plus' and not st.session_state.selected_ma
         st.markdown("#### High Structural Certainty")
         high_cert = filtered_df[filtered_df['structural_certainty'] == 'high']
         if len(high_cert) > 0:
-            for _, row in high_cert.iterrows():
-                st.markdown(f"""
-                <div class="structural-resolved">
-                    <strong>{row['title']}</strong><br>
-                    Price: ${row['yes_price']:.2f} • Paths: {row['paths_yes']}Y / {row['paths_no']}N
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(cards('certainty', certainty_cards_html, high_cert), unsafe_allow_html=True)
         else:
             st.markdown("*No high certainty markets in current filter*")
 
+render_signals()
+
 # ============================================================================
 # DISCLAIMER FOOTER
 # ============================================================================
 
-st.markdown("---")
-st.markdown("""
-<div class="disclaimer">
-    <strong>Disclaimer:</strong> This platform provides informational analysis of publicly available data 
-    related to Kalshi event contracts. Nothing on this platform constitutes financial, legal, or investment advice. 
-    Kalshi contracts are regulated by the CFTC and involve risk of loss. Users are solely responsible for their 
-    own trading decisions. Past structural signals do not guarantee future results.
-</div>
-""", unsafe_allow_html=True)
-
-st.markdown("")
-st.caption("Kalshi Politics Edge v1.0 • Structural Analysis Platform • © 2024")
+with span('footer'):
+    st.markdown("---")
+    st.markdown("""
+    <div class="disclaimer">
+        <strong>Disclaimer:</strong> This platform provides informational analysis of publicly available data 
+        related to Kalshi event contracts. Nothing on this platform constitutes financial, legal, or investment advice. 
+        Kalshi contracts are regulated by the CFTC and involve risk of loss. Users are solely responsible for their 
+        own trading decisions. Past structural signals do not guarantee future results.
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("")
+    st.caption("Kalshi Politics Edge v1.0 • Structural Analysis Platform • © 2024")
+
+# ============================================================================
+# PROFILING DEBUG PANEL (?debug=1 or PROFILE_PANEL=1)
+# ============================================================================
+
+run_record = end_run()
+if st.query_params.get('debug') == '1' or os.environ.get('PROFILE_PANEL'):
+    with st.expander(f"🛠 Rerun profile: {run_record['total_ms']:.0f} ms, {run_record['elements']} elements"):
+        spans_df = pd.DataFrame(run_record['spans'])
+        spans_df['name'] = [' ' * d + n for d, n in zip(spans_df['depth'], spans_df['name'])]
+        st.dataframe(spans_df[['name', 'ms', 'calls', 'elements']], hide_index=True, use_container_width=True)
+        st.markdown("**This session's reruns, incl. fragment-only runs (ms)**")
+        percentiles = RERUN_LOG.percentiles(run_record['session'])
+        st.dataframe(pd.DataFrame.from_dict(percentiles, orient='index').round(1), use_container_width=True)
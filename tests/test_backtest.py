@@ -0,0 +1,57 @@
+"""The backtest's replayed lag detection agrees with the live markets table."""
+
+import pandas as pd
+import pytest
+
+from politics_edge.backtest import BACKTEST_END, SIGNAL_KINDS, replay_market, structural_timeline
+from politics_edge.data_provider import build_default_provider
+from politics_edge.lag_engine import DETECTED, implied_probability
+from politics_edge.mock_data import get_mock_constraints, get_mock_paths, get_mock_races
+from politics_edge.path_engine import market_from_spec
+
+# LagDetector's own defaults, which detect_lag_status runs with
+LIVE_SETTINGS = {'halflife': 300.0, 'grace': 0.0}
+
+
+def final_structure(row):
+    """The replay's (certainty, yes, no) after every dated change, or None without structure"""
+    races = get_mock_races(row.ticker)
+    initial, _, states = structural_timeline(
+        get_mock_constraints(row.ticker), get_mock_paths(row.ticker),
+        market_from_spec(races).probability_yes() if races else None, (int(row.paths_yes), int(row.paths_no)))
+    final = states[-1] if states else initial
+    return final[:3] if final is not None else None
+
+
+def replayed_at_final_state(row):
+    """Replay one bar at the market's current price, after every dated change"""
+    ticker = row.ticker
+    prices = pd.DataFrame({'date': [pd.Timestamp(BACKTEST_END)], 'price': [row.yes_price]})
+    return replay_market(ticker, prices, get_mock_constraints(ticker), get_mock_paths(ticker), [], (1,),
+                         LIVE_SETTINGS, get_mock_races(ticker), (int(row.paths_yes), int(row.paths_no)))
+
+
+@pytest.mark.parametrize('market_count', [None, '300'])
+def test_lag_flips_match_detect_lag_status(monkeypatch, market_count):
+    if market_count is None:
+        monkeypatch.delenv('MOCK_MARKET_COUNT', raising=False)
+    else:
+        monkeypatch.setenv('MOCK_MARKET_COUNT', market_count)
+    markets = build_default_provider().markets()
+    compared = detected = 0
+    for row in markets.itertuples(index=False):
+        # Certainty is rebuilt from counts and open constraints; compare the
+        # implied probability only where that agrees with the table
+        if final_structure(row) != (row.structural_certainty, row.paths_yes, row.paths_no):
+            continue
+        compared += 1
+        signals = replayed_at_final_state(row)
+        lags = [i for i, kind in enumerate(signals['kind']) if SIGNAL_KINDS[kind] == 'lag']
+        assert bool(lags) == (row.lag_status == DETECTED), row.ticker
+        if lags:
+            detected += 1
+            implied = implied_probability(row.structural_certainty, row.paths_yes, row.paths_no,
+                                          row.structural_p_yes)
+            assert signals['direction'][lags[0]] == (1 if implied > row.yes_price else -1), row.ticker
+    assert compared >= len(markets) / 2
+    assert detected
@@ -0,0 +1,151 @@
+"""Incremental propagation in ConstraintGraph and its path into the shared snapshot."""
+
+import random
+
+from politics_edge.columnar import CatalogTables
+from politics_edge.constraint_graph import BLOCKED, OPEN, PASSED, RESOLVED, ConstraintGraph, build_constraint_graph
+from politics_edge.data_provider import build_default_provider, graph_from_tables
+from politics_edge.market_index import MarketIndex
+from politics_edge.shared_state import SharedMarketState
+
+
+def shared_ruling_graph():
+    """Two markets hanging off one shared ruling, plus an unrelated third"""
+    graph = ConstraintGraph()
+    graph.add_constraint('RULING', OPEN)
+    for ticker in ('A', 'B', 'C'):
+        graph.add_constraint(f"{ticker}:filing", PASSED, ticker)
+        graph.add_constraint(f"{ticker}:cert", OPEN, ticker, [f"{ticker}:filing"])
+    for ticker in ('A', 'B'):
+        graph.add_constraint('RULING', market=ticker)
+        graph.add_path(f"{ticker}:yes:0", ticker, 'yes', requires=['RULING', f"{ticker}:cert"])
+        graph.add_path(f"{ticker}:no:0", ticker, 'no', blocked_by=['RULING'])
+    graph.add_path('C:yes:0', 'C', 'yes', requires=['C:cert'])
+    graph.add_path('C:no:0', 'C', 'no', blocked_by=['C:cert'])
+    return graph
+
+
+def rebuilt(graph):
+    """A fresh graph with the same structure and statuses, built without set_status"""
+    fresh = ConstraintGraph()
+    for cid, node in graph.constraints.items():
+        fresh.add_constraint(cid, node.status, depends_on=[p.cid for p in node.parents])
+        for ticker in sorted(node.markets):
+            fresh.add_constraint(cid, market=ticker)
+    for pid, path in graph.paths.items():
+        fresh.add_path(pid, path.market, path.side, path.requires, path.blocked_by)
+    return fresh
+
+
+def test_shared_ruling_reaches_every_market_that_uses_it():
+    graph = shared_ruling_graph()
+    changes = graph.set_status('RULING', BLOCKED)
+    assert set(changes.markets) == {'A', 'B'}
+    for ticker in ('A', 'B'):
+        assert graph.market_summary(ticker) == (0, 1, 'high')
+    assert graph.market_summary('C') == (1, 1, 'medium')
+
+
+def test_passed_ruling_collapses_the_paths_it_blocks():
+    graph = shared_ruling_graph()
+    changes = graph.set_status('RULING', PASSED)
+    assert changes.paths == {'A:no:0': False, 'B:no:0': False}
+    assert graph.market_summary('A') == (1, 0, 'high')
+
+
+def test_blocked_parent_blocks_its_cone():
+    graph = shared_ruling_graph()
+    changes = graph.set_status('A:filing', BLOCKED)
+    assert graph.effective_status('A:cert') == BLOCKED
+    # The child's own status is untouched; only its effective status moved
+    assert graph.constraints['A:cert'].status == OPEN
+    assert changes.constraints == {'A:filing': (PASSED, BLOCKED), 'A:cert': (OPEN, BLOCKED)}
+    assert changes.paths == {'A:yes:0': False}
+    assert set(changes.markets) == {'A'}
+
+
+def test_reopen_restores_the_original_state():
+    graph = shared_ruling_graph()
+    before = {t: graph.market_summary(t) for t in 'ABC'}
+    graph.set_status('A:filing', BLOCKED)
+    graph.set_status('RULING', BLOCKED)
+    graph.set_status('RULING', OPEN)
+    changes = graph.set_status('A:filing', PASSED)
+    assert graph.effective_status('A:cert') == OPEN
+    assert changes.paths == {'A:yes:0': True}
+    assert {t: graph.market_summary(t) for t in 'ABC'} == before
+
+
+def test_incremental_matches_a_rebuild_after_random_flips():
+    graph = shared_ruling_graph()
+    rng = random.Random(0)
+    for _ in range(200):
+        graph.set_status(rng.choice(list(graph.constraints)), rng.choice([OPEN, PASSED, BLOCKED, RESOLVED]))
+        fresh = rebuilt(graph)
+        for ticker in 'ABC':
+            assert graph.market_summary(ticker) == fresh.market_summary(ticker)
+
+
+def test_graph_from_tables_keeps_linked_markets_and_their_upstream():
+    # A's path requires a ruling only B lists, which depends on B's filing;
+    # B and C have no linked paths of their own
+    constraints = {
+        'A': [{'name': 'cert', 'status': OPEN}],
+        'B': [{'name': 'filing', 'status': PASSED},
+              {'id': 'RULING', 'name': 'ruling', 'status': OPEN, 'depends_on': ['B:filing']}],
+        'C': [{'name': 'vote', 'status': OPEN}],
+    }
+    paths = {
+        'A': {'yes_paths': [{'description': 'upheld', 'requires': ['RULING', 'A:cert']}],
+              'no_paths': [{'description': 'struck', 'blocked_by': ['RULING']}]},
+        'B': {'yes_paths': [{'description': 'plain'}], 'no_paths': []},
+        'C': {'yes_paths': [], 'no_paths': []},
+    }
+    tables = CatalogTables.from_loaders('ABC', constraints.get, paths.get, lambda t: [])
+    graph = graph_from_tables(tables)
+    assert set(graph.constraints) == {'A:cert', 'RULING', 'B:filing'}
+    full = build_constraint_graph('ABC', constraints.get, paths.get)
+    assert graph.market_summary('A') == full.market_summary('A')
+    graph.set_status('B:filing', BLOCKED)
+    full.set_status('B:filing', BLOCKED)
+    assert graph.market_summary('A') == full.market_summary('A') == (0, 1, 'high')
+
+
+def test_status_change_rewrites_the_snapshot_and_survives_a_reload():
+    provider = build_default_provider(background=False)
+    state = SharedMarketState(provider)
+    before = state.snapshot()
+
+    def row(snapshot):
+        df = snapshot.markets
+        return df[df['ticker'] == 'GOV-2024-NC'].iloc[0]
+
+    assert (row(before)['paths_yes'], row(before)['paths_no']) == (2, 2)
+    state.set_constraint_status('NC-GOV-PRIMARY', BLOCKED)
+    after = state.snapshot()
+    assert after.version > before.version
+    assert (row(after)['paths_yes'], row(after)['paths_no'], row(after)['structural_certainty']) == (0, 2, 'resolved')
+    # The older snapshot is untouched; the new one's filter indexes match a rebuild
+    assert row(before)['paths_yes'] == 2
+    assert positions(after.index) == positions(MarketIndex(after.markets))
+
+    # A reload rebuilds the graph from the source data, which still says passed
+    provider.invalidate()
+    reloaded = state.snapshot()
+    assert reloaded.index is not after.index
+    assert (row(reloaded)['paths_yes'], row(reloaded)['paths_no']) == (0, 2)
+
+    state.set_constraint_status('NC-GOV-PRIMARY', PASSED)
+    assert (row(state.snapshot())['paths_yes'], row(state.snapshot())['paths_no']) == (2, 2)
+
+    # Once a reload's source data says passed too, the override is dropped
+    provider.invalidate()
+    state.snapshot()
+    assert not state._statuses
+
+
+def positions(index):
+    return {
+        column: {value: rows.tolist() for value, rows in by_value.items() if len(rows)}
+        for column, by_value in index.positions.items()
+    }